@@ -25,14 +25,45 @@ This modular architecture splits functionality across:
 import sys
 import subprocess
 import os
+import json
+import threading
+import importlib.util
+from importlib import metadata
 
 # Import constants
-from installer_constants import SCRIPT_VERSION
+from installer_constants import SCRIPT_VERSION, DEPENDENCY_MARKER_FILE, SUBPROCESS_KWARGS
 
 # Import the main installer class
 from installer_core import InteractiveAPKInstaller
 
 
+def _dependency_fingerprint(dependencies):
+    """Interpreter and installed package versions, read from metadata without importing."""
+    return {
+        "py": sys.version,
+        "pkgs": {package_name: metadata.version(package_name) for _, package_name in dependencies},
+    }
+
+
+def _dependency_marker_is_valid(dependencies):
+    """Check whether the marker from a previous run still matches the environment."""
+    try:
+        with open(DEPENDENCY_MARKER_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f) == _dependency_fingerprint(dependencies)
+    except (OSError, ValueError, metadata.PackageNotFoundError):
+        return False
+
+
+def _write_dependency_marker(dependencies):
+    """Record that all dependencies are installed so later starts can skip probing."""
+    try:
+        os.makedirs(os.path.dirname(DEPENDENCY_MARKER_FILE), exist_ok=True)
+        with open(DEPENDENCY_MARKER_FILE, 'w', encoding='utf-8') as f:
+            json.dump(_dependency_fingerprint(dependencies), f)
+    except (OSError, metadata.PackageNotFoundError):
+        pass  # The marker is only an optimization
+
+
 def check_and_install_dependencies():
     """Check for and install required dependencies."""
     dependencies = [
@@ -41,15 +72,18 @@ def check_and_install_dependencies():
         ("questionary", "questionary")
     ]
     
+    # Warm start: nothing changed since dependencies were last verified
+    if _dependency_marker_is_valid(dependencies):
+        return True
+    
     missing_deps = []
     
-    # Check which dependencies are missing
+    # Check which dependencies are missing (find_spec locates packages without importing them)
     print("Checking dependencies...")
     for import_name, package_name in dependencies:
-        try:
-            __import__(import_name)
+        if importlib.util.find_spec(import_name) is not None:
             print(f"✓ {import_name} is available")
-        except ImportError:
+        else:
             print(f"✗ {import_name} is missing")
             missing_deps.append(package_name)
     
@@ -67,19 +101,27 @@ def check_and_install_dependencies():
             print("Attempting to use UV for faster package installation...")
             try:
                 # Use uv pip install command (compatible with pip interface)
+                # All packages go in one call so the resolver runs once
                 installer = ["uv", "pip", "install"]
-                for dep in missing_deps:
-                    print(f"Installing {dep} with uv...")
-                    result = subprocess.run(installer + [dep], capture_output=True, text=True, timeout=60)
-                    if result.returncode != 0:
-                        print(f"UV installation failed for {dep}: {result.stderr}")
-                        use_uv = False
-                        break
-                    else:
+                print(f"Installing {', '.join(missing_deps)} with uv...")
+                result = subprocess.run(
+                    installer + missing_deps,
+                    stdout=subprocess.DEVNULL,  # Only stderr is shown, and only on failure
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    timeout=60 * len(missing_deps),
+                    **SUBPROCESS_KWARGS
+                )
+                if result.returncode != 0:
+                    print(f"UV installation failed: {result.stderr}")
+                    use_uv = False
+                else:
+                    for dep in missing_deps:
                         print(f"✓ {dep} installed successfully with uv")
                 
                 if use_uv:
                     print("\nAll dependencies installed successfully with uv!")
+                    _write_dependency_marker(dependencies)
                     return True
             except subprocess.TimeoutExpired:
                 print("UV installation timed out, falling back to pip...")
@@ -92,17 +134,28 @@ def check_and_install_dependencies():
         if not use_uv:
             print("Using pip for dependency installation...")
             try:
-                installer = [sys.executable, "-m", "pip", "install"]
+                # One pip process for all packages: pip startup and resolution happen once
+                installer = [
+                    sys.executable, "-m", "pip", "install",
+                    "--disable-pip-version-check", "--no-input", "--prefer-binary"
+                ]
+                print(f"Installing {', '.join(missing_deps)} with pip...")
+                result = subprocess.run(
+                    installer + missing_deps,
+                    stdout=subprocess.DEVNULL,  # Only stderr is shown, and only on failure
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    timeout=60 * len(missing_deps),
+                    **SUBPROCESS_KWARGS
+                )
+                if result.returncode != 0:
+                    print(f"Failed to install {', '.join(missing_deps)}: {result.stderr}")
+                    return False
                 for dep in missing_deps:
-                    print(f"Installing {dep} with pip...")
-                    result = subprocess.run(installer + [dep], capture_output=True, text=True, timeout=60)
-                    if result.returncode != 0:
-                        print(f"Failed to install {dep}: {result.stderr}")
-                        return False
-                    else:
-                        print(f"✓ {dep} installed successfully with pip")
+                    print(f"✓ {dep} installed successfully with pip")
                 
                 print("\nAll dependencies installed successfully with pip!")
+                _write_dependency_marker(dependencies)
                 return True
                 
             except subprocess.TimeoutExpired:
@@ -113,6 +166,7 @@ def check_and_install_dependencies():
                 return False
     else:
         print("All dependencies are already installed!")
+        _write_dependency_marker(dependencies)
     
     return True
 
@@ -130,7 +184,8 @@ def main():
     # Create and run the installer
     try:
         installer = InteractiveAPKInstaller()
-        installer.run()
+        # Files given as arguments (or dropped onto the script) skip directory discovery
+        installer.run(sys.argv[1:], cleanup_on_exit=False)
         return 0
     except KeyboardInterrupt:
         if installer.console: 
@@ -145,10 +200,14 @@ def main():
             print(f"Error: {e}")
         return 1
     finally:
-        installer.cleanup_temp_files()
+        # Delete temp files while the exit prompt waits on the user
+        cleanup_thread = threading.Thread(target=installer.cleanup_temp_files, daemon=True)
+        cleanup_thread.start()
         if installer.console:
             if sys.stdin.isatty(): 
                 input("\nPress Enter to exit.")
+        cleanup_thread.join()
+        installer._flush_log_queue()  # The log renderer is a daemon thread; print cleanup warnings before exit
 
 
 if __name__ == "__main__":
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Shared pytest fixtures for the APK Installer tests.
+"""
+
+import stat
+
+import pytest
+
+FAKE_ADB = """#!/bin/sh
+# Minimal adb stand-in: `adb [-s id] shell [cmd...]`
+if [ "$1" = "-s" ]; then shift 2; fi
+shift
+if [ $# -eq 0 ]; then exec sh; fi
+exec sh -c "$*"
+"""
+
+# adb without shell_v2: the device's stderr comes back on stdout
+FAKE_ADB_MERGED_STDERR = """#!/bin/sh
+if [ "$1" = "-s" ]; then shift 2; fi
+shift
+if [ $# -eq 0 ]; then exec sh 2>&1; fi
+exec sh -c "$*" 2>&1
+"""
+
+
+def _write_executable(path, text):
+    path.write_text(text)
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+@pytest.fixture
+def fake_adb(tmp_path):
+    """Path to a fake adb executable whose `shell` runs commands on the local sh."""
+    return _write_executable(tmp_path / "adb", FAKE_ADB)
+
+
+@pytest.fixture
+def fake_adb_merged_stderr(tmp_path):
+    """Like fake_adb, but shell stderr is merged into stdout as on devices without adb shell_v2."""
+    return _write_executable(tmp_path / "adb", FAKE_ADB_MERGED_STDERR)
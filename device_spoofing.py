@@ -14,42 +14,361 @@ import time
 import shutil
 import hashlib
 import configparser
+import functools
 import re
+import shlex
+import importlib.util
+import queue
+import signal
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from random import choice as _choice, randint as _randint
+from types import MappingProxyType
 from datetime import datetime, timedelta
 
 # Import constants from the new constants module
 from installer_constants import (
     SCRIPT_VERSION,
     DEFAULT_CONFIG,
-    DEFAULT_MANUFACTURERS_PATTERNS,
+    get_default_manufacturers_patterns,
     DEFAULT_ANDROID_VERSION_RELEASE_MAP,
     DEFAULT_INTERNAL_SDK_MAP,
-    DEVICE_PATTERNS_FILE
+    DEVICE_PATTERNS_FILE,
+    CAPABILITIES_CACHE_TTL_SECONDS,
+    MAX_PARALLEL_DEVICES,
+    ROOT_SESSION_PROBE_TIMEOUT_SECONDS,
+    SUBPROCESS_KWARGS
 )
 
-# Rich library support (optional)
-try:
-    from rich.console import Console
-    from rich.table import Table
-    from rich.panel import Panel
-    from rich.prompt import Confirm
-    RICH_AVAILABLE = True
-except ImportError:
-    RICH_AVAILABLE = False
+# Rich library support (optional) - the console object is passed in by the caller,
+# so only availability is checked here and nothing is imported
+RICH_AVAILABLE = importlib.util.find_spec("rich") is not None
 
 # Questionary support (optional)
+QUESTIONARY_AVAILABLE = importlib.util.find_spec("questionary") is not None
+
+# orjson support (optional) - faster parsing of device_patterns.json
 try:
-    import questionary
-    QUESTIONARY_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    QUESTIONARY_AVAILABLE = False
+    ORJSON_AVAILABLE = False
+
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Serials and other identifiers normally come from os.urandom bytes translated through a
+# _build_charset_table() table, which drops the bytes that would bias a modulo mapping.
+# This OS-entropy generator's choices() covers charsets that table can't hold (non-ASCII).
+_SYSTEM_RANDOM = random.SystemRandom()
+
+# Parsed device patterns keyed by (path, mtime_ns, size), shared across manager instances
+_PATTERNS_CACHE = {}
+
+# `pm list users` lines look like: "\tUserInfo{10:Work profile:1030} running"
+USER_INFO_RE = re.compile(r"UserInfo\{(\d+):([^:\n]*):([0-9a-fA-F]+)\}([^\n]*)")
+USER_FLAG_PRIMARY = 0x00000001
+
+# `{N}` placeholders in a manufacturer's serial_pattern
+_SERIAL_TOKEN_RE = re.compile(r"\{(\d+)\}")
+
+
+def parse_pm_list_users(output):
+    """Parse `pm list users` output into a list of user dicts."""
+    # One pass over the whole buffer; no intermediate list of lines
+    matches = USER_INFO_RE.finditer(output)
+    return [
+        {
+            "id": match.group(1),
+            "name": match.group(2),
+            "is_primary": bool(int(match.group(3), 16) & USER_FLAG_PRIMARY),
+            "running": "running" in match.group(4),
+        }
+        for match in matches
+    ]
+
+
+def _popen_in_new_group(cmd, **popen_kwargs):
+    """Start cmd with captured output; on POSIX in its own process group so _kill_process_group can reap it."""
+    if os.name != "nt":
+        popen_kwargs["start_new_session"] = True
+    return subprocess.Popen(
+        cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **popen_kwargs
+    )
+
+
+def _kill_process_group(process):
+    """Kill a process started by _popen_in_new_group (and its group) and reap it.
+
+    Returns the (stdout, stderr) that arrived before the kill, or (None, None) if it couldn't be drained.
+    """
+    if os.name != "nt":
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            pass
+    else:
+        process.kill()
+    try:
+        return process.communicate(timeout=1)
+    except subprocess.TimeoutExpired:
+        # Something outside our group still holds the pipes; stop waiting for it
+        for stream in (process.stdout, process.stderr):
+            stream.close()
+        process.wait()
+        return None, None
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_serial_pattern(serial_pattern):
+    """Turn a serial pattern into a str.format template and token lengths, e.g. "R{8}" -> ("R{0}", (8,))."""
+    template_parts = []
+    lengths = []
+    position = 0
+    for match in _SERIAL_TOKEN_RE.finditer(serial_pattern):
+        # Literal braces outside {N} tokens must survive str.format
+        template_parts.append(serial_pattern[position:match.start()].replace("{", "{{").replace("}", "}}"))
+        template_parts.append(f"{{{len(lengths)}}}")
+        lengths.append(int(match.group(1)))
+        position = match.end()
+    template_parts.append(serial_pattern[position:].replace("{", "{{").replace("}", "}}"))
+    return "".join(template_parts), tuple(lengths)
+
+
+# Manufacturer-specific prefixes for ro.build.version.incremental
+_INCREMENTAL_SUFFIXES = MappingProxyType({
+    "samsung": ("N960FXXS", "G973FXXS", "SM-G"),
+    "google": ("factory-", "user-"),
+    "xiaomi": ("V", "MIUI"),
+})
+
+
+@functools.lru_cache(maxsize=32)
+def _user_install_args(user_id_str):
+    """Shared ("--user", id) tuple for pm/adb install; empty when no user is targeted."""
+    return () if user_id_str is None else ("--user", user_id_str)
+
+
+@functools.lru_cache(maxsize=32)
+def _build_charset_table(charset):
+    """bytes.translate table and delete set mapping random bytes uniformly onto an ASCII charset.
+
+    Byte values past the largest multiple of len(charset) are deleted rather
+    than wrapped, so no character is favoured by the modulo.
+    """
+    charset_bytes = charset.encode("ascii")
+    count = len(charset_bytes)
+    if not 0 < count <= 256:
+        raise ValueError("charset must have 1-256 characters")
+    table = bytes(charset_bytes[i % count] for i in range(256))
+    return table, bytes(range(256 - 256 % count, 256))
+
+
+def _random_string_from_table(charset_table, length):
+    """Random string from os.urandom translated through a _build_charset_table() result."""
+    table, rejected = charset_table
+    result = b""
+    while len(result) < length:
+        result += os.urandom(length - len(result) + 8).translate(table, rejected)
+    return result[:length].decode("ascii")
+
+
+def run_with_hard_timeout(cmd, timeout, **popen_kwargs):
+    """Like subprocess.run(capture_output=True) but guarantees the timeout is honoured.
+
+    On POSIX the child gets its own process group and the whole group is
+    SIGKILLed on timeout, so a grandchild holding the pipes open (e.g. an adb
+    server started by the client) can't stall the caller. Raises
+    subprocess.TimeoutExpired like subprocess.run.
+    """
+    process = _popen_in_new_group(cmd, **popen_kwargs)
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        _kill_process_group(process)
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
+
+class PersistentAdbShell:
+    """A long-lived `adb shell` child process that runs commands one at a time.
+
+    Each command is followed by unique sentinels echoed to stderr and then stdout,
+    so output can be collected without paying for a new adb process per call.
+    Devices without adb shell_v2 merge stderr into stdout; the stderr sentinel then
+    turns up on stdout and merged_streams is set, since stderr can't be told apart.
+    """
+
+    BUSY = object()  # run() result when the shell is occupied and wait=False
+    # The stderr marker is written before the stdout one, so once stdout is done it is due any moment
+    STDERR_MARKER_GRACE_SECONDS = 5
+
+    # One of these lives per device (two with a root session); keep them compact
+    __slots__ = ("process", "merged_streams", "_lock", "_eof", "_stdout_lines", "_stderr_lines")
+
+    def __init__(self, adb_path, device_id, as_root=False):
+        cmd = [adb_path]
+        if device_id:
+            cmd.extend(["-s", device_id])
+        cmd.append("shell")
+        if as_root:
+            # su without -c reads commands from stdin, so the whole session runs as root
+            cmd.extend(["su", "0"])
+
+        self.process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            **SUBPROCESS_KWARGS,
+        )
+        self.merged_streams = False
+        self._lock = threading.Lock()
+        self._eof = False
+        self._stdout_lines = queue.Queue()
+        self._stderr_lines = queue.Queue()
+        for stream, line_queue in (
+            (self.process.stdout, self._stdout_lines),
+            (self.process.stderr, self._stderr_lines),
+        ):
+            threading.Thread(
+                target=self._pump, args=(stream, line_queue), daemon=True
+            ).start()
+
+    @staticmethod
+    def _pump(stream, line_queue):
+        """Forward lines from a pipe to a queue; None marks end of stream."""
+        try:
+            for line in iter(stream.readline, ""):
+                line_queue.put(line)
+        except (OSError, ValueError):
+            pass
+        line_queue.put(None)
+
+    def is_alive(self):
+        return self.process.poll() is None
+
+    def _read_until(self, line_queue, sentinel, deadline, stray_marker=None):
+        """Collect lines until the sentinel appears. Returns (text, tail, stray_seen).
+
+        tail is None on timeout/EOF, with text holding the lines read so far.
+        stray_marker is cut out of the text wherever it appears; stray_seen tells whether it did.
+        """
+        chunks = []
+        stray_seen = False
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return "".join(chunks), None, stray_seen
+            try:
+                line = line_queue.get(timeout=remaining)
+            except queue.Empty:
+                return "".join(chunks), None, stray_seen
+            if line is None:
+                self._eof = True
+                return "".join(chunks), None, stray_seen
+            if stray_marker and stray_marker in line:
+                stray_seen = True
+                line = line.replace(stray_marker, "", 1)
+                if line == "\n":
+                    continue
+            index = line.find(sentinel)
+            if index >= 0:
+                chunks.append(line[:index])
+                return "".join(chunks), line[index + len(sentinel):].strip(), stray_seen
+            chunks.append(line)
+
+    def run(self, command_str, timeout=30, wait=True):
+        """Run a shell command line and return a CompletedProcess.
+
+        Returns None if the shell broke before the command was sent (so it is safe
+        to run elsewhere), or BUSY if wait is False and another command is still running.
+        """
+        if not self._lock.acquire(blocking=wait):
+            return self.BUSY
+        try:
+            return self._run_locked(command_str, timeout)
+        finally:
+            self._lock.release()
+
+    def _run_locked(self, command_str, timeout):
+        if not self.is_alive():
+            return None
+        sentinel = f"__END_{uuid.uuid4().hex}__"
+        stdout_marker, stderr_marker = f"{sentinel}:", f"{sentinel}!"
+        # The stderr marker goes first: with merged streams it then shows up before the stdout one
+        script = (
+            f"{{ {command_str}\n}} </dev/null; __rc=$?; "
+            f"echo {stderr_marker} >&2; echo {stdout_marker}$__rc\n"
+        )
+        try:
+            self.process.stdin.write(script)
+            self.process.stdin.flush()
+        except (OSError, ValueError):
+            return None
+
+        deadline = time.monotonic() + timeout
+        stdout_text, rc_text, stderr_on_stdout = self._read_until(
+            self._stdout_lines, stdout_marker, deadline, stray_marker=stderr_marker
+        )
+        if rc_text is None:
+            # Output is now out of sync with our sentinels; this shell can't be reused.
+            # The command was sent and may have run, so the caller must not re-run it
+            self.close()
+            return subprocess.CompletedProcess(
+                args=command_str, returncode=-1, stdout=stdout_text,
+                stderr="Shell closed" if self._eof else "Timeout",
+            )
+
+        if stderr_on_stdout:
+            # Any stderr output is already in stdout_text
+            self.merged_streams = True
+            stderr_text = ""
+        else:
+            stderr_text, stderr_tail, _ = self._read_until(
+                self._stderr_lines, stderr_marker,
+                min(deadline, time.monotonic() + self.STDERR_MARKER_GRACE_SECONDS),
+            )
+            if stderr_tail is None:
+                # The command finished but stderr never framed it; treat the streams as merged
+                self.merged_streams = True
+                self.close()
+                stderr_text = ""
+        try:
+            returncode = int(rc_text)
+        except ValueError:
+            returncode = -2
+        return subprocess.CompletedProcess(
+            args=command_str,
+            returncode=returncode,
+            stdout=stdout_text,
+            stderr=stderr_text,
+        )
+
+    def close(self):
+        """Terminate the shell process."""
+        try:
+            if self.process.stdin:
+                self.process.stdin.close()
+        except (OSError, ValueError):
+            pass
+        if self.is_alive():
+            self.process.kill()
+        try:
+            self.process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            pass
 
 
 class DeviceSpoofingManager:
     """Manages advanced device spoofing capabilities with enhanced validation and patterns."""
 
-    COMPREHENSIVE_DEFAULT_PROPS_TO_SPOOF = [
+    COMPREHENSIVE_DEFAULT_PROPS_ORDER = (
         "ro.product.brand",
         "ro.product.manufacturer",
         "ro.product.model",
@@ -76,10 +395,11 @@ class DeviceSpoofingManager:
         "ro.build.date.utc",
         "ro.miui.ui.version.name",  # For Xiaomi devices
         "ro.miui.ui.version.code",  # For Xiaomi devices
-    ]
+    )
+    COMPREHENSIVE_DEFAULT_PROPS_TO_SPOOF = frozenset(COMPREHENSIVE_DEFAULT_PROPS_ORDER)  # for membership checks
 
     # Additional properties for comprehensive anti-tracking
-    ANTI_TRACKING_EXTENDED_PROPS = [
+    ANTI_TRACKING_EXTENDED_PROPS_ORDER = (
         # Hardware/system identifiers commonly used for tracking
         "ro.hardware",
         "ro.hardware.chipname", 
@@ -140,17 +460,56 @@ class DeviceSpoofingManager:
         "ro.vendor.build.fingerprint",
         "ro.system_ext.build.fingerprint",
         "ro.product_services.build.fingerprint",
-    ]
+    )
+    ANTI_TRACKING_EXTENDED_PROPS = frozenset(ANTI_TRACKING_EXTENDED_PROPS_ORDER)  # for membership checks
+
+    LOG_STYLE_MAP = {
+        "info": "#5f87ff",           # Bright blue
+        "success": "#00ff88 bold",   # Bright green bold
+        "warning": "#f39c12 bold",   # Orange bold  
+        "error": "#e74c3c bold",     # Red bold
+        "debug": "#95a5a6",          # Light gray
+        None: "#ffffff",             # Any other level
+    }
+
+    GETPROP_BATCH_MARKER = "---GETPROP---"
+    # Back-off between verification reads after resetprop: the first read is immediate
+    # and the total wait stays within the old fixed 0.2s sleep
+    RESETPROP_VERIFY_DELAYS = (0, 0.05, 0.15)
+    _MAX_USERS_RE = re.compile(r"Maximum supported users:\s*(\d+)", re.IGNORECASE)
 
-    def __init__(self, adb_path="adb", console=None, config=None):
+    # One round-trip for the unprivileged probes in detect_capabilities
+    CAPABILITY_PROBE_SCRIPT = (
+        "echo SDK:$(getprop ro.build.version.sdk); "
+        "echo MAXUSERS:$(pm get-max-users 2>/dev/null); "
+        "echo MULTIUSER:$(settings get global multi_user_enabled 2>/dev/null)"
+    )
+    # su runs once, in its own call: a grant prompt that never answers can't stall the probes above
+    ROOT_PROBE_SCRIPT = (
+        "su 0 -c 'echo ROOT:$(id); echo RESETPROP:$(which resetprop); "
+        "echo \"RESETPROP_HELP:$(resetprop --help 2>&1 | tr \"\\n\" \" \")\"' 2>/dev/null"
+    )
+
+    def __init__(self, adb_path="adb", console=None, config=None, log_callback=None):
         self.adb_path = adb_path
         self.console = console if console and RICH_AVAILABLE else None
+        self._log_callback = log_callback  # (message, level, dim_style); replaces printing when given
+        self._log_styles = self._create_log_styles() if self.console else {}
+        self._bool_cache = {}  # (section, key, fallback) -> resolved boolean
         self.config = config if config else self._create_default_config_for_standalone()
 
         self.active_spoofed_users = {}
         self.property_backups = {}
+        self._property_backups_lock = threading.Lock()  # per-device ops may run on worker threads
         self.user_limit_originals = {}
         self.device_capabilities = {}
+        self._capabilities_detected_at = {}  # device_id -> time.monotonic() of the last probe
+        self._sdk_cache = {}  # device_id -> ro.build.version.sdk
+        self._base_cmd_cache = {}  # (adb_path, device_id) -> ("adb", "-s", id, "shell")
+        self._persistent_shells = {}  # (device_id, as_root) -> PersistentAdbShell
+        self._persistent_shells_lock = threading.Lock()
+        self._root_shell_unavailable = set()  # devices where a persistent `su 0` session failed
+        self._persistent_shell_unsupported = set()  # devices whose adb merges stderr into stdout
 
         self.patterns_data = self._load_device_patterns_file_or_defaults()
         self.device_manufacturers_patterns = self.patterns_data.get(
@@ -160,6 +519,56 @@ class DeviceSpoofingManager:
             "android_versions", self._get_default_android_version_release_map()
         )
         self.internal_sdk_map = self._get_default_internal_sdk_map()
+        self._index_patterns()
+
+    def _index_patterns(self):
+        """Precompute the choice tables used for random fingerprints. Call again after changing patterns."""
+        self._manufacturer_keys = tuple(self.device_manufacturers_patterns)
+        self._android_version_keys = tuple(self.android_version_release_map)
+        self._models_by_manufacturer = {
+            key: tuple(data.get("models", []))
+            for key, data in self.device_manufacturers_patterns.items()
+        }
+        # (manufacturer, android version) -> build ID prefixes, flattened for _generate_build_id
+        self._build_id_index = {
+            (key, version): tuple(prefixes)
+            for key, data in self.device_manufacturers_patterns.items()
+            for version, prefixes in data.get("build_id_patterns", {}).items()
+            if prefixes
+        }
+        # manufacturer -> upper-cased serial charset, normalized once instead of per serial
+        self._serial_charsets = {}
+        for key, data in self.device_manufacturers_patterns.items():
+            # Warm the parsed-pattern and charset-table caches so the first serial skips that work
+            serial_pattern = data.get("serial_pattern", "{8}")
+            if isinstance(serial_pattern, str):
+                _parse_serial_pattern(serial_pattern)
+            serial_chars = data.get("serial_chars", "0123456789ABCDEF")
+            if not isinstance(serial_chars, str):
+                continue
+            serial_chars = self._serial_charsets[key] = serial_chars.upper()
+            try:
+                _build_charset_table(serial_chars)
+            except (UnicodeEncodeError, ValueError):
+                pass  # Non-ASCII or empty charset; _generate_random_string falls back to choices()
+        # manufacturer -> {model or display name: model data}; the first model in list order wins
+        self._model_index = {}
+        for key, models in self._models_by_manufacturer.items():
+            index = self._model_index[key] = {}
+            for model in models:
+                for field in ("model", "display_name"):
+                    if field in model:
+                        index.setdefault(model[field], model)
+
+    @property
+    def config(self):
+        return self._config
+
+    @config.setter
+    def config(self, value):
+        # A new config object (e.g. after a reload) invalidates memoized lookups
+        self._config = value
+        self._bool_cache.clear()
 
     def _create_default_config_for_standalone(self):
         """Create default configuration for standalone usage."""
@@ -202,8 +611,9 @@ class DeviceSpoofingManager:
     def _get_default_manufacturers_patterns(self):
         """Get default manufacturer patterns if constants aren't available."""
         try:
-            return DEFAULT_MANUFACTURERS_PATTERNS
-        except NameError:
+            return get_default_manufacturers_patterns()
+        except (OSError, ValueError) as e:
+            self._log_message(f"Could not load default device patterns: {e}. Using built-in minimum.", "warning")
             return {
                 "samsung": {
                     "brand": "samsung",
@@ -261,12 +671,21 @@ class DeviceSpoofingManager:
 
     def _load_device_patterns_file_or_defaults(self):
         """Load device patterns from file or use defaults."""
+        patterns_file = Path(DEVICE_PATTERNS_FILE)
         try:
-            patterns_file = Path(DEVICE_PATTERNS_FILE)
-            if patterns_file.exists():
-                with open(patterns_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except (json.JSONDecodeError, IOError, NameError) as e:
+            # One stat both checks existence and keys the cache; a hit costs no other I/O
+            stat_result = patterns_file.stat()
+            cache_key = (os.path.abspath(patterns_file), stat_result.st_mtime_ns, stat_result.st_size)
+            patterns = _PATTERNS_CACHE.get(cache_key)
+            if patterns is None:
+                # Bytes straight to the parser: no text-mode file object or separate decode pass
+                patterns = _json_loads(patterns_file.read_bytes())
+                _PATTERNS_CACHE.clear()  # only the current version of the file is worth keeping
+                _PATTERNS_CACHE[cache_key] = patterns
+            return patterns
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError) as e:  # JSONDecodeError and UnicodeDecodeError are ValueErrors
             self._log_message(f"Could not load device patterns: {e}. Using defaults.", "warning")
         
         # Return default patterns
@@ -284,12 +703,7 @@ class DeviceSpoofingManager:
         target_user_id=None,
     ):
         """Execute ADB shell command with enhanced error handling and user targeting."""
-        import shlex
-        
-        base_cmd = [self.adb_path]
-        if device_id:
-            base_cmd.extend(["-s", device_id])
-        base_cmd.append("shell")
+        base_cmd = self._get_base_cmd(device_id)
 
         full_command_str_for_su = ""
         command_list_for_direct_exec = []
@@ -302,17 +716,7 @@ class DeviceSpoofingManager:
         elif isinstance(command_list_or_str, list):
             command_list_for_direct_exec = command_list_or_str
             if as_root:
-                quoted_args = []
-                for arg in command_list_or_str:
-                    arg_escaped = str(arg).replace("'", "'\\''"
-                    )
-                    if " " in arg_escaped or any(
-                        c in arg_escaped for c in '&|;()<>$`\\"!*?#'
-                    ):
-                        quoted_args.append(f"'{arg_escaped}'")
-                    else:
-                        quoted_args.append(arg_escaped)
-                full_command_str_for_su = " ".join(quoted_args)
+                full_command_str_for_su = shlex.join(map(str, command_list_or_str))
         else:
             self._log_message(
                 f"Invalid command type: {type(command_list_or_str)}", "error"
@@ -322,6 +726,7 @@ class DeviceSpoofingManager:
             )
 
         final_cmd_list = []
+        root_session_command = None
         if as_root:
             if not full_command_str_for_su:
                 self._log_message("Error: Empty command for root execution.", "error")
@@ -335,19 +740,53 @@ class DeviceSpoofingManager:
             else:
                 su_prefix = ["su", "0"]
 
-            final_cmd_list = base_cmd + su_prefix + ["-c", full_command_str_for_su]
+            # adb joins its arguments with spaces, so the script is quoted to reach su as one argument
+            final_cmd_list = [*base_cmd, *su_prefix, "-c", shlex.quote(full_command_str_for_su)]
+            if su_prefix == ["su", "0"]:
+                root_session_command = full_command_str_for_su
         else:
-            final_cmd_list = base_cmd + command_list_for_direct_exec
+            final_cmd_list = [*base_cmd, *command_list_for_direct_exec]
+
+        # adb joins shell arguments with spaces, so the persistent shell sees the same command line
+        as_root_session = root_session_command is not None
+        if as_root_session:
+            shell_command = root_session_command
+        else:
+            shell_command = " ".join(str(arg) for arg in final_cmd_list[len(base_cmd):])
+        shell = self._get_persistent_shell(device_id, as_root=as_root_session)
+        if shell:
+            result = shell.run(shell_command, timeout=timeout, wait=False)
+            if result is None:
+                # The shell died before the command was sent, so running it below is safe
+                self._drop_persistent_shell(device_id, as_root=as_root_session)
+            elif result is PersistentAdbShell.BUSY:
+                # Another thread is using the shell; run this one as its own process below
+                pass
+            else:
+                if shell.merged_streams:
+                    # No shell_v2: stderr can't be framed, so this device runs one process per command
+                    self._log_message(
+                        f"adb on {device_id} merges stderr into stdout; not using a persistent shell",
+                        "debug", dim_style=True,
+                    )
+                    with self._persistent_shells_lock:
+                        self._persistent_shell_unsupported.add(device_id)
+                    self._drop_persistent_shell(device_id)
+                elif not shell.is_alive():
+                    self._drop_persistent_shell(device_id, as_root=as_root_session)
+                if result.returncode == -1 and result.stderr == "Timeout":
+                    self._log_message(f"⏰ Command timed out: {' '.join(final_cmd_list)}", "warning")
+                result.args = final_cmd_list
+                return result
 
         try:
-            result = subprocess.run(
+            result = run_with_hard_timeout(
                 final_cmd_list,
-                capture_output=True,
+                timeout,
                 text=True,
-                timeout=timeout,
-                check=False,
                 encoding="utf-8",
                 errors="replace",
+                **SUBPROCESS_KWARGS,
             )
             return result
         except subprocess.TimeoutExpired:
@@ -355,7 +794,7 @@ class DeviceSpoofingManager:
             return subprocess.CompletedProcess(
                 args=final_cmd_list, returncode=-1, stdout="", stderr="Timeout"
             )
-        except Exception as e:
+        except (OSError, ValueError, subprocess.SubprocessError) as e:
             self._log_message(
                 f"💥 Exception running command: {e}", "error"
             )
@@ -363,108 +802,290 @@ class DeviceSpoofingManager:
                 args=final_cmd_list, returncode=-2, stdout="", stderr=str(e)
             )
 
+    def _get_base_cmd(self, device_id):
+        """Return the cached ("adb", "-s", id, "shell") prefix for a device."""
+        base_cmd = self._base_cmd_cache.get((self.adb_path, device_id))
+        if base_cmd is None:
+            base_cmd = [self.adb_path]
+            if device_id:
+                base_cmd.extend(["-s", device_id])
+            base_cmd.append("shell")
+            base_cmd = self._base_cmd_cache[(self.adb_path, device_id)] = tuple(base_cmd)
+        return base_cmd
+
+    def _run_adb_many(self, device_id, command_lists, timeout=30):
+        """Start several adb shell commands at once, then wait for all of them.
+
+        adb multiplexes commands to a device, so independent commands take about
+        as long as the slowest one. Returns CompletedProcesses in input order.
+        """
+        base_cmd = self._get_base_cmd(device_id)
+        started = []
+        for command_list in command_lists:
+            cmd = [*base_cmd, *map(str, command_list)]
+            try:
+                process = _popen_in_new_group(
+                    cmd, text=True, encoding="utf-8", errors="replace", **SUBPROCESS_KWARGS
+                )
+            except OSError as e:
+                process = e
+            started.append((cmd, process))
+
+        deadline = time.monotonic() + timeout
+        results = []
+        for cmd, process in started:
+            if isinstance(process, OSError):
+                results.append(subprocess.CompletedProcess(cmd, -2, "", str(process)))
+                continue
+            try:
+                stdout, stderr = process.communicate(timeout=max(0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                stdout, _ = _kill_process_group(process)
+                self._log_message(f"⏰ Command timed out: {' '.join(cmd)}", "warning")
+                results.append(subprocess.CompletedProcess(cmd, -1, stdout or "", "Timeout"))
+                continue
+            results.append(subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr))
+        return results
+
+    def _get_persistent_shell(self, device_id, as_root=False):
+        """Return a live persistent shell (or root session) for the device, starting one if needed."""
+        key = (device_id, as_root)
+        with self._persistent_shells_lock:
+            if device_id in self._persistent_shell_unsupported:
+                return None
+            if as_root and device_id in self._root_shell_unavailable:
+                return None
+            shell = self._persistent_shells.get(key)
+            if shell and shell.is_alive():
+                return shell
+            try:
+                shell = PersistentAdbShell(self.adb_path, device_id, as_root=as_root)
+            except (OSError, ValueError) as e:
+                self._log_message(f"Persistent adb shell unavailable: {e}", "debug", dim_style=True)
+                return None
+            if not as_root:
+                self._persistent_shells[key] = shell
+                return shell
+
+        # Commands can't be re-run once sent, so su gets a no-op first (outside the lock,
+        # as a root grant prompt may take a while); if it refuses, `su -c` is used per command
+        probe = shell.run("true", timeout=ROOT_SESSION_PROBE_TIMEOUT_SECONDS)
+        if probe is None or probe.returncode != 0:
+            shell.close()
+            with self._persistent_shells_lock:
+                self._root_shell_unavailable.add(device_id)
+            return None
+        with self._persistent_shells_lock:
+            existing = self._persistent_shells.get(key)
+            if existing and existing.is_alive():
+                shell.close()
+                return existing
+            self._persistent_shells[key] = shell
+        return shell
+
+    def _drop_persistent_shell(self, device_id, as_root=None):
+        """Close and forget a device's persistent shell; both the plain and root ones if as_root is None."""
+        with self._persistent_shells_lock:
+            shells = [
+                self._persistent_shells.pop((device_id, root), None)
+                for root in ((False, True) if as_root is None else (as_root,))
+            ]
+        for shell in filter(None, shells):
+            shell.close()
+
+    def close_persistent_shells(self):
+        """Close all persistent adb shells."""
+        with self._persistent_shells_lock:
+            shells = list(self._persistent_shells.values())
+            self._persistent_shells.clear()
+        for shell in shells:
+            shell.close()
+
+    def run_on_devices(self, device_ids, device_func, *args):
+        """Run device_func(device_id, *args) concurrently for each device, returning {device_id: result}.
+
+        E.g. run_on_devices(ids, manager.restore_all_properties). Each device has
+        its own adb transport, so the work overlaps instead of queueing.
+        """
+        device_ids = list(device_ids)
+        if len(device_ids) <= 1:
+            return {device_id: device_func(device_id, *args) for device_id in device_ids}
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_PARALLEL_DEVICES, len(device_ids)), thread_name_prefix="adb-device"
+        ) as executor:
+            futures = [executor.submit(device_func, device_id, *args) for device_id in device_ids]
+            return {device_id: future.result() for device_id, future in zip(device_ids, futures)}
+
+    def _create_log_styles(self):
+        """Parse the log styles once: {(level, dim_style): Style}."""
+        from rich.style import Style
+        return {
+            (level, dim_style): Style.parse(f"dim {style}" if dim_style else style)
+            for level, style in self.LOG_STYLE_MAP.items()
+            for dim_style in (False, True)
+        }
+
     def _log_message(self, message, level="info", dim_style=False):
         """Log message with cohesive Rich formatting matching installer colors."""
+        if level == "debug" and not self._get_config_boolean("LOGGING", "verbose_installation_logs", True):
+            return
+        if self._log_callback:
+            self._log_callback(message, level, dim_style)
+            return
         if not self.console:
             print(f"[{level.upper()}] {message}")
             return
-        style_map = {
-            "info": "#5f87ff",           # Bright blue
-            "success": "#00ff88 bold",   # Bright green bold
-            "warning": "#f39c12 bold",   # Orange bold  
-            "error": "#e74c3c bold",     # Red bold
-            "debug": "#95a5a6",          # Light gray
-        }
-        style = style_map.get(level, "#ffffff")
-        if dim_style:
-            style = f"dim {style}"
-        self.console.print(message, style=style, markup=True)
+        style = self._log_styles.get((level, dim_style)) or self._log_styles[(None, dim_style)]
+        # Messages are plain text (property values may contain brackets), so skip markup parsing
+        self.console.print(message, style=style, markup=False)
 
     def _generate_random_hex_string(self, length, uppercase=False):
         """Generate random hexadecimal string."""
-        hex_chars = "0123456789ABCDEF" if uppercase else "0123456789abcdef"
-        return "".join(random.choice(hex_chars) for _ in range(length))
+        if length <= 0:
+            return ""
+        # One urandom read, hex-encoded in C; identifiers shouldn't come from the seedable PRNG
+        hex_string = os.urandom((length + 1) // 2).hex()[:length]
+        return hex_string.upper() if uppercase else hex_string
 
     def _generate_random_string(
-        self, length, chars=None, uppercase=False, lowercase=False
+        self, length, chars=None, uppercase=False, lowercase=False, rng=None
     ):
-        """Generate random string with specified character set."""
+        """Generate random string with specified character set; pass a seeded random.Random as rng for repeatable output."""
         if chars is None:
             chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
         if uppercase:
             chars = chars.upper()
         elif lowercase:
             chars = chars.lower()
-        return "".join(random.choice(chars) for _ in range(length))
+        if rng is None:
+            # ASCII charsets: one urandom read translated in C through a cached table
+            try:
+                return _random_string_from_table(_build_charset_table(chars), length)
+            except (UnicodeEncodeError, ValueError):
+                pass
+        return "".join((rng or _SYSTEM_RANDOM).choices(chars, k=length))
 
     def get_current_property_value(self, device_id, property_name):
         """Get current value of a device property."""
         result = self._run_adb_shell_command(device_id, ["getprop", property_name])
         return result.stdout.strip() if result.returncode == 0 else ""
 
+    def _getprop_batch_script(self, property_names):
+        """Shell script that prints each property's value, separated by marker lines."""
+        return f"; echo {self.GETPROP_BATCH_MARKER}; ".join(
+            f"getprop {shlex.quote(name)}" for name in property_names
+        )
+
+    def _split_getprop_batch(self, result, count):
+        """Split the output of a getprop batch script into `count` values."""
+        values = result.stdout.split(f"{self.GETPROP_BATCH_MARKER}\n")
+        if result.returncode != 0 or len(values) != count:
+            return [""] * count
+        return [value.strip() for value in values]
+
+    def get_current_property_values(self, device_id, property_names, timeout=30):
+        """Get several property values with one shell round-trip. Returns a list aligned with the names."""
+        property_names = list(property_names)
+        if not property_names:
+            return []
+        result = self._run_adb_shell_command(
+            device_id, [self._getprop_batch_script(property_names)], timeout=timeout
+        )
+        if result.returncode == 0 and result.stdout.count(f"{self.GETPROP_BATCH_MARKER}\n") != len(property_names) - 1:
+            # The shell ran but the output didn't frame cleanly; read each property on its own
+            return [self.get_current_property_value(device_id, name) for name in property_names]
+        return self._split_getprop_batch(result, len(property_names))
+
+    def get_sdk_version(self, device_id):
+        """Get the device's Android API level, cached per device (build props are fixed per boot)."""
+        sdk_version = self._sdk_cache.get(device_id)
+        if sdk_version is None:
+            value = self.get_current_property_value(device_id, "ro.build.version.sdk")
+            if not value.isdigit():
+                return 0
+            sdk_version = self._sdk_cache[device_id] = int(value)
+        return sdk_version
+
+    def forget_device(self, device_id):
+        """Drop cached state for a device that is no longer connected."""
+        self._sdk_cache.pop(device_id, None)
+        self.device_capabilities.pop(device_id, None)
+        self._capabilities_detected_at.pop(device_id, None)
+        self._root_shell_unavailable.discard(device_id)
+        self._persistent_shell_unsupported.discard(device_id)
+        self._drop_persistent_shell(device_id)
+
     def _get_config_boolean(self, section, key, fallback=True):
         """Safely get boolean config value from either dict or ConfigParser."""
+        cache_key = (section, key, fallback)
+        cached = self._bool_cache.get(cache_key)
+        if cached is not None:
+            return cached
         try:
             if hasattr(self.config, 'getboolean'):
                 # ConfigParser object
-                return self.config.getboolean(section, key, fallback=fallback)
+                value = self.config.getboolean(section, key, fallback=fallback)
             else:
                 # Dict object
                 value = self.config.get(section, {}).get(key, str(fallback))
-                if isinstance(value, bool):
-                    return value
-                return str(value).lower() in ('true', '1', 'yes', 'on')
-        except:
-            return fallback
+                if not isinstance(value, bool):
+                    value = str(value).lower() in ('true', '1', 'yes', 'on')
+        except (configparser.Error, ValueError, AttributeError):
+            value = fallback
+        self._bool_cache[cache_key] = value
+        return value
 
     def backup_property(self, device_id, property_name):
         """Backup current property value before spoofing."""
+        self.backup_properties(device_id, [property_name])
+
+    def backup_properties(self, device_id, property_names):
+        """Backup current values of several properties before spoofing, in one shell call."""
         if not self._get_config_boolean("ADVANCED_SPOOFING", "backup_original_properties", True):
             return
-        if device_id not in self.property_backups:
-            self.property_backups[device_id] = {}
-        if property_name in self.property_backups[device_id]:
+        with self._property_backups_lock:
+            backups = self.property_backups.setdefault(device_id, {})
+            pending = [name for name in dict.fromkeys(property_names) if name not in backups]
+        if not pending:
             return
 
-        original_value = self.get_current_property_value(device_id, property_name)
-        self.property_backups[device_id][property_name] = original_value
-
-        # Verification read after backup
-        current_value_after_read = self.get_current_property_value(
-            device_id, property_name
-        )
-        if current_value_after_read != original_value:
-            self._log_message(
-                f"  Property '{property_name}' changed during backup read! "
-                f"Initial: '{original_value}', After read: '{current_value_after_read}'."
-                " This could indicate instability or a very dynamic property.",
-                "warning",
-            )
-        else:
+        values = self.get_current_property_values(device_id, pending)
+        with self._property_backups_lock:
+            for property_name, original_value in zip(pending, values):
+                # Another thread may have backed it up meanwhile; the first value read is the original
+                backups.setdefault(property_name, original_value)
+        for property_name, original_value in zip(pending, values):
             self._log_message(
-                f"  Backed up original '{property_name}': '{original_value}' (Verified)",
-                "debug",
-                dim_style=True,
+                f"  Backed up original '{property_name}': '{original_value}'", "debug", dim_style=True
             )
 
+    def _resetprop_strategies(self, device_id):
+        """(name, resetprop flags) pairs to try in order, minus flags the device's resetprop lacks."""
+        flags = self.device_capabilities.get(device_id, {}).get("resetprop_flags")
+        strategies = [("Standard", ())]
+        if flags is None or flags["non_persistent"]:
+            strategies.append(("Non-persistent", ("-n",)))
+        if flags is None or flags["force"]:
+            strategies.append(("Force", ("--force",)))
+        return strategies
+
     def set_property_with_resetprop(self, device_id, property_name, value):
         """Set property using resetprop with multiple strategies."""
         self.backup_property(device_id, property_name)
         
         # Try multiple resetprop strategies for stubborn properties
-        strategies = [
-            ["resetprop", property_name, str(value)],
-            ["resetprop", "-n", property_name, str(value)],
-            ["resetprop", "--force", property_name, str(value)],
-        ]
-        
-        for strategy_idx, command_list in enumerate(strategies):
-            strategy_name = ["Standard", "Non-persistent", "Force"][strategy_idx]
-            
+        for strategy_name, strategy_flags in self._resetprop_strategies(device_id):
+            command_list = ["resetprop", *strategy_flags, property_name, str(value)]
             result = self._run_adb_shell_command(device_id, command_list, as_root=True)
             if result.returncode == 0:
-                time.sleep(0.2)
-                newly_set_value = self.get_current_property_value(device_id, property_name)
+                if property_name == "ro.build.version.sdk":
+                    self._sdk_cache.pop(device_id, None)
+                for delay in self.RESETPROP_VERIFY_DELAYS:
+                    if delay:
+                        time.sleep(delay)
+                    newly_set_value = self.get_current_property_value(device_id, property_name)
+                    if newly_set_value == str(value):
+                        break
                 if newly_set_value == str(value):
                     self._log_message(
                         f"  ✓ Set {property_name} to: '{value}' (Verified, {strategy_name})", "success"
@@ -490,6 +1111,81 @@ class DeviceSpoofingManager:
         )
         return False
 
+    def set_properties_with_resetprop(self, device_id, properties):
+        """Set several properties in one root shell call. Returns {property_name: success}.
+
+        All resetprop calls and the verification getprops run in a single script
+        in the persistent root session. Properties that don't verify are retried
+        with the remaining strategies in that same session, each round checked
+        with one getprop sweep.
+        """
+        properties = {name: str(value) for name, value in properties.items()}
+        if not properties:
+            return {}
+        self.backup_properties(device_id, properties)
+
+        names = list(properties)
+        resetprop_script = "; ".join(
+            f"resetprop {shlex.quote(name)} {shlex.quote(value)} >/dev/null 2>&1"
+            for name, value in properties.items()
+        )
+        root_script = f"{resetprop_script}; {self._getprop_batch_script(names)}"
+        result = self._run_adb_shell_command(device_id, root_script, as_root=True)
+        if "ro.build.version.sdk" in properties:
+            self._sdk_cache.pop(device_id, None)
+
+        results = dict.fromkeys(names, False)
+        pending = {}
+        for property_name, newly_set_value in zip(
+            names, self._split_getprop_batch(result, len(names))
+        ):
+            value = properties[property_name]
+            if newly_set_value == value:
+                self._log_message(
+                    f"  ✓ Set {property_name} to: '{value}' (Verified, Batch)", "success"
+                )
+                results[property_name] = True
+            else:
+                pending[property_name] = value
+
+        # The batch was the Standard strategy; the rest are tried for stragglers only
+        for strategy_name, strategy_flags in self._resetprop_strategies(device_id)[1:]:
+            if not pending:
+                break
+            command_results = [
+                self._run_adb_shell_command(
+                    device_id, ["resetprop", *strategy_flags, name, value], as_root=True
+                )
+                for name, value in pending.items()
+            ]
+            new_values = self.get_current_property_values(device_id, pending)
+            for (property_name, value), command_result, newly_set_value in zip(
+                list(pending.items()), command_results, new_values
+            ):
+                if newly_set_value == value:
+                    self._log_message(
+                        f"  ✓ Set {property_name} to: '{value}' (Verified, {strategy_name})", "success"
+                    )
+                    results[property_name] = True
+                    del pending[property_name]
+                elif command_result.returncode == 0:
+                    self._log_message(
+                        f"  ⚠️ Set {property_name} to: '{value}' (Command OK with {strategy_name}, but verification failed. Got: '{newly_set_value}')",
+                        "warning",
+                    )
+                else:
+                    self._log_message(
+                        f"  ❌ Failed to set {property_name} with {strategy_name}: {command_result.stderr.strip()}",
+                        "warning",
+                    )
+
+        for property_name in pending:
+            self._log_message(
+                f"  ❌ All resetprop strategies failed for {property_name}",
+                "error",
+            )
+        return results
+
     def detect_capabilities(self, device_id):
         """Detect device capabilities for spoofing."""
         caps = {
@@ -499,25 +1195,35 @@ class DeviceSpoofingManager:
             "ephemeral_user_support": False,
             "android_sdk_version": 0,
         }
+        probe_completed = False
         try:
-            res_sdk = self._run_adb_shell_command(
-                device_id, ["getprop", "ro.build.version.sdk"]
+            result = self._run_adb_shell_command(
+                device_id, [self.CAPABILITY_PROBE_SCRIPT], timeout=10
+            )
+            # Its own process, so a stalled su is killed without taking the persistent shell along
+            root_result, = self._run_adb_many(device_id, [[self.ROOT_PROBE_SCRIPT]], timeout=5)
+            probes = {}
+            for line in f"{result.stdout}\n{root_result.stdout}".splitlines():
+                key, sep, value = line.partition(":")
+                if sep:
+                    probes[key] = value.strip()
+
+            sdk_value = probes.get("SDK", "")
+            if sdk_value.isdigit():
+                self._sdk_cache[device_id] = int(sdk_value)
+            probe_completed = (
+                sdk_value.isdigit() and result.returncode != -1 and root_result.returncode != -1
             )
-            if res_sdk.returncode == 0 and res_sdk.stdout.strip().isdigit():
-                sdk_version = int(res_sdk.stdout.strip())
+            sdk_version = self._sdk_cache.get(device_id, 0)
+            if sdk_version:
                 caps["android_sdk_version"] = sdk_version
                 if sdk_version >= 26:
                     caps["ephemeral_user_support"] = True
 
-            res_max_users = self._run_adb_shell_command(
-                device_id, ["pm", "get-max-users"]
-            )
-            if res_max_users.returncode == 0 and res_max_users.stdout.strip():
-                max_users_str = res_max_users.stdout.strip()
+            max_users_str = probes.get("MAXUSERS", "")
+            if max_users_str:
                 max_users_val = 0
-                match = re.search(
-                    r"Maximum supported users:\s*(\d+)", max_users_str, re.IGNORECASE
-                )
+                match = self._MAX_USERS_RE.search(max_users_str)
                 if match:
                     max_users_val = int(match.group(1))
                 elif max_users_str.isdigit():
@@ -526,83 +1232,88 @@ class DeviceSpoofingManager:
                 if max_users_val > 1:
                     caps["multiuser_support"] = True
                 elif max_users_val == 1 and caps["android_sdk_version"] >= 21:
-                    res_mu_enabled = self._run_adb_shell_command(
-                        device_id, ["settings", "get", "global", "multi_user_enabled"]
-                    )
-                    if (
-                        res_mu_enabled.returncode == 0
-                        and res_mu_enabled.stdout.strip() == "1"
-                    ):
+                    if probes.get("MULTIUSER") == "1":
                         caps["multiuser_support"] = True
 
             # Check for root access
-            res_root_id = self._run_adb_shell_command(
-                device_id, "id", as_root=True, timeout=5
-            )
-            if res_root_id.returncode == 0 and "uid=0(root)" in res_root_id.stdout:
+            if "uid=0(root)" in probes.get("ROOT", ""):
                 caps["root_access"] = True
-                res_resetprop_check = self._run_adb_shell_command(
-                    device_id, "which resetprop", as_root=True, timeout=5
-                )
-                if res_resetprop_check.returncode == 0 and res_resetprop_check.stdout.strip():
+                if probes.get("RESETPROP"):
                     caps["magisk_available"] = True
+                    help_words = set(probes.get("RESETPROP_HELP", "").replace(",", " ").split())
+                    if help_words:
+                        caps["resetprop_flags"] = {
+                            "non_persistent": "-n" in help_words,
+                            "force": "--force" in help_words,
+                        }
                     self._log_message(
-                        f"  Found 'resetprop' utility at: {res_resetprop_check.stdout.strip()}.",
+                        f"  Found 'resetprop' utility at: {probes['RESETPROP']}.",
                         "debug",
                         dim_style=True
                     )
 
-        except Exception as e:
+        except (OSError, ValueError, subprocess.SubprocessError) as e:
             self._log_message(
                 f"Error detecting capabilities for {device_id}: {e}", "error"
             )
         
-        # Cache capabilities
+        # Cache capabilities; fallback caps from a failed or timed-out probe aren't reused by get_capabilities
         self.device_capabilities[device_id] = caps
+        if probe_completed:
+            self._capabilities_detected_at[device_id] = time.monotonic()
+        else:
+            self._capabilities_detected_at.pop(device_id, None)
         return caps
 
+    def get_capabilities(self, device_id, max_age=CAPABILITIES_CACHE_TTL_SECONDS):
+        """Return cached capabilities if probed within max_age seconds, otherwise probe again."""
+        detected_at = self._capabilities_detected_at.get(device_id)
+        if detected_at is not None and time.monotonic() - detected_at < max_age:
+            return self.device_capabilities[device_id]
+        return self.detect_capabilities(device_id)
+
     def restore_all_properties(self, device_id):
         """Restore all backed up properties for a device."""
-        if device_id not in self.property_backups:
-            return True
+        with self._property_backups_lock:
+            if device_id not in self.property_backups:
+                return True
+            backups = dict(self.property_backups[device_id])
 
-        all_success = True
-        for prop_name, original_value in self.property_backups[device_id].items():
+        results = self.set_properties_with_resetprop(
+            device_id, {name: value for name, value in backups.items() if value}
+        )
+        all_success = all(results.values())
+        for prop_name, original_value in backups.items():
             if original_value:
-                success = self.set_property_with_resetprop(device_id, prop_name, original_value)
-            else:
-                delete_cmd = ["resetprop", "--delete", prop_name]
-                result = self._run_adb_shell_command(device_id, delete_cmd, as_root=True)
-                success = result.returncode == 0
-
-            if not success:
+                continue
+            delete_cmd = ["resetprop", "--delete", prop_name]
+            result = self._run_adb_shell_command(device_id, delete_cmd, as_root=True)
+            if result.returncode != 0:
                 all_success = False
 
         if all_success:
-            self.property_backups.pop(device_id, None)
+            with self._property_backups_lock:
+                self.property_backups.pop(device_id, None)
 
         return all_success
 
     def apply_random_device_fingerprint_for_new_user(self, device_id):
         """Apply random device fingerprint for newly created user."""
-        available_manufacturers = list(self.device_manufacturers_patterns.keys())
-        if not available_manufacturers:
+        if not self._manufacturer_keys:
             self._log_message("No manufacturer patterns available", "error")
             return False
             
-        manufacturer_key = random.choice(available_manufacturers)
-        manufacturer_data = self.device_manufacturers_patterns[manufacturer_key]
+        manufacturer_key = _choice(self._manufacturer_keys)
         
-        models = manufacturer_data.get("models", [])
+        models = self._models_by_manufacturer[manufacturer_key]
         if not models:
             self._log_message(f"No models available for {manufacturer_key}", "error")
             return False
             
-        model_data = random.choice(models)
+        model_data = _choice(models)
         model_name = model_data.get("model", "Unknown")
         
-        available_versions = list(self.android_version_release_map.keys())
-        android_version = random.choice(available_versions) if available_versions else "13"
+        android_version = _choice(self._android_version_keys) if self._android_version_keys else "13"
         
         self._log_message(
             f"  🎲 Random device: {manufacturer_key.title()} {model_name} (Android {android_version})",
@@ -625,7 +1336,7 @@ class DeviceSpoofingManager:
         self._log_message(f"🎭 Applying device spoofing to {device_id}...", "info")
         
         # Get capabilities
-        caps = self.device_capabilities.get(device_id) or self.detect_capabilities(device_id)
+        caps = self.get_capabilities(device_id)
         
         if not caps.get("root_access") or not caps.get("magisk_available"):
             self._log_message(
@@ -641,15 +1352,11 @@ class DeviceSpoofingManager:
             return False
 
         # Find matching model
-        models = manufacturer_data.get("models", [])
-        model_data = None
-        for model in models:
-            if model.get("model") == target_model_name_config or model.get("display_name") == target_model_name_config:
-                model_data = model
-                break
+        model_data = self._model_index.get(target_manufacturer_key, {}).get(target_model_name_config)
         
-        if not model_data and models:
-            model_data = models[0]  # Use first model as fallback
+        if not model_data:
+            models = manufacturer_data.get("models", [])
+            model_data = models[0] if models else None  # Use first model as fallback
             
         if not model_data:
             self._log_message(f"No model data available for {target_manufacturer_key}", "error")
@@ -681,12 +1388,9 @@ class DeviceSpoofingManager:
         }
 
         # Apply properties
-        success_count = 0
         total_props = len(spoof_props)
-        
-        for prop_name, prop_value in spoof_props.items():
-            if self.set_property_with_resetprop(device_id, prop_name, prop_value):
-                success_count += 1
+        results = self.set_properties_with_resetprop(device_id, spoof_props)
+        success_count = sum(results.values())
 
         success_rate = (success_count / total_props) * 100
         self._log_message(
@@ -719,12 +1423,10 @@ class DeviceSpoofingManager:
 
     def _generate_build_id(self, manufacturer_config_name, android_version_key):
         """Generate realistic build ID for manufacturer and Android version."""
-        patterns = self.device_manufacturers_patterns.get(manufacturer_config_name, {})
-        build_patterns = patterns.get("build_id_patterns", {})
-        version_patterns = build_patterns.get(android_version_key, [])
+        version_patterns = self._build_id_index.get((manufacturer_config_name, android_version_key))
         
         if version_patterns:
-            base_pattern = random.choice(version_patterns)
+            base_pattern = _choice(version_patterns)
         else:
             # Fallback patterns based on Android version
             if android_version_key == "14":
@@ -734,60 +1436,92 @@ class DeviceSpoofingManager:
             else:
                 base_pattern = "SP1A"
         
-        # Generate timestamp-like suffix
-        year = random.randint(2022, 2024)
-        month = random.randint(1, 12)
-        day = random.randint(1, 28)
-        build_number = random.randint(1, 999)
-        
-        return f"{base_pattern}.{year:04d}{month:02d}{day:02d}.{build_number:03d}"
+        return self.generate_build_ids_bulk(base_pattern, 1)[0]
+
+    def generate_build_ids_bulk(self, base_pattern, count, rng=None):
+        """Generate `count` build IDs like "TQ1A.20230415.042" sharing one prefix."""
+        randint = (rng or random).randint
+        # Timestamp-like date plus build number; one comprehension, no per-ID method dispatch
+        return [
+            f"{base_pattern}.{randint(2022, 2024):04d}{randint(1, 12):02d}"
+            f"{randint(1, 28):02d}.{randint(1, 999):03d}"
+            for _ in range(count)
+        ]
 
     def _generate_incremental(self, manufacturer_config_name, model_data, build_id_str):
         """Generate incremental build number."""
-        parts = build_id_str.split('.')
-        if len(parts) >= 3:
-            base = parts[-1]
+        # Last dotted component of IDs like "QP1A.190711.020", without splitting the whole string
+        if build_id_str.count('.') >= 2:
+            base = build_id_str[build_id_str.rfind('.') + 1:]
         else:
-            base = str(random.randint(100, 999))
+            base = str(_randint(100, 999))
         
         # Add manufacturer-specific suffix
-        suffixes = {
-            "samsung": ["N960FXXS", "G973FXXS", "SM-G"],
-            "google": ["factory-", "user-"],
-            "xiaomi": ["V", "MIUI"],
-        }
-        
-        manufacturer_suffixes = suffixes.get(manufacturer_config_name, [""])
-        if manufacturer_suffixes and manufacturer_suffixes[0]:
-            suffix = random.choice(manufacturer_suffixes)
-            return f"{suffix}{base}"
+        manufacturer_suffixes = _INCREMENTAL_SUFFIXES.get(manufacturer_config_name)
+        if manufacturer_suffixes is not None:
+            return f"{_choice(manufacturer_suffixes)}{base}"
         
         return base
 
-    def generate_serial_number(self, manufacturer_config_name):
+    def generate_serial_number(self, manufacturer_config_name, rng=None):
         """Generate realistic serial number for manufacturer."""
         patterns = self.device_manufacturers_patterns.get(manufacturer_config_name, {})
         serial_pattern = patterns.get("serial_pattern", "{8}")
-        serial_chars = patterns.get("serial_chars", "0123456789ABCDEF")
+        serial_chars = self._serial_charsets.get(manufacturer_config_name, "0123456789ABCDEF")
         
-        # Parse pattern - {N} means N random characters
-        pattern_match = re.search(r'\{(\d+)\}', serial_pattern)
-        if pattern_match:
-            length = int(pattern_match.group(1))
-            serial = self._generate_random_string(length, serial_chars, uppercase=True)
-            return re.sub(r'\{\d+\}', serial, serial_pattern)
+        # Pattern - {N} means N random characters, e.g. "R{8}" or "{8}{8}"; each token
+        # gets its own random run. The parse is cached, so only the first call per pattern touches re
+        template, lengths = _parse_serial_pattern(serial_pattern)
+        if not rng and serial_chars == "0123456789ABCDEF":
+            # Hex serials (also the default for unknown manufacturers) come straight from bytes.hex()
+            random_parts = [self._generate_random_hex_string(length, uppercase=True) for length in lengths]
         else:
-            # Pattern with specific format like "R{8}"
-            result = serial_pattern
-            for match in re.finditer(r'\{(\d+)\}', serial_pattern):
-                length = int(match.group(1))
-                random_part = self._generate_random_string(length, serial_chars, uppercase=True)
-                result = result.replace(match.group(0), random_part, 1)
-            return result
+            random_parts = [
+                self._generate_random_string(length, serial_chars, rng=rng) for length in lengths
+            ]
+        return template.format(*random_parts)
+
+    def list_users(self, device_id):
+        """List user profiles on the device."""
+        result = self._run_adb_shell_command(device_id, ["pm", "list", "users"])
+        if result.returncode != 0:
+            self._log_message(f"Failed to list users on {device_id}: {result.stderr.strip()}", "error")
+            return []
+        return parse_pm_list_users(result.stdout)
+
+    def remove_users(self, device_id, user_ids):
+        """Remove several user profiles in one shell invocation. Returns {user_id: success}."""
+        results = {}
+        removable_ids = []
+        for user_id in (str(u) for u in user_ids):
+            # Never remove the primary user, and only pass numeric IDs to the shell
+            if not user_id.isdigit() or user_id == "0":
+                self._log_message(f"Refusing to remove user '{user_id}'", "warning")
+                results[user_id] = False
+                continue
+            removable_ids.append(user_id)
+        if not removable_ids:
+            return results
+
+        script = "; ".join(
+            f"pm remove-user {user_id} >/dev/null 2>&1; echo RC_{user_id}:$?" for user_id in removable_ids
+        )
+        result = self._run_adb_shell_command(device_id, [script], timeout=30 * len(removable_ids))
+        exit_codes = {}
+        for line in result.stdout.splitlines():
+            if line.startswith("RC_"):
+                user_id, _, code = line[3:].partition(":")
+                exit_codes[user_id] = code.strip()
+
+        for user_id in removable_ids:
+            results[user_id] = exit_codes.get(user_id) == "0"
+            if results[user_id]:
+                self._log_message(f"  ✓ Removed user {user_id}", "success")
+            else:
+                self._log_message(f"  ❌ Failed to remove user {user_id}", "error")
+        return results
 
     def get_install_command_args_for_user(self, user_id_or_str=None):
         """Constructs install command arguments for targeting a specific user."""
-        args = []
-        if user_id_or_str is not None:
-            args.extend(["--user", str(user_id_or_str)])
-        return args 
\ No newline at end of file
+        # Fresh list per call so callers can extend it; the tuple behind it is cached
+        return list(_user_install_args(None if user_id_or_str is None else str(user_id_or_str)))
\ No newline at end of file
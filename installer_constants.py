@@ -4,10 +4,62 @@ APK Installer Constants - v4.5.2 "Odyssey"
 Central configuration constants, patterns, and default values for the APK Installer suite.
 """
 
+import functools
+import json
+import os
+import subprocess
+from types import MappingProxyType
+
 # --- Script Information ---
 SCRIPT_VERSION = "v4.5.2"
 DEVICE_PATTERNS_FILE = "device_patterns.json"
 CONFIG_FILE_NAME = "apk_installer_config.ini"
+DEPENDENCY_MARKER_FILE = os.path.join(
+    os.path.expanduser("~"), ".cache", "adb-apk-installer", "deps.ok"
+)
+
+# --- Concurrency Limits ---
+MAX_PARALLEL_DEVICES = 16
+
+# --- ADB Shell ---
+# How long a persistent `su 0` session gets to answer its first no-op (covers a root grant prompt)
+ROOT_SESSION_PROBE_TIMEOUT_SECONDS = 15
+
+# --- Bundle Extraction ---
+# Read/write size when inflating deflated APKs out of XAPK/APKM archives
+BUNDLE_COPY_CHUNK_SIZE = 4 * 1024 * 1024
+# Threads deleting extracted bundle directories while the next install runs
+BUNDLE_CLEANUP_WORKERS = 2
+# Threads unpacking later bundles of a workflow while earlier ones install
+BUNDLE_PREFETCH_WORKERS = 2
+
+# --- Display ---
+# Worker-thread log lines arriving this close together are printed in one console call
+LOG_BATCH_WINDOW_SECONDS = 0.005
+# Beyond this many rows the installation summary is printed as plain lines instead of Rich tables
+SUMMARY_TABLE_MAX_ROWS = 200
+
+# --- Caching ---
+# Devices are plugged in by hand, so a device list this fresh is still accurate
+DEVICE_LIST_CACHE_TTL_SECONDS = 2.0
+# Root/resetprop/multi-user support only changes if the device is re-flashed or re-rooted
+CAPABILITIES_CACHE_TTL_SECONDS = 60.0
+# APK package names keyed by (path, mtime, size), kept across runs so unchanged APKs aren't re-parsed
+PACKAGE_NAME_CACHE_FILE = os.path.join(
+    os.path.expanduser("~"), ".cache", "adb-apk-installer", "package_names.json"
+)
+# Last APK discovery scan, reused across runs while none of the scanned directories' mtimes move
+APK_INDEX_CACHE_FILE = os.path.join(
+    os.path.expanduser("~"), ".cache", "adb-apk-installer", "apk_index.json"
+)
+# Linux sysfs view of attached USB devices; its entries change on plug/unplug
+USB_DEVICES_SYSFS_DIR = "/sys/bus/usb/devices"
+
+# --- Subprocess Options ---
+# Keeps adb/pip children from flashing a console window on Windows
+SUBPROCESS_KWARGS = (
+    {"creationflags": subprocess.CREATE_NO_WINDOW} if os.name == "nt" else {}
+)
 
 # --- Default Configuration Sections ---
 DEFAULT_CONFIG = {
@@ -77,6 +129,29 @@ DEFAULT_CONFIG = {
     },
 }
 
+
+def _coerce_config_value(value):
+    """Typed form of a default config string: "true"/"false" -> bool, digits -> int, else unchanged."""
+    lowered = value.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    if value.isdigit():
+        return int(value)
+    return value
+
+
+# DEFAULT_CONFIG with values already parsed, used as the fallback when a setting is missing or invalid
+DEFAULT_CONFIG_TYPED = MappingProxyType({
+    section: MappingProxyType({key: _coerce_config_value(value) for key, value in options.items()})
+    for section, options in DEFAULT_CONFIG.items()
+})
+
+# DEFAULT_CONFIG as INI text, laid out the way ConfigParser.write() would write it
+DEFAULT_CONFIG_INI = "".join(
+    f"[{section}]\n" + "".join(f"{key} = {value}\n" for key, value in options.items()) + "\n"
+    for section, options in DEFAULT_CONFIG.items()
+)
+
 # --- ASCII Banner ---
 ASCII_BANNER = """
  █████╗ ██████╗ ██████╗     █████╗ ██████╗ ██╗  ██╗
@@ -89,183 +164,66 @@ ASCII_BANNER = """
              v4.5.2 (Odyssey)
 """
 
+# The pattern and option tables are frozen: they are shared by every manager instance and thread
+def _freeze(value):
+    """Recursively turn dicts into read-only MappingProxyType views and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
 # --- Default Device Manufacturers Patterns ---
-DEFAULT_MANUFACTURERS_PATTERNS = {
-    "samsung": {
-        "brand": "samsung",
-        "manufacturer": "samsung",
-        "models": [
-            {
-                "product": "dm3qxeea",
-                "device": "dm3q",
-                "model": "SM-S908B",
-                "board": "dm3q",
-                "display_name": "Galaxy S22 Ultra",
-                "hardware": "qcom",
-            },
-            {
-                "product": "gts7xlwifi",
-                "device": "gts7xlwifi", 
-                "model": "SM-T970",
-                "board": "kona",
-                "display_name": "Galaxy Tab S7+ Wi-Fi",
-                "hardware": "qcom",
-            },
-        ],
-        "build_id_patterns": {"13": ["TP1A", "TQ1A"], "14": ["UP1A", "UQ1A"]},
-        "serial_pattern": "R{8}",
-        "serial_chars": "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789",
-    },
-    "google": {
-        "brand": "google",
-        "manufacturer": "Google",
-        "models": [
-            {
-                "product": "husky",
-                "device": "husky",
-                "model": "Pixel 8 Pro",
-                "board": "husky",
-                "display_name": "Pixel 8 Pro",
-                "hardware": "husky",
-            },
-            {
-                "product": "oriole",
-                "device": "oriole",
-                "model": "Pixel 6",
-                "board": "slider",
-                "display_name": "Pixel 6",
-                "hardware": "slider",
-            },
-        ],
-        "build_id_patterns": {"13": ["TQ1A", "TQ2A"], "14": ["UQ1A", "UD1A"]},
-        "serial_pattern": "{8}{8}",
-        "serial_chars": "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789",
-    },
-    "xiaomi": {
-        "brand": "xiaomi",
-        "manufacturer": "Xiaomi",
-        "models": [
-            {
-                "product": "venus",
-                "device": "venus",
-                "model": "M2011K2G",
-                "board": "kona",
-                "display_name": "Mi 11",
-                "hardware": "qcom",
-            },
-            {
-                "product": "marble",
-                "device": "marble",
-                "model": "2211133C",
-                "board": "taro",
-                "display_name": "13 Pro",
-                "hardware": "qcom",
-            },
-        ],
-        "build_id_patterns": {"13": ["TQ1A", "TQ2A"], "14": ["UQ1A", "UD1A"]},
-        "serial_pattern": "{10}",
-        "serial_chars": "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789",
-    },
-    "oneplus": {
-        "brand": "oneplus",
-        "manufacturer": "OnePlus",
-        "models": [
-            {
-                "product": "OnePlus11",
-                "device": "OP5915L1",
-                "model": "CPH2449",
-                "board": "kalama",
-                "display_name": "OnePlus 11",
-                "hardware": "qcom",
-            },
-            {
-                "product": "OnePlus10Pro",
-                "device": "OP515BL1",
-                "model": "NE2213",
-                "board": "lahaina",
-                "display_name": "OnePlus 10 Pro",
-                "hardware": "qcom",
-            },
-        ],
-        "build_id_patterns": {"13": ["TP1A", "TQ1A"], "14": ["UP1A", "UQ1A"]},
-        "serial_pattern": "{16}",
-        "serial_chars": "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789",
-    },
-    "oppo": {
-        "brand": "oppo",
-        "manufacturer": "OPPO",
-        "models": [
-            {
-                "product": "OP4F2FL1",
-                "device": "OP4F2F",
-                "model": "CPH2423",
-                "board": "kalama",
-                "display_name": "Find X6 Pro",
-                "hardware": "qcom",
-            },
-        ],
-        "build_id_patterns": {"13": ["TP1A", "TQ1A"], "14": ["UP1A", "UQ1A"]},
-        "serial_pattern": "{15}",
-        "serial_chars": "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789",
-    },
-}
+# Shipped as JSON next to this module and parsed on first use, so importing the
+# constants (e.g. for a plain install run) doesn't build the table
+DEFAULT_MANUFACTURERS_PATTERNS_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "device_patterns_default.json"
+)
+
+
+@functools.cache
+def get_default_manufacturers_patterns():
+    """Load the bundled default manufacturer patterns (frozen, loaded once per process)."""
+    with open(DEFAULT_MANUFACTURERS_PATTERNS_FILE, "rb") as f:
+        return _freeze(json.loads(f.read()))
+
+
+def __getattr__(name):
+    # Keeps `from installer_constants import DEFAULT_MANUFACTURERS_PATTERNS` working, lazily
+    if name == "DEFAULT_MANUFACTURERS_PATTERNS":
+        return get_default_manufacturers_patterns()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# --- Spoofing Options Map for Configuration Menu ---
-SPOOFING_OPTIONS_MAP = {
-    "enable_uniqueness_features": {
-        "section": "UNIQUENESS",
-        "description": "Enable User Profile Management",
-        "type": "boolean",
-        "default": "true",
-    },
-    "enable_magisk_resetprop": {
-        "section": "ADVANCED_SPOOFING", 
-        "description": "Enable Magisk Property Spoofing",
-        "type": "boolean",
-        "default": "true",
-    },
-    "auto_spoof_on_user_creation": {
-        "section": "ADVANCED_SPOOFING",
-        "description": "Auto-apply Device Spoofing for New Users", 
-        "type": "boolean",
-        "default": "true",
-    },
-    "spoof_manufacturer": {
-        "section": "ADVANCED_SPOOFING",
-        "description": "Default Manufacturer for Spoofing",
-        "type": "choice",
-        "choices": ["samsung", "google", "xiaomi", "oneplus", "oppo"],
-        "default": "samsung",
-    },
-    "spoof_android_version": {
-        "section": "ADVANCED_SPOOFING", 
-        "description": "Default Android Version for Spoofing",
-        "type": "choice",
-        "choices": ["13", "14"],
-        "default": "13",
-    },
-}
 
 # --- Default Android Version Release Map ---
-DEFAULT_ANDROID_VERSION_RELEASE_MAP = {
+DEFAULT_ANDROID_VERSION_RELEASE_MAP = _freeze({
     "13": {"release": "13", "sdk": 33},
     "14": {"release": "14", "sdk": 34},
     "12": {"release": "12", "sdk": 31},
     "11": {"release": "11", "sdk": 30},
     "10": {"release": "10", "sdk": 29},
-}
+})
 
 # --- Default Internal SDK Map ---
-DEFAULT_INTERNAL_SDK_MAP = {
+DEFAULT_INTERNAL_SDK_MAP = _freeze({
     33: "13",
     34: "14", 
     31: "12",
     30: "11",
     29: "10",
-}
+})
 
-# --- Spoofing Options Map ---
-SPOOFING_OPTIONS_MAP = {
+# --- Spoofing Options Map for Configuration Menu ---
+SPOOFING_OPTIONS_MAP = _freeze({
+    "enable_uniqueness_features": {
+        "display_name": "Enable User Profile Management",
+        "description": "Create and manage separate user profiles for installations",
+        "config_section": "UNIQUENESS",
+        "config_key": "enable_uniqueness_features",
+        "value_type": "boolean",
+        "default_value": "true",
+    },
     "enable_magisk_resetprop": {
         "display_name": "Enable Magisk resetprop",
         "description": "Use Magisk's resetprop for property modification",
@@ -348,4 +306,4 @@ SPOOFING_OPTIONS_MAP = {
         "value_type": "boolean",
         "default_value": "true",
     },
-} 
\ No newline at end of file
+})
\ No newline at end of file
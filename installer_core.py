@@ -8,74 +8,400 @@ import os
 import sys
 import json
 import re
+import queue
+import shlex
 import shutil
 import subprocess
 import tempfile
 import configparser
+import struct
 import zipfile
 import time
-from pathlib import Path
+import threading
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 
 # Import constants and device spoofing
 from installer_constants import (
     SCRIPT_VERSION,
     DEFAULT_CONFIG, 
+    DEFAULT_CONFIG_TYPED,
+    DEFAULT_CONFIG_INI,
     ASCII_BANNER,
-    SPOOFING_OPTIONS_MAP
+    SPOOFING_OPTIONS_MAP,
+    SUMMARY_TABLE_MAX_ROWS,
+    DEVICE_LIST_CACHE_TTL_SECONDS,
+    USB_DEVICES_SYSFS_DIR,
+    PACKAGE_NAME_CACHE_FILE,
+    APK_INDEX_CACHE_FILE,
+    SUBPROCESS_KWARGS,
+    BUNDLE_COPY_CHUNK_SIZE,
+    BUNDLE_CLEANUP_WORKERS,
+    BUNDLE_PREFETCH_WORKERS,
+    LOG_BATCH_WINDOW_SECONDS
 )
 from device_spoofing import DeviceSpoofingManager
 
 # Rich library support (optional)
 try:
-    from rich.console import Console
-    from rich.table import Table
+    from rich.console import Console, Group
     from rich.panel import Panel
     from rich.text import Text
-    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from rich.theme import Theme
     RICH_AVAILABLE = True
 except ImportError:
     RICH_AVAILABLE = False
 
-# Questionary for interactive prompts (optional)
-try:
+# The banner never changes, so its Panel is built once and reused by every print_banner call
+_BANNER_PANEL = Panel(ASCII_BANNER, style="bold blue", border_style="blue") if RICH_AVAILABLE else None
+
+# Questionary for interactive prompts (optional) - imported on first prompt, since it pulls
+# in prompt_toolkit (the bulk of startup time) and non-interactive runs never prompt
+QUESTIONARY_AVAILABLE = importlib.util.find_spec("questionary") is not None
+
+# pyaxmlparser for APK parsing (optional) - imported on first use, since it pulls in
+# lxml and asn1crypto and only the package-name lookup needs it
+AXMLPARSER_AVAILABLE = importlib.util.find_spec("pyaxmlparser") is not None
+_apk_parser_class = None
+
+
+def _get_questionary():
+    """Import questionary on first use."""
     import questionary
-    QUESTIONARY_AVAILABLE = True
-except ImportError:
-    QUESTIONARY_AVAILABLE = False
+    return questionary
+
+
+def _get_apk_parser_class():
+    """Import pyaxmlparser's APK class on first use."""
+    global _apk_parser_class
+    if _apk_parser_class is None:
+        from pyaxmlparser import APK
+        _apk_parser_class = APK
+    return _apk_parser_class
+
+
+def _run_captured(cmd, timeout, text=True):
+    """subprocess.run with captured output, stdin closed and the platform spawn flags."""
+    return subprocess.run(
+        cmd, stdin=subprocess.DEVNULL, capture_output=True, text=text, timeout=timeout, **SUBPROCESS_KWARGS
+    )
+
+
+def _run_status(cmd, timeout):
+    """Run cmd for its exit status only; output goes to DEVNULL instead of being piped and buffered."""
+    return subprocess.run(
+        cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        timeout=timeout, **SUBPROCESS_KWARGS
+    ).returncode
+
+
+def _failure_text(result, limit=1024):
+    """Decoded head of a byte-mode result's stderr (or stdout if stderr is empty), for error reporting."""
+    return (result.stderr.strip() or result.stdout.strip())[:limit].decode("utf-8", "replace").strip()
+
+
+# Failure code in `adb install` output, e.g. "Failure [INSTALL_FAILED_ALREADY_EXISTS: ...]"
+_INSTALL_FAILURE_CODE_RE = re.compile(r"INSTALL_FAILED_[A-Z_]+")
+
+# Case-insensitive ".apk" suffix test for bundle member names, without lowercasing each name
+_is_apk_member_name = re.compile(r"\.apk\Z", re.IGNORECASE).search
+
+# Package line of `aapt dump badging` output
+_AAPT_PACKAGE_RE = re.compile(r"^package: name='([^']+)'", re.MULTILINE)
+
+# Binary XML (AXML) chunk types and flags used by _read_manifest_package
+_AXML_FILE_TYPE = 0x0003
+_AXML_STRING_POOL_TYPE = 0x0001
+_AXML_START_ELEMENT_TYPE = 0x0102
+_AXML_UTF8_FLAG = 0x100
+_AXML_NO_INDEX = 0xFFFFFFFF
+_AXML_TYPE_STRING = 0x03
+
+
+def _axml_string(data, pool, index):
+    """Decode one entry of an AXML string pool; pool is (offsets_start, strings_start, count, is_utf8)."""
+    offsets_start, strings_start, count, is_utf8 = pool
+    if index >= count:
+        raise ValueError(f"string index {index} out of range")
+    (offset,) = struct.unpack_from("<I", data, offsets_start + index * 4)
+    pos = strings_start + offset
+    if is_utf8:
+        # UTF-16 length (skipped) then UTF-8 byte length, each one or two bytes
+        pos += 2 if data[pos] & 0x80 else 1
+        length = data[pos]
+        if length & 0x80:
+            length = ((length & 0x7F) << 8) | data[pos + 1]
+            pos += 1
+        pos += 1
+        return bytes(data[pos:pos + length]).decode("utf-8")
+    (length,) = struct.unpack_from("<H", data, pos)
+    pos += 2
+    if length & 0x8000:
+        (low,) = struct.unpack_from("<H", data, pos)
+        length = ((length & 0x7FFF) << 16) | low
+        pos += 2
+    return bytes(data[pos:pos + length * 2]).decode("utf-16-le")
+
+
+def _read_manifest_package(apk_path):
+    """Read the package name from an APK's binary AndroidManifest.xml without a full parse.
+
+    Only the manifest entry is decompressed, and only the string pool and the
+    first start tag (<manifest>) are read. Returns None if there's no package attribute.
+    """
+    with zipfile.ZipFile(apk_path) as apk:
+        data = memoryview(apk.read("AndroidManifest.xml"))
+    file_type, header_size, _ = struct.unpack_from("<HHI", data, 0)
+    if file_type != _AXML_FILE_TYPE:
+        return None
+    
+    pool = None
+    pos = header_size
+    while pos + 8 <= len(data):
+        chunk_type, chunk_header_size, chunk_size = struct.unpack_from("<HHI", data, pos)
+        if chunk_size < 8:
+            return None  # Corrupt chunk; don't loop forever
+        if chunk_type == _AXML_STRING_POOL_TYPE:
+            count, _, flags, strings_start = struct.unpack_from("<IIII", data, pos + 8)
+            pool = (pos + chunk_header_size, pos + strings_start, count, bool(flags & _AXML_UTF8_FLAG))
+        elif chunk_type == _AXML_START_ELEMENT_TYPE:
+            if pool is None:
+                return None
+            element = pos + chunk_header_size
+            attribute_start, attribute_size, attribute_count = struct.unpack_from("<HHH", data, element + 8)
+            for i in range(attribute_count):
+                attribute = element + attribute_start + i * attribute_size
+                _, name, raw_value = struct.unpack_from("<III", data, attribute)
+                if _axml_string(data, pool, name) != "package":
+                    continue
+                if raw_value != _AXML_NO_INDEX:
+                    return _axml_string(data, pool, raw_value)
+                value_type, value_data = struct.unpack_from("<3xBI", data, attribute + 12)
+                return _axml_string(data, pool, value_data) if value_type == _AXML_TYPE_STRING else None
+            return None  # The first element is <manifest>; nothing further to look at
+        pos += chunk_size
+    return None
+
+
+# Local file header up to its variable-length fields: signature, fixed fields, name and extra lengths
+_ZIP_LOCAL_HEADER = struct.Struct("<4s22xHH")
+
+
+def _copy_stored_member(bundle, info, dst):
+    """Copy an uncompressed member straight from the archive with os.sendfile; False when that isn't possible.
+
+    Split APKs are usually stored, since they are already compressed inside. The CRC check is
+    skipped here; the package manager verifies every APK's signature on install anyway.
+    """
+    if not hasattr(os, "sendfile") or info.compress_type != zipfile.ZIP_STORED or info.flag_bits & 0x1:
+        return False
+    try:
+        src_fd = bundle.fp.fileno()
+        signature, name_length, extra_length = _ZIP_LOCAL_HEADER.unpack(
+            os.pread(src_fd, _ZIP_LOCAL_HEADER.size, info.header_offset)
+        )
+        if signature != b"PK\x03\x04":
+            return False
+        # Explicit offsets leave the archive's shared file position untouched
+        offset = info.header_offset + _ZIP_LOCAL_HEADER.size + name_length + extra_length
+        remaining = info.file_size
+        while remaining:
+            sent = os.sendfile(dst.fileno(), src_fd, offset, remaining)
+            if not sent:
+                raise zipfile.BadZipFile(f"Truncated member {info.filename}")
+            offset += sent
+            remaining -= sent
+        return True
+    except (OSError, struct.error):
+        # e.g. an in-memory archive, or a platform that only sends to sockets
+        dst.seek(0)
+        dst.truncate()
+        return False
+
+
+def _write_member(bundle, info, path):
+    """Write one bundle member to path, via os.sendfile when it is stored."""
+    with open(path, "wb") as dst:
+        if not _copy_stored_member(bundle, info, dst):
+            with bundle.open(info) as src:
+                shutil.copyfileobj(src, dst, BUNDLE_COPY_CHUNK_SIZE)
+
+
+def _extract_apk_members(bundle, extract_dir, member_cache_dir=None):
+    """Extract only the .apk members of an open bundle ZipFile into extract_dir; returns their paths.
+
+    Screenshots, icons and other payload are never decompressed. Members are flattened to
+    their base names (prefixed when two collide), which also keeps every path inside extract_dir.
+    With member_cache_dir, members are written there once per (CRC, size, name) and hard-linked
+    into extract_dir, so a split shared by several bundles is only extracted the first time.
+    """
+    apk_paths = []
+    used_names = set()
+    for info in bundle.infolist():
+        if info.is_dir() or not _is_apk_member_name(info.filename):
+            continue
+        name = os.path.basename(info.filename.replace("\\", "/"))
+        if name in used_names:
+            name = f"{len(apk_paths)}_{name}"
+        used_names.add(name)
+        apk_path = os.path.join(extract_dir, name)
+        if member_cache_dir is None:
+            _write_member(bundle, info, apk_path)
+        else:
+            # The CRC comes from the central directory, so identifying a member costs nothing
+            cached_path = os.path.join(member_cache_dir, f"{info.CRC:08x}_{info.file_size}_{name}")
+            if not os.path.exists(cached_path):
+                # Written under a unique name first; parallel extractions race only on the rename
+                fd, partial_path = tempfile.mkstemp(dir=member_cache_dir, suffix=".partial")
+                os.close(fd)
+                _write_member(bundle, info, partial_path)
+                os.replace(partial_path, cached_path)
+            try:
+                os.link(cached_path, apk_path)
+            except OSError:
+                shutil.copyfile(cached_path, apk_path)  # No hard links on this filesystem
+        apk_paths.append(apk_path)
+    return apk_paths
 
-# pyaxmlparser for APK parsing (optional)
-try:
-    from pyaxmlparser import AXMLP
-    AXMLPARSER_AVAILABLE = True
-except ImportError:
-    AXMLPARSER_AVAILABLE = False
 
 class InteractiveAPKInstaller:
     """Main interactive APK installer with enhanced user experience and spoofing integration."""
 
+    # (menu option, handler method name); None marks Exit
+    _MAIN_MENU = (
+        ("🚀 Install APKs/XAPKs (Full Workflow)", "_run_installation_workflow"),
+        ("⚡ Simple Install APK(s)", "_run_simple_install_workflow"),
+        ("🎭 Spoofing Configuration", "_show_spoofing_configuration_menu"),
+        ("📱 Phone Management Tools", "_show_phone_management_tools_menu"),
+        ("⚙️  Configuration Settings", "_display_configuration_menu"),
+        ("❌ Exit", None),
+    )
+    MAIN_MENU_OPTIONS = tuple(option for option, _ in _MAIN_MENU)
+    _MAIN_MENU_HANDLERS = dict(_MAIN_MENU)
+    # Plain-text menu for the input() fallback, built once instead of on every menu round
+    _MAIN_MENU_TEXT = "\nPlease select an option:\n" + "".join(
+        f"{i}. {option}\n" for i, option in enumerate(MAIN_MENU_OPTIONS, 1)
+    )
+    _MAIN_MENU_CHOICES = {str(i): option for i, option in enumerate(MAIN_MENU_OPTIONS, 1)}
+    # Failures where the installed copy can't be replaced in place (other signature, or a
+    # downgrade pm refuses even with -d); simple_force_install_apk uninstalls it and retries
+    _UNINSTALL_RETRY_FAILURES = frozenset({
+        "INSTALL_FAILED_UPDATE_INCOMPATIBLE",
+        "INSTALL_FAILED_VERSION_DOWNGRADE",
+    })
+    # Failure codes simple_force_install_apk explains: code -> (explanation, optional hint)
+    _INSTALL_FAILURE_MESSAGES = {
+        "INSTALL_FAILED_MISSING_SPLIT": ("Split APK missing additional files", "Try using the XAPK or bundle version instead"),
+        "INSTALL_FAILED_ALREADY_EXISTS": ("Signature conflict with existing app", None),
+        "INSTALL_FAILED_INSUFFICIENT_STORAGE": ("Not enough storage space", None),
+    }
+    # (minimum success rate, rule color, text style, message, emoji) for show_summary, best first
+    _SUMMARY_BUCKETS = (
+        (100, "#00ff88", "#00ff88 bold", "🎉 ALL INSTALLATIONS COMPLETED SUCCESSFULLY!", "🌟"),
+        (75, "#00ff88", "#00ff88 bold", "✅ MOST INSTALLATIONS COMPLETED SUCCESSFULLY", "✅"),
+        (25, "#f39c12", "#f39c12 bold", "⚠️ SOME INSTALLATIONS COMPLETED", "⚠️"),
+        (0, "#e74c3c", "#e74c3c bold", "❌ MOST INSTALLATIONS FAILED", "💥"),
+    )
+    # (minimum success rate, style, icon) for show_device_installation_summary, best first
+    _DEVICE_SUMMARY_BUCKETS = (
+        (100, "#00ff88 bold", "✅"),
+        (50, "#f39c12 bold", "⚠️"),
+        (0, "#e74c3c bold", "❌"),
+    )
+    LOG_STYLE_MAP = {
+        "info": "#5f87ff",           # Bright blue
+        "success": "#00ff88 bold",   # Bright green bold
+        "warning": "#f39c12 bold",   # Orange bold  
+        "error": "#e74c3c bold",     # Red bold
+        "debug": "#95a5a6",          # Light gray
+        "bold blue": "#5f87ff bold", # Blue bold
+        "bold cyan": "#17a2b8 bold", # Cyan bold
+        "cyan": "#17a2b8",           # Cyan
+        "green": "#00ff88",          # Green
+        "blue": "#5f87ff",           # Blue
+        "red": "#e74c3c",            # Red
+        "yellow": "#f39c12",         # Orange/yellow
+        None: "#ffffff",             # Any other level
+    }
+    # Console theme style name for each (level, dim_style); see _create_log_theme
+    _LOG_THEME_NAMES = {
+        (level, dim_style): f"log.{'dim.' if dim_style else ''}{level or 'default'}"
+        for level in LOG_STYLE_MAP
+        for dim_style in (False, True)
+    }
+
     def __init__(self):
-        self.console = Console() if RICH_AVAILABLE else None
+        self.console = Console(theme=self._create_log_theme()) if RICH_AVAILABLE else None
+        # Summaries and placeholder menus skip Rich rendering when nobody sees the styling (piped output)
+        self._rich_active = bool(self.console and sys.stdout.isatty())
+        self._typed_config_cache = {}  # Parsed bool/int settings; cleared whenever config is replaced
         self.config = {}
         self.adb_path = "adb"  # Default ADB path
         self.apk_directory = "apks"  # Default APK directory
         self.spoofing_manager = None
         self.temp_dir = None
         self.temp_files_to_cleanup = []
+        self.initial_files = []  # Paths passed to run(); used by the next install workflow
         self.device_capabilities = {}  # Store device capabilities
+        self._log_lock = threading.Lock()  # Console writes from worker threads
+        self._log_queue = queue.Queue()  # (message, level, dim_style, markup) logged from worker threads
+        self._log_thread = None  # Renders _log_queue; started on the first worker-thread log
+        self._log_thread_lock = threading.Lock()
+        self._temp_dir_lock = threading.Lock()
+        self._cleanup_executor = None  # Deletes extracted bundles in the background; created on first use
+        self._bundle_extractions = {}  # {(abspath, mtime_ns, size): (extract_dir, APK paths)} for the current workflow
+        self._bundle_extraction_locks = {}  # Same keys; one extraction per bundle under parallel installs
+        self._device_list_cache = None  # (monotonic timestamp, USB signature, devices list)
+        self._apk_scan_cache = None  # (scan settings, {directory: st_mtime_ns}, sorted discovery rows)
+        self._apk_scan_cache_loaded = False  # On-disk index read yet?
+        self._apk_scan_cache_dirty = False
+        self._package_name_cache = None  # {(abspath, mtime_ns, size): package}, loaded on first lookup
+        self._package_name_cache_dirty = False
+        self._package_name_cache_lock = threading.Lock()
+        # Package name sources in order of cost; pyaxmlparser only when it is installed
+        self._package_name_methods = [
+            self._package_from_manifest,
+            *([self._package_from_pyaxmlparser] if AXMLPARSER_AVAILABLE else []),
+            self._package_from_aapt,
+        ]
         
         # Define cohesive styling theme
-        self.app_style = self._create_app_style()
+        self._app_style = None  # questionary Style, built on first prompt
+        self._main_menu_header = self._create_main_menu_header()
         
         # Initialize configuration and spoofing manager
         self.load_config()
         self._apply_fallback_configs_and_init_manager()
 
+    @property
+    def config(self):
+        return self._config
+
+    @config.setter
+    def config(self, value):
+        # Parsed values belong to the old config object (e.g. before a reload)
+        self._config = value
+        self._typed_config_cache.clear()
+
+    def _create_log_theme(self):
+        """Rich theme holding every log style, so the console resolves them by name instead of re-parsing."""
+        return Theme({
+            name: f"dim {self.LOG_STYLE_MAP[level]}" if dim_style else self.LOG_STYLE_MAP[level]
+            for (level, dim_style), name in self._LOG_THEME_NAMES.items()
+        })
+
+    @property
+    def app_style(self):
+        if self._app_style is None:
+            self._app_style = self._create_app_style()
+        return self._app_style
+
     def _create_app_style(self):
         """Create cohesive styling theme for the entire application."""
         if not QUESTIONARY_AVAILABLE:
             return None
             
-        return questionary.Style([
+        return _get_questionary().Style([
             # Main interface elements
             ('question', '#5f87ff bold'),           # Bright blue for questions
             ('answer', '#ffffff bold'),             # White for answers
@@ -109,147 +435,277 @@ class InteractiveAPKInstaller:
             ('selected-bg', 'bg:#34495e #00ff88 bold'),     # Slightly lighter bg
         ])
 
-    def _log_message(self, message, level="info", dim_style=False):
+    def _create_main_menu_header(self):
+        """Build the main menu header once; it is printed on every menu round."""
+        separator = "=" * 60
+        if self.console and RICH_AVAILABLE:
+            return Group(
+                Text(f"\n{separator}", style="blue"),
+                Text("  APK INSTALLER MAIN MENU", style="bold blue"),
+                Text(separator, style="blue"),
+            )
+        return f"\n{separator}\n  APK INSTALLER MAIN MENU\n{separator}"
+
+    def _log_message(self, message, level="info", dim_style=False, markup=True):
         """Centralized logging with Rich formatting using cohesive app colors."""
+        self._log_records([(message, level, dim_style, markup)])
+
+    def _log_plain_message(self, message, level="info", dim_style=False):
+        """_log_message for text that may contain brackets (file names, property values); no markup."""
+        self._log_records([(message, level, dim_style, False)])
+
+    def _log_records(self, records):
+        """Log (message, level, dim_style, markup) records; from the main thread they print in one call."""
+        if threading.current_thread() is not threading.main_thread():
+            # Worker threads (parallel installs) hand lines to the renderer thread instead of
+            # rendering and waiting on the console lock themselves
+            if self._log_thread is None:
+                with self._log_thread_lock:
+                    if self._log_thread is None:
+                        log_thread = threading.Thread(target=self._log_drain, name="log-render", daemon=True)
+                        log_thread.start()
+                        self._log_thread = log_thread
+            for record in records:
+                self._log_queue.put(record)
+            return
+        self._flush_log_queue()  # Keep worker lines ahead of anything the main thread prints next
+        with self._log_lock:
+            self._render_log_records(records)
+
+    def _render_log_records(self, records):
+        """Print (message, level, dim_style, markup) records in one console call; caller holds _log_lock."""
         if self.console and RICH_AVAILABLE:
-            style_map = {
-                "info": "#5f87ff",           # Bright blue
-                "success": "#00ff88 bold",   # Bright green bold
-                "warning": "#f39c12 bold",   # Orange bold  
-                "error": "#e74c3c bold",     # Red bold
-                "debug": "#95a5a6",          # Light gray
-                "bold blue": "#5f87ff bold", # Blue bold
-                "bold cyan": "#17a2b8 bold", # Cyan bold
-                "cyan": "#17a2b8",           # Cyan
-                "green": "#00ff88",          # Green
-                "blue": "#5f87ff",           # Blue
-                "red": "#e74c3c",            # Red
-                "yellow": "#f39c12"          # Orange/yellow
-            }
-            style = style_map.get(level, "#ffffff")
-            if dim_style:
-                style = f"dim {style}"
-            self.console.print(message, style=style)
+            self.console.print(
+                *(
+                    self.console.render_str(
+                        message,
+                        style=self._LOG_THEME_NAMES.get((level, dim_style)) or self._LOG_THEME_NAMES[(None, dim_style)],
+                        markup=markup,
+                    )
+                    for message, level, dim_style, markup in records
+                ),
+                sep="\n",
+            )
         else:
-            print(f"[{level.upper()}] {message}")
+            print("\n".join(f"[{level.upper()}] {message}" for message, level, _, _ in records))
+
+    def _log_drain(self):
+        """Renderer thread: print queued worker log lines, batching those that arrive within a few ms."""
+        while True:
+            records = [self._log_queue.get()]
+            try:
+                while True:
+                    records.append(self._log_queue.get(timeout=LOG_BATCH_WINDOW_SECONDS))
+            except queue.Empty:
+                pass
+            try:
+                with self._log_lock:
+                    self._render_log_records(records)
+            except Exception:
+                pass  # A broken console must not kill the renderer and hang _flush_log_queue
+            finally:
+                for _ in records:
+                    self._log_queue.task_done()
+
+    def _flush_log_queue(self):
+        """Wait until every queued worker log line has been printed."""
+        if self._log_thread is not None:
+            self._log_queue.join()
+
+    def _run_on_devices(self, device_ids, device_func):
+        """Run device_func(device_id) concurrently for each device, returning {device_id: result}."""
+        try:
+            return self.spoofing_manager.run_on_devices(device_ids, device_func)
+        finally:
+            self._flush_log_queue()  # Callers print summaries next
 
     def ensure_temp_directory(self):
         """Ensure temporary directory exists for extractions."""
-        if not self.temp_dir:
-            self.temp_dir = tempfile.mkdtemp(prefix="apk_installer_")
-            self._log_message(f"Created temp directory: {self.temp_dir}", "debug", dim_style=True)
-        return self.temp_dir
+        with self._temp_dir_lock:  # Parallel installs may ask for it at the same time
+            if not self.temp_dir:
+                self.temp_dir = tempfile.mkdtemp(prefix="apk_installer_")
+                self._log_message(f"Created temp directory: {self.temp_dir}", "debug", dim_style=True)
+            return self.temp_dir
+
+    def _remove_tree_in_background(self, path):
+        """Delete a directory tree on a worker thread so the caller can move on to the next install."""
+        with self._temp_dir_lock:
+            if self._cleanup_executor is None:
+                self._cleanup_executor = ThreadPoolExecutor(
+                    max_workers=BUNDLE_CLEANUP_WORKERS, thread_name_prefix="cleanup"
+                )
+            self._cleanup_executor.submit(shutil.rmtree, path, ignore_errors=True)
 
     def cleanup_temp_files(self):
         """Clean up temporary files and directories."""
         cleanup_count = 0
         
-        # Clean individual temp files
-        for temp_file in self.temp_files_to_cleanup:
-            try:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-                    cleanup_count += 1
-            except Exception as e:
-                self._log_message(f"Warning: Could not clean up {temp_file}: {e}", "warning", dim_style=True)
+        # Let pending background deletes finish before removing the temp dir they live in
+        self._release_bundle_extractions()
+        with self._temp_dir_lock:
+            executor, self._cleanup_executor = self._cleanup_executor, None
+        if executor:
+            executor.shutdown(wait=True)
+        
+        # Clean individual temp files; those inside temp_dir go with the rmtree below,
+        # the rest are unlinked one parent directory at a time
+        temp_root = os.path.join(os.path.abspath(self.temp_dir), "") if self.temp_dir else None
+        files_by_directory = {}
+        for temp_file in map(os.path.abspath, self.temp_files_to_cleanup):
+            if temp_root and temp_file.startswith(temp_root):
+                continue
+            directory, name = os.path.split(temp_file)
+            files_by_directory.setdefault(directory, []).append(name)
+        for directory, names in files_by_directory.items():
+            cleanup_count += self._unlink_in_directory(directory, names)
+        self.temp_files_to_cleanup.clear()
         
         # Clean temp directory
-        if self.temp_dir and os.path.exists(self.temp_dir):
+        if self.temp_dir:
             try:
                 shutil.rmtree(self.temp_dir)
                 cleanup_count += 1
                 self._log_message(f"Cleaned up temp directory: {self.temp_dir}", "debug", dim_style=True)
-            except Exception as e:
+                self.temp_dir = None  # ensure_temp_directory makes a fresh one if needed again
+            except FileNotFoundError:
+                self.temp_dir = None  # Already gone
+            except OSError as e:
                 self._log_message(f"Warning: Could not clean up temp directory: {e}", "warning", dim_style=True)
         
         if cleanup_count > 0:
             self._log_message(f"Cleaned up {cleanup_count} temporary items", "debug", dim_style=True)
-
-    def get_package_name_from_apk(self, apk_path_str):
-        """Extract package name from APK using multiple methods."""
         
-        # Method 1: Try pyaxmlparser (most reliable)
-        if AXMLPARSER_AVAILABLE:
-            try:
-                axmlp = AXMLP(apk_path_str)
-                package_name = axmlp.get_package()
-                if package_name:
-                    return package_name
-            except Exception as e:
-                self._log_message(f"pyaxmlparser failed for {apk_path_str}: {e}", "debug", dim_style=True)
+        # Close persistent adb shells
+        if self.spoofing_manager:
+            self.spoofing_manager.close_persistent_shells()
         
-        # Method 2: Try aapt if available
+        self._save_package_name_cache()
+        self._save_apk_index()
+
+    def _unlink_in_directory(self, directory, names):
+        """Remove files from one directory, opening it once for dir_fd-relative unlinks where supported."""
+        dir_fd = None
+        if os.unlink in os.supports_dir_fd:
+            try:
+                dir_fd = os.open(directory, os.O_RDONLY)
+            except OSError:
+                pass
+        removed = 0
         try:
-            result = subprocess.run(
-                ["aapt", "dump", "badging", apk_path_str],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if line.startswith("package:"):
-                        # Extract package name from: package: name='com.example.app' versionCode='123'
-                        parts = line.split("'")
-                        if len(parts) >= 2:
-                            return parts[1]
+            for name in names:
+                try:
+                    if dir_fd is None:
+                        os.unlink(os.path.join(directory, name))
+                    else:
+                        os.unlink(name, dir_fd=dir_fd)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    self._log_message(f"Warning: Could not clean up {os.path.join(directory, name)}: {e}", "warning", dim_style=True)
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
+        return removed
+
+    def _load_package_name_cache(self):
+        """Read the on-disk package name cache, dropping entries for APKs that no longer exist."""
+        cache = {}
+        try:
+            with open(PACKAGE_NAME_CACHE_FILE, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            for path, mtime_ns, size, package_name in entries:
+                if os.path.exists(path):
+                    cache[(path, mtime_ns, size)] = package_name
         except FileNotFoundError:
-            # AAPT tool not found - this is common and expected in many environments
             pass
-        except (subprocess.TimeoutExpired, Exception) as e:
-            self._log_message(f"Package detection issue: {e}", "debug", dim_style=True)
-        
-        # Method 3: Try adb if device is available (fallback)
+        except (OSError, ValueError, TypeError) as e:
+            self._log_message(f"Ignoring unreadable package name cache: {e}", "debug", dim_style=True)
+        return cache
+
+    def _save_package_name_cache(self):
+        """Write the package name cache back to disk if it gained entries this session."""
+        with self._package_name_cache_lock:
+            if not self._package_name_cache_dirty:
+                return
+            entries = [[*key, package_name] for key, package_name in self._package_name_cache.items()]
+            self._package_name_cache_dirty = False
         try:
-            # This requires a connected device, so it's a last resort
-            temp_path = f"/data/local/tmp/temp_package_check.apk"
-            devices = self.get_connected_devices()
-            
-            if devices:
-                device_id = devices[0]['id']
-                
-                # Push APK temporarily
-                subprocess.run(
-                    ["adb", "-s", device_id, "push", apk_path_str, temp_path],
-                    capture_output=True,
-                    timeout=30
-                )
-                
-                # Get package info
-                result = subprocess.run(
-                    ["adb", "-s", device_id, "shell", "pm", "dump", temp_path],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                
-                # Clean up
-                subprocess.run(
-                    ["adb", "-s", device_id, "shell", "rm", temp_path],
-                    capture_output=True
-                )
-                
-                if result.returncode == 0:
-                    for line in result.stdout.split('\n'):
-                        if "Package name=" in line:
-                            return line.split("=")[1].strip()
-                            
-        except Exception as e:
-            self._log_message(f"adb method failed: {e}", "debug", dim_style=True)
+            os.makedirs(os.path.dirname(PACKAGE_NAME_CACHE_FILE), exist_ok=True)
+            with open(PACKAGE_NAME_CACHE_FILE, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+        except OSError as e:
+            self._log_message(f"Could not save package name cache: {e}", "debug", dim_style=True)
+
+    def get_package_name_from_apk(self, apk_path_str):
+        """Extract package name from APK, reusing the cached result while the file is unchanged."""
+        try:
+            st = os.stat(apk_path_str)
+            cache_key = (os.path.abspath(apk_path_str), st.st_mtime_ns, st.st_size)
+        except OSError:
+            cache_key = None
+        
+        if cache_key:
+            with self._package_name_cache_lock:
+                if self._package_name_cache is None:
+                    self._package_name_cache = self._load_package_name_cache()
+                package_name = self._package_name_cache.get(cache_key)
+            if package_name:
+                return package_name
+        
+        package_name = self._detect_package_name(apk_path_str)
+        if cache_key and package_name != "unknown_package":
+            with self._package_name_cache_lock:
+                self._package_name_cache[cache_key] = package_name
+                self._package_name_cache_dirty = True
+        return package_name
+
+    def _detect_package_name(self, apk_path_str):
+        """Extract package name from APK, trying each available method in order."""
+        for method in self._package_name_methods:
+            package_name = method(apk_path_str)
+            if package_name:
+                return package_name
         
         # If all methods fail, return unknown
         return "unknown_package"
 
+    def _package_from_manifest(self, apk_path_str):
+        """Read the package straight from the binary manifest (fast, no dependencies)."""
+        try:
+            return _read_manifest_package(apk_path_str)
+        except (OSError, KeyError, IndexError, ValueError, struct.error, zipfile.BadZipFile) as e:
+            self._log_message(f"Manifest read failed for {apk_path_str}: {e}", "debug", dim_style=True)
+            return None
+
+    def _package_from_pyaxmlparser(self, apk_path_str):
+        """Full manifest parse with pyaxmlparser, for manifests the quick reader can't handle."""
+        try:
+            return _get_apk_parser_class()(apk_path_str).get_package()
+        except Exception as e:  # pyaxmlparser raises a wide range of errors on odd APKs
+            self._log_message(f"pyaxmlparser failed for {apk_path_str}: {e}", "debug", dim_style=True)
+            return None
+
+    def _package_from_aapt(self, apk_path_str):
+        """Package from `aapt dump badging`."""
+        try:
+            result = _run_captured(["aapt", "dump", "badging", apk_path_str], timeout=10)
+        except FileNotFoundError:
+            # AAPT tool not found - common and expected; don't try to spawn it again this session
+            self._package_name_methods = [m for m in self._package_name_methods if m != self._package_from_aapt]
+            return None
+        except (subprocess.SubprocessError, OSError) as e:
+            self._log_message(f"Package detection issue: {e}", "debug", dim_style=True)
+            return None
+        
+        # Extract package name from: package: name='com.example.app' versionCode='123'
+        match = _AAPT_PACKAGE_RE.search(result.stdout) if result.returncode == 0 else None
+        return match.group(1) if match else None
+
     def print_banner(self):
         """Display the application banner."""
         if self.console and RICH_AVAILABLE:
-            banner_panel = Panel(
-                ASCII_BANNER,
-                style="bold blue",
-                border_style="blue"
-            )
-            self.console.print(banner_panel)
+            self.console.print(_BANNER_PANEL)
             self.console.print()
         else:
             print(ASCII_BANNER)
@@ -320,20 +776,21 @@ class InteractiveAPKInstaller:
         self.adb_path = self.config.get("PATHS", {}).get("adb_path", "adb")
         self.apk_directory = self.config.get("PATHS", {}).get("apk_directory", "apks")
 
+    def reload_config(self):
+        """Re-read the configuration file and hand it to the spoofing manager."""
+        previous_adb_path = self.adb_path
+        self.load_config()
+        self.spoofing_manager.config = self.config
+        if self.adb_path != previous_adb_path:
+            self.spoofing_manager.adb_path = self.adb_path
+            self.spoofing_manager.close_persistent_shells()
+
     def create_default_config(self, config_file_str):
         """Create default configuration file."""
         try:
-            config_parser = configparser.ConfigParser()
-            
-            # Convert dict config to ConfigParser format
-            for section_name, section_data in DEFAULT_CONFIG.items():
-                config_parser.add_section(section_name)
-                for key, value in section_data.items():
-                    config_parser.set(section_name, key, str(value))
-            
-            # Write to file
+            # The defaults are static, so their INI text is prebuilt in installer_constants
             with open(config_file_str, 'w', encoding='utf-8') as f:
-                config_parser.write(f)
+                f.write(DEFAULT_CONFIG_INI)
                 
             self._log_message(f"Created default configuration: {config_file_str}", "info")
             return True
@@ -352,7 +809,8 @@ class InteractiveAPKInstaller:
             self.spoofing_manager = DeviceSpoofingManager(
                 adb_path=self.adb_path,
                 console=self.console,
-                config=self.config
+                config=self.config,
+                log_callback=self._log_plain_message,  # Keeps its lines in order with ours
             )
             
             self._log_message("Spoofing manager initialized successfully", "debug", dim_style=True)
@@ -360,93 +818,76 @@ class InteractiveAPKInstaller:
         except Exception as e:
             self._log_message(f"Error initializing spoofing manager: {e}", "error")
             # Create minimal spoofing manager for basic functionality
-            self.spoofing_manager = DeviceSpoofingManager(adb_path=self.adb_path)
+            self.spoofing_manager = DeviceSpoofingManager(adb_path=self.adb_path, log_callback=self._log_plain_message)
+
+    def get_connected_devices(self, use_cache=True):
+        """Get list of connected Android devices, reusing a scan from the last few seconds."""
+        usb_signature = self._usb_topology_signature()
+        if use_cache and self._device_list_cache:
+            scanned_at, cached_signature, devices = self._device_list_cache
+            # A USB plug/unplug invalidates the cache even inside the TTL
+            if (time.monotonic() - scanned_at < DEVICE_LIST_CACHE_TTL_SECONDS
+                    and cached_signature == usb_signature):
+                return list(devices)
+        
+        devices = self._scan_connected_devices()
+        # Empty results aren't cached so a freshly plugged-in device shows up on retry
+        self._device_list_cache = (time.monotonic(), usb_signature, devices) if devices else None
+        return list(devices)
 
-    def verify_adb(self):
-        """Verify ADB is available and functional."""
+    def _usb_topology_signature(self):
+        """Cheap snapshot of attached USB devices (one scandir, no adb spawn); None where unsupported."""
         try:
-            result = subprocess.run(
-                ["adb", "version"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode == 0:
-                version_info = result.stdout.strip().split('\n')[0]
-                self._log_message(f"ADB verified: {version_info}", "debug", dim_style=True)
-                return True
-            else:
-                self._log_message("ADB command failed", "error")
-                return False
-                
-        except FileNotFoundError:
-            self._log_message("ADB not found in PATH", "error")
-            return False
-        except subprocess.TimeoutExpired:
-            self._log_message("ADB verification timed out", "error")
-            return False
-        except Exception as e:
-            self._log_message(f"ADB verification error: {e}", "error")
-            return False
+            with os.scandir(USB_DEVICES_SYSFS_DIR) as entries:
+                return frozenset(entry.name for entry in entries)
+        except OSError:
+            return None
 
-    def get_connected_devices(self):
+    def _scan_connected_devices(self):
         """Get list of connected Android devices with detailed capability scanning."""
         self._log_message("\n📱 Device Detection & Capability Scan", "bold blue")
         if self.console: self.console.rule(style="#5f87ff")
         
         try:
-            result = subprocess.run(
-                [self.adb_path, "devices", "-l"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            result = _run_captured([self.adb_path, "devices", "-l"], timeout=10)
             
             if result.returncode != 0:
                 self._log_message(f"✗ Failed to get device list: {result.stderr.strip()}", "error")
                 return []
             
-            devices_found = []
-            lines = result.stdout.strip().split('\n')[1:]  # Skip header
+            ready_devices = []
+            for line in result.stdout.splitlines()[1:]:  # Skip header
+                # "<serial> <state> [key:value ...]"; offline/unauthorized devices aren't usable
+                parts = line.split()
+                if len(parts) > 1 and parts[1] == "device":
+                    # Extract model hint from device info
+                    model_hint = next((p.split(":")[1] for p in parts if p.startswith("model:")), "")
+                    ready_devices.append((parts[0], model_hint))
+            
+            # Forget cached state for devices that have been disconnected
+            connected_ids = {device_id for device_id, _ in ready_devices}
+            for device_id in list(self.device_capabilities):
+                if device_id not in connected_ids:
+                    self.device_capabilities.pop(device_id, None)
+                    self.spoofing_manager.forget_device(device_id)
+            
+            # Info and capability scans for all devices run at once rather than one after another
+            model_hints = dict(ready_devices)
+            scan_results = self._run_on_devices(
+                [device_id for device_id, _ in ready_devices],
+                lambda device_id: self._scan_one_device(device_id, model_hints[device_id])
+            )
             
-            for line in lines:
-                if line.strip() and ('device' in line or 'offline' in line or 'unauthorized' in line):
-                    parts = re.split(r'\s+', line.strip())
-                    device_id = parts[0]
-                    status = parts[1] if len(parts) > 1 else ""
-                    
-                    if status == "device":
-                        # Extract model hint from device info
-                        model_hint = next((p.split(":")[1] for p in parts if p.startswith("model:")), "")
-                        
-                        # Get basic device info (more robust, no advanced capabilities)
-                        device_info = self.get_basic_device_info_str(device_id, model_hint)
-                        
-                        # Always add device to list first (don't let capability scanning block detection)
-                        devices_found.append({
-                            'id': device_id,
-                            'info': device_info
-                        })
-                        
-                        # Perform simplified capability scanning (optional, non-blocking)
-                        try:
-                            if device_id not in self.device_capabilities:
-                                self._log_message(f"🔬 Scanning capabilities for {device_id} ({device_info})...", "debug", dim_style=True)
-                                # Use a more basic capability detection that avoids config issues
-                                capabilities = self._detect_basic_capabilities(device_id)
-                                self.device_capabilities[device_id] = capabilities
-                        except Exception as e:
-                            # Don't let capability scanning failures block device detection
-                            self._log_message(f"⚠️ Capability scanning failed for {device_id}: {e}", "debug", dim_style=True)
-                            # Provide minimal capabilities
-                            self.device_capabilities[device_id] = {
-                                "multiuser_support": False,
-                                "root_access": False,
-                                "magisk_available": False,
-                                "ephemeral_user_support": False,
-                                "android_sdk_version": 0,
-                            }
+            devices_found = []
+            for device_id, _ in ready_devices:
+                device_info, capabilities = scan_results[device_id]
+                devices_found.append({
+                    'id': device_id,
+                    'info': device_info
+                })
+                # Written here on the calling thread, so the workers never share the dict
+                if capabilities is not None:
+                    self.device_capabilities[device_id] = capabilities
 
             if not devices_found:
                 self._log_message("✗ No devices/emulators found or authorized.", "warning")
@@ -456,21 +897,49 @@ class InteractiveAPKInstaller:
             
             return devices_found
             
+        except FileNotFoundError:
+            self._log_message("ADB not found in PATH", "error")
+            self._log_message("Please ensure ADB is installed and in your PATH", "error")
+            return []
         except Exception as e:
             self._log_message(f"✗ Device detection error: {e}", "error")
             return []
 
+    def _scan_one_device(self, device_id, model_hint=""):
+        """Basic info plus capabilities (None if already known) for one device; safe to run in a worker thread."""
+        device_info = self.get_basic_device_info_str(device_id, model_hint)
+        if device_id in self.device_capabilities:
+            return device_info, None
+        
+        # Perform simplified capability scanning (optional, non-blocking)
+        try:
+            self._log_message(f"🔬 Scanning capabilities for {device_id} ({device_info})...", "debug", dim_style=True)
+            # Use a more basic capability detection that avoids config issues
+            return device_info, self._detect_basic_capabilities(device_id)
+        except Exception as e:
+            # Don't let capability scanning failures block device detection
+            self._log_message(f"⚠️ Capability scanning failed for {device_id}: {e}", "debug", dim_style=True)
+            # Provide minimal capabilities
+            return device_info, {
+                "multiuser_support": False,
+                "root_access": False,
+                "magisk_available": False,
+                "ephemeral_user_support": False,
+                "android_sdk_version": 0,
+            }
+
     def get_device_info_str(self, device_id, model_hint=""):
         """Get detailed device information string with enhanced property detection."""
         try:
-            def get_prop_fast(prop_name):
-                result = self.spoofing_manager._run_adb_shell_command(device_id, ["getprop", prop_name], timeout=3)
-                return result.stdout.strip() if result.returncode == 0 else None
-            
-            model = get_prop_fast("ro.product.model") or model_hint or "Unknown Model"
-            android_version = get_prop_fast("ro.build.version.release") or "Unknown"
-            build_id = get_prop_fast("ro.build.id") or "Unknown"
-            manufacturer = get_prop_fast("ro.product.manufacturer") or ""
+            # All four properties in one shell round-trip
+            model, android_version, build_id, manufacturer = self.spoofing_manager.get_current_property_values(
+                device_id,
+                ["ro.product.model", "ro.build.version.release", "ro.build.id", "ro.product.manufacturer"],
+                timeout=3,
+            )
+            model = model or model_hint or "Unknown Model"
+            android_version = android_version or "Unknown"
+            build_id = build_id or "Unknown"
             
             # Enhanced device info with manufacturer if available
             if manufacturer and manufacturer.lower() != "unknown":
@@ -484,33 +953,15 @@ class InteractiveAPKInstaller:
     def get_basic_device_info_str(self, device_id, model_hint=""):
         """Get basic device information with minimal ADB calls and robust error handling."""
         try:
-            # Try to get basic model info with short timeout
-            try:
-                result = subprocess.run(
-                    [self.adb_path, "-s", device_id, "shell", "getprop", "ro.product.model"],
-                    capture_output=True,
-                    text=True,
-                    timeout=2
-                )
-                model = result.stdout.strip() if result.returncode == 0 and result.stdout.strip() else model_hint
-            except:
-                model = model_hint
+            # Model and Android version in one shell round-trip, with a short timeout
+            model, android_version = self.spoofing_manager.get_current_property_values(
+                device_id, ["ro.product.model", "ro.build.version.release"], timeout=2
+            )
             
             # Fallback to model hint or device ID
             if not model or model.lower() == "unknown":
                 model = model_hint or f"Device {device_id}"
-            
-            # Try to get Android version with short timeout
-            try:
-                result = subprocess.run(
-                    [self.adb_path, "-s", device_id, "shell", "getprop", "ro.build.version.release"],
-                    capture_output=True,
-                    text=True,
-                    timeout=2
-                )
-                android_version = result.stdout.strip() if result.returncode == 0 and result.stdout.strip() else "Unknown"
-            except:
-                android_version = "Unknown"
+            android_version = android_version or "Unknown"
             
             return f"{model} (Android {android_version})"
             
@@ -519,60 +970,10 @@ class InteractiveAPKInstaller:
             return f"{model_hint or device_id} (Connected)"
 
     def _detect_basic_capabilities(self, device_id):
-        """Detect basic device capabilities without config dependencies."""
-        caps = {
-            "multiuser_support": False,
-            "root_access": False,
-            "magisk_available": False,
-            "ephemeral_user_support": False,
-            "android_sdk_version": 0,
-        }
-        
-        try:
-            # Get Android SDK version
-            result = subprocess.run(
-                [self.adb_path, "-s", device_id, "shell", "getprop", "ro.build.version.sdk"],
-                capture_output=True, text=True, timeout=3
-            )
-            if result.returncode == 0 and result.stdout.strip().isdigit():
-                sdk_version = int(result.stdout.strip())
-                caps["android_sdk_version"] = sdk_version
-                if sdk_version >= 26:
-                    caps["ephemeral_user_support"] = True
-            
-            # Check for root access
-            result = subprocess.run(
-                [self.adb_path, "-s", device_id, "shell", "su", "-c", "id"],
-                capture_output=True, text=True, timeout=3
-            )
-            if result.returncode == 0 and "uid=0(root)" in result.stdout:
-                caps["root_access"] = True
-                
-                # Check for resetprop (Magisk)
-                result = subprocess.run(
-                    [self.adb_path, "-s", device_id, "shell", "su", "-c", "which resetprop"],
-                    capture_output=True, text=True, timeout=3
-                )
-                if result.returncode == 0 and result.stdout.strip():
-                    caps["magisk_available"] = True
-            
-            # Check multi-user support
-            result = subprocess.run(
-                [self.adb_path, "-s", device_id, "shell", "pm", "get-max-users"],
-                capture_output=True, text=True, timeout=3
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                try:
-                    max_users = int(result.stdout.strip().split()[-1])
-                    if max_users > 1:
-                        caps["multiuser_support"] = True
-                except:
-                    pass
-        
-        except Exception:
-            pass  # Return default caps
-        
-        return caps
+        """Detect basic device capabilities through the spoofing manager's single probe."""
+        # The manager owns the probe script, so both see the same root/resetprop answer,
+        # and it seeds its own SDK cache so installs don't getprop the SDK again
+        return dict(self.spoofing_manager.get_capabilities(device_id))
 
     def display_capability_summary(self, device_id, capabilities):
         """Display comprehensive device capability summary with professional formatting."""
@@ -626,7 +1027,7 @@ class InteractiveAPKInstaller:
         # Storage space check
         storage_mb = capabilities.get("available_storage_mb")
         if storage_mb is not None:
-            min_required = int(self._get_config_value("SPOOF_VALIDATION", "min_storage_mb", "500"))
+            min_required = self._get_config_int("SPOOF_VALIDATION", "min_storage_mb")
             if storage_mb >= min_required:
                 capability_items.append(f"[green]✓ Storage: {storage_mb}MB available[/]")
             else:
@@ -640,73 +1041,222 @@ class InteractiveAPKInstaller:
             if self.console: 
                 self.console.rule(style="dim cyan")
 
+    def _scan_apk_directory(self, directory, file_types_by_ext, recursive, dir_mtimes):
+        """Yield (os.DirEntry, file type) for files under directory whose lower-cased extension is in file_types_by_ext.
+
+        Each scanned directory's st_mtime_ns is recorded in dir_mtimes.
+        """
+        try:
+            # Taken before listing, so a change made mid-scan still shows up as a newer mtime
+            dir_mtimes[directory] = os.stat(directory).st_mtime_ns
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                yield from self._scan_apk_directory(entry.path, file_types_by_ext, recursive, dir_mtimes)
+                            continue
+                        # rfind+slice rather than splitext; a leading dot alone (".apk") is no extension
+                        name = entry.name
+                        dot = name.rfind('.')
+                        file_type = file_types_by_ext.get(name[dot:].lower()) if dot > 0 else None
+                        if file_type and entry.is_file():
+                            yield entry, file_type
+                    except OSError:
+                        continue
+        except OSError as e:
+            self._log_message(f"⚠️ Could not scan {directory}: {e}", "debug", dim_style=True)
+
+    def _collect_apk_files(self, apk_dir, file_types_by_ext, search_subdirs, max_size_mb):
+        """Scan for discovery rows (type, -mtime, lower name, name, path, size), sorted in display order."""
+        max_size_bytes = max_size_mb * 1024 * 1024
+        min_size_bytes = 0.01 * 1024 * 1024
+        scan_started_ns = time.time_ns()
+        dir_mtimes = {}
+        found_files = []
+        
+        # Enhanced file discovery with validation
+        for entry, file_type in self._scan_apk_directory(apk_dir, file_types_by_ext, search_subdirs, dir_mtimes):
+            try:
+                # DirEntry.stat() is cached, so size and mtime cost one syscall between them
+                file_stat = entry.stat()
+                file_size = file_stat.st_size
+                
+                # Skip files that are too large
+                if file_size > max_size_bytes:
+                    self._log_message(f"⚠️ Skipping large file: {entry.name} ({file_size / (1024 * 1024):.1f}MB > {max_size_mb}MB)", "warning")
+                    continue
+                
+                # Skip empty files
+                if file_size < min_size_bytes:
+                    self._log_message(f"⚠️ Skipping empty file: {entry.name}", "warning") 
+                    continue
+                
+                # Tuple order is the display order: type, newest first, then name
+                found_files.append((file_type, -file_stat.st_mtime, entry.name.lower(), entry.name, entry.path, file_size))
+                
+            except OSError as e:
+                self._log_message(f"⚠️ Error reading file {entry.name}: {e}", "debug", dim_style=True)
+        
+        # Sort by type, then by modification time (newest first), then by name
+        found_files.sort()
+        
+        # Coarse filesystem clocks can leave a just-modified directory's mtime unchanged by a
+        # further edit, so a scan that saw one isn't kept for reuse
+        racy_after_ns = scan_started_ns - 2_000_000_000
+        if all(mtime_ns < racy_after_ns for mtime_ns in dir_mtimes.values()):
+            self._apk_scan_cache = ((apk_dir, file_types_by_ext, search_subdirs, max_size_mb), dir_mtimes, found_files)
+            self._apk_scan_cache_dirty = True
+        return found_files
+
+    def _load_apk_index(self):
+        """Read the last run's discovery scan from disk, or None."""
+        try:
+            with open(APK_INDEX_CACHE_FILE, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            apk_dir, file_types, search_subdirs, max_size_mb = index["settings"]
+            return (
+                (apk_dir, dict(file_types), search_subdirs, max_size_mb),
+                index["dir_mtimes"],
+                [tuple(row) for row in index["files"]],
+            )
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            self._log_message(f"Ignoring unreadable APK index: {e}", "debug", dim_style=True)
+        return None
+
+    def _save_apk_index(self):
+        """Write the latest discovery scan to disk if it was rescanned this session."""
+        if not self._apk_scan_cache_dirty:
+            return
+        self._apk_scan_cache_dirty = False
+        (apk_dir, file_types_by_ext, search_subdirs, max_size_mb), dir_mtimes, found_files = self._apk_scan_cache
+        index = {
+            "settings": [apk_dir, list(file_types_by_ext.items()), search_subdirs, max_size_mb],
+            "dir_mtimes": dir_mtimes,
+            "files": found_files,
+        }
+        try:
+            cache_dir = os.path.dirname(APK_INDEX_CACHE_FILE)
+            os.makedirs(cache_dir, exist_ok=True)
+            # Written beside the target and swapped in, so a concurrent run never reads half a file
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(index, f)
+                os.replace(tmp_path, APK_INDEX_CACHE_FILE)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            self._log_message(f"Could not save APK index: {e}", "debug", dim_style=True)
+
+    def _cached_apk_scan(self, apk_dir, file_types_by_ext, search_subdirs, max_size_mb):
+        """Rows from the last discovery scan if its settings match and no scanned directory has changed."""
+        if not self._apk_scan_cache_loaded:
+            self._apk_scan_cache_loaded = True
+            if self._apk_scan_cache is None:
+                self._apk_scan_cache = self._load_apk_index()
+        if self._apk_scan_cache is None:
+            return None
+        scan_settings, dir_mtimes, found_files = self._apk_scan_cache
+        if scan_settings != (apk_dir, file_types_by_ext, search_subdirs, max_size_mb):
+            return None
+        try:
+            # Adding, removing or renaming a file bumps its directory's mtime: one stat per directory
+            if all(os.stat(directory).st_mtime_ns == mtime_ns for directory, mtime_ns in dir_mtimes.items()):
+                return found_files
+        except OSError:
+            pass
+        return None
+
+    def _file_types_by_ext(self):
+        """".apk" -> "APK" etc. for the configured allowed_extensions."""
+        file_types = self._get_config_value("FILE_DISCOVERY", "allowed_extensions", "apk,xapk,apkm,zip").split(",")
+        return {f".{ft.strip().lower()}": ft.strip().upper() for ft in file_types if ft.strip()}
+
+    def _describe_explicit_files(self, paths):
+        """File-info dicts, as find_apk_files returns them, for paths given directly; no directory scan."""
+        file_types_by_ext = self._file_types_by_ext()
+        found_files = []
+        for path in paths:
+            file_type = file_types_by_ext.get(os.path.splitext(path)[1].lower())
+            if not file_type:
+                self._log_message(f"⚠️ Skipping unsupported file: {path}", "warning")
+                continue
+            try:
+                file_stat = os.stat(path)
+            except OSError as e:
+                self._log_message(f"⚠️ Skipping {path}: {e}", "warning")
+                continue
+            found_files.append({
+                'name': os.path.basename(path),
+                'path': os.path.abspath(path),
+                'size_mb': round(file_stat.st_size / (1024 * 1024), 1),
+                'type': file_type,
+                'modified': file_stat.st_mtime
+            })
+        return found_files
+
+    def _choose_apk_files(self):
+        """Files passed to run(), used once, or else discovered and picked interactively."""
+        if self.initial_files:
+            paths, self.initial_files = self.initial_files, []
+            selected_files = self._describe_explicit_files(paths)
+            if not selected_files:
+                self._log_message("None of the given files can be installed", "error")
+            return selected_files
+        
+        # Find APK files
+        apk_files = self.find_apk_files()
+        if not apk_files:
+            self._log_message("No APK/XAPK/APKM files found in current directory", "error")
+            return []
+        
+        # Select files
+        selected_files = self.select_apks(apk_files)
+        if not selected_files:
+            self._log_message("No files selected", "warning")
+        return selected_files
+
     def find_apk_files(self):
         """Find APK, XAPK, APKM, and ZIP files with detailed discovery reporting."""
         self._log_message("\n📦 APK/XAPK/APKM/ZIP File Discovery", "bold blue")
         if self.console: self.console.rule(style="blue")
         
-        apk_dir = Path(self.apk_directory)
+        # Resolved once; every entry path below is built from it by scandir, with no further stats
+        apk_dir = os.path.realpath(self.apk_directory)
         
-        if not apk_dir.exists():
+        if not os.path.isdir(apk_dir):
             try:
-                apk_dir.mkdir(parents=True, exist_ok=True)
-                self._log_message(f"✓ Created APK directory: [italic]{apk_dir.resolve()}[/italic]", "success")
-            except Exception as e:
+                os.makedirs(apk_dir, exist_ok=True)
+                self._log_message(f"✓ Created APK directory: [italic]{apk_dir}[/italic]", "success")
+            except OSError as e:
                 self._log_message(f"✗ Failed to create APK directory: {e}", "error")
                 return []
         
-        self._log_message(f"🔍 Scanning directory: [italic]{apk_dir.resolve()}[/italic]", "info")
+        self._log_message(f"🔍 Scanning directory: [italic]{apk_dir}[/italic]", "info")
         
-        file_types = self._get_config_value("FILE_DISCOVERY", "allowed_extensions", "apk,xapk,apkm,zip").split(",")
         search_subdirs = self._get_config_boolean("FILE_DISCOVERY", "search_subdirectories", True)
-        max_size_mb = int(self._get_config_value("FILE_DISCOVERY", "max_file_size_mb", "2048"))
+        max_size_mb = self._get_config_int("FILE_DISCOVERY", "max_file_size_mb")
+        file_types_by_ext = self._file_types_by_ext()
         
-        found_files = []
-        file_type_counts = {"APK": 0, "XAPK": 0, "APKM": 0, "ZIP": 0}
-        total_size_mb = 0
+        # Going back to the menu and in again reuses the last scan unless a directory changed
+        found_files = self._cached_apk_scan(apk_dir, file_types_by_ext, search_subdirs, max_size_mb)
+        if found_files is None:
+            found_files = self._collect_apk_files(apk_dir, file_types_by_ext, search_subdirs, max_size_mb)
         
-        # Enhanced file discovery with validation
-        extensions = [f"*.{ft.strip().lower()}" for ft in file_types]
-        
-        for ext in extensions:
-            search_pattern = f"**/{ext}" if search_subdirs else ext
-            
-            for file_path in apk_dir.glob(search_pattern):
-                if file_path.is_file():
-                    try:
-                        file_type = file_path.suffix.upper().replace('.', '')
-                        if file_type not in file_type_counts:
-                            file_type_counts[file_type] = 0
-                        
-                        file_size_mb = file_path.stat().st_size / (1024 * 1024)
-                        
-                        # Skip files that are too large
-                        if file_size_mb > max_size_mb:
-                            self._log_message(f"⚠️ Skipping large file: {file_path.name} ({file_size_mb:.1f}MB > {max_size_mb}MB)", "warning")
-                            continue
-                        
-                        # Skip empty files
-                        if file_size_mb < 0.01:
-                            self._log_message(f"⚠️ Skipping empty file: {file_path.name}", "warning") 
-                            continue
-                        
-                        found_files.append({
-                            'name': file_path.name,
-                            'path': str(file_path.resolve()),
-                            'size_mb': round(file_size_mb, 1),
-                            'type': file_type,
-                            'modified': file_path.stat().st_mtime
-                        })
-                        
-                        file_type_counts[file_type] += 1
-                        total_size_mb += file_size_mb
-                        
-                    except OSError as e:
-                        self._log_message(f"⚠️ Error reading file {file_path.name}: {e}", "debug", dim_style=True)
+        file_type_counts = dict.fromkeys(["APK", "XAPK", "APKM", "ZIP", *file_types_by_ext.values()], 0)
+        total_size_bytes = 0
+        for file_type, _, _, _, _, file_size in found_files:
+            file_type_counts[file_type] += 1
+            total_size_bytes += file_size
         
         # Display discovery results
+        total_size_mb = total_size_bytes / (1024 * 1024)
         if not found_files:
-            self._log_message(f"✗ No compatible files found in [italic]{apk_dir.resolve()}[/italic]", "warning")
+            self._log_message(f"✗ No compatible files found in [italic]{apk_dir}[/italic]", "warning")
             self._log_message("💡 Supported formats: APK, XAPK, APKM, ZIP", "info")
         else:
             self._log_message(f"✓ Found {len(found_files)} compatible file(s) ([cyan]{total_size_mb:.1f}MB total[/cyan])", "success")
@@ -720,17 +1270,29 @@ class InteractiveAPKInstaller:
             if type_summary and self.console:
                 self.console.print(f"  📋 Breakdown: {', '.join(type_summary)}", style="dim cyan")
         
-        # Sort by type, then by modification time (newest first), then by name
-        found_files.sort(key=lambda x: (x['type'], -x['modified'], x['name'].lower()))
-        return found_files
+        return [
+            {
+                'name': name,
+                'path': path,
+                'size_mb': round(file_size / (1024 * 1024), 1),
+                'type': file_type,
+                'modified': -neg_mtime
+            }
+            for file_type, neg_mtime, _, name, path, file_size in found_files
+        ]
+
+    def run(self, initial_files=None, cleanup_on_exit=True):
+        """Main application entry point; initial_files (e.g. drag-and-drop paths) replace discovery once.
 
-    def run(self):
-        """Main application entry point."""
+        Pass cleanup_on_exit=False to call cleanup_temp_files yourself, e.g. while an exit prompt waits.
+        """
+        self.initial_files = list(initial_files or [])
         try:
             self.print_banner()
             
-            # Verify ADB
-            if not self.verify_adb():
+            # Only a PATH lookup here; the first `adb devices` scan confirms adb actually runs
+            if shutil.which(self.adb_path) is None:
+                self._log_message("ADB not found in PATH", "error")
                 self._log_message("Please ensure ADB is installed and in your PATH", "error")
                 return False
             
@@ -744,34 +1306,23 @@ class InteractiveAPKInstaller:
             self._log_message(f"Unexpected error: {e}", "error")
             return False
         finally:
-            self.cleanup_temp_files()
+            if cleanup_on_exit:
+                self.cleanup_temp_files()
 
     def _show_main_menu(self):
         """Display main menu and handle user selection."""
         while True:
             if self.console and RICH_AVAILABLE:
-                self.console.print("\n" + "="*60, style="blue")
-                self.console.print("  APK INSTALLER MAIN MENU", style="bold blue")
-                self.console.print("="*60, style="blue")
+                self.console.print(self._main_menu_header)
             else:
-                print("\n" + "="*60)
-                print("  APK INSTALLER MAIN MENU")
-                print("="*60)
-            
-            menu_options = [
-                "🚀 Install APKs/XAPKs (Full Workflow)",
-                "⚡ Simple Install APK(s)",
-                "🎭 Spoofing Configuration", 
-                "📱 Phone Management Tools",
-                "⚙️  Configuration Settings",
-                "❌ Exit"
-            ]
+                print(self._main_menu_header)
             
-            if QUESTIONARY_AVAILABLE:
+            # questionary needs an interactive terminal; otherwise use plain input()
+            if QUESTIONARY_AVAILABLE and sys.stdin.isatty():
                 try:
-                    choice = questionary.select(
+                    choice = _get_questionary().select(
                         "🎯 Please select an option:",
-                        choices=menu_options,
+                        choices=list(self.MAIN_MENU_OPTIONS),
                         style=self.app_style
                     ).ask()
                     
@@ -782,36 +1333,24 @@ class InteractiveAPKInstaller:
                     return False
             else:
                 # Fallback menu
-                print("\nPlease select an option:")
-                for i, option in enumerate(menu_options, 1):
-                    print(f"{i}. {option}")
-                
+                sys.stdout.write(self._MAIN_MENU_TEXT)
                 try:
-                    choice_num = int(input("\nEnter your choice (1-6): "))
-                    if 1 <= choice_num <= len(menu_options):
-                        choice = menu_options[choice_num - 1]
-                    else:
-                        self._log_message("Invalid choice", "error")
-                        continue
-                except (ValueError, KeyboardInterrupt):
+                    choice = self._MAIN_MENU_CHOICES.get(
+                        input(f"\nEnter your choice (1-{len(self.MAIN_MENU_OPTIONS)}): ").strip()
+                    )
+                except (EOFError, KeyboardInterrupt):
                     return False
+                if not choice:
+                    self._log_message("Invalid choice", "error")
+                    continue
             
             # Handle menu selection
-            if "Install APKs/XAPKs (Full Workflow)" in choice:
-                if not self._run_installation_workflow():
-                    continue
-            elif "Simple Install APK(s)" in choice:
-                if not self._run_simple_install_workflow():
-                    continue
-            elif "Spoofing Configuration" in choice:
-                self._show_spoofing_configuration_menu()
-            elif "Phone Management" in choice:
-                self._show_phone_management_tools_menu()
-            elif "Configuration Settings" in choice:
-                self._display_configuration_menu()
-            elif "Exit" in choice:
+            handler_name = self._MAIN_MENU_HANDLERS.get(choice, "")
+            if handler_name is None:
                 self._log_message("Thank you for using APK Installer!", "info")
                 return True
+            if handler_name:
+                getattr(self, handler_name)()
 
     def _run_installation_workflow(self):
         """Run the main APK installation workflow."""
@@ -828,16 +1367,9 @@ class InteractiveAPKInstaller:
                 self._log_message("No devices selected", "warning")
                 return False
             
-            # Find APK files
-            apk_files = self.find_apk_files()
-            if not apk_files:
-                self._log_message("No APK/XAPK/APKM files found in current directory", "error")
-                return False
-            
-            # Select files
-            selected_files = self.select_apks(apk_files)
+            # Files given on the command line skip the directory scan and the picker
+            selected_files = self._choose_apk_files()
             if not selected_files:
-                self._log_message("No files selected", "warning")
                 return False
             
             # Confirm and install
@@ -865,16 +1397,9 @@ class InteractiveAPKInstaller:
                 self._log_message("No devices selected", "warning")
                 return False
             
-            # Find APK files
-            apk_files = self.find_apk_files()
-            if not apk_files:
-                self._log_message("No APK/XAPK/APKM files found in current directory", "error")
-                return False
-            
-            # Select files (multi-select)
-            selected_files = self.select_apks(apk_files)
+            # Files given on the command line skip the directory scan and the picker
+            selected_files = self._choose_apk_files()
             if not selected_files:
-                self._log_message("No files selected", "warning")
                 return False
             
             # Force install without confirmation - with beautiful styling
@@ -891,19 +1416,38 @@ class InteractiveAPKInstaller:
             return False
 
     def _get_config_boolean(self, section, key, fallback=True):
-        """Safely get boolean config value from either dict or ConfigParser."""
+        """Safely get boolean config value from either dict or ConfigParser, parsed once per config."""
+        cache_key = ("bool", section, key, fallback)
+        cached = self._typed_config_cache.get(cache_key)
+        if cached is not None:
+            return cached
         try:
             if hasattr(self.config, 'getboolean'):
                 # ConfigParser object
-                return self.config.getboolean(section, key, fallback=fallback)
+                value = self.config.getboolean(section, key, fallback=fallback)
             else:
                 # Dict object
                 value = self.config.get(section, {}).get(key, str(fallback))
-                if isinstance(value, bool):
-                    return value
-                return str(value).lower() in ('true', '1', 'yes', 'on')
-        except:
-            return fallback
+                if not isinstance(value, bool):
+                    value = str(value).lower() in ('true', '1', 'yes', 'on')
+        except (configparser.Error, ValueError, AttributeError):
+            value = fallback
+        self._typed_config_cache[cache_key] = value
+        return value
+
+    def _get_config_int(self, section, key):
+        """Get integer config value, falling back to the pre-parsed default when missing or invalid."""
+        cache_key = ("int", section, key)
+        cached = self._typed_config_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        value = self._get_config_value(section, key, None)
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            value = DEFAULT_CONFIG_TYPED.get(section, {}).get(key, 0)
+        self._typed_config_cache[cache_key] = value
+        return value
 
     def _get_config_value(self, section, key, fallback=""):
         """Safely get config value from either dict or ConfigParser."""
@@ -917,7 +1461,7 @@ class InteractiveAPKInstaller:
                     return self.config.get(section, {}).get(key, fallback)
             else:
                 return fallback
-        except:
+        except (configparser.Error, ValueError, AttributeError):
             return fallback
 
     def select_devices(self, devices_list_param):
@@ -1022,7 +1566,7 @@ class InteractiveAPKInstaller:
 
         try:
             choices = [
-                questionary.Choice(
+                _get_questionary().Choice(
                     title=item_formatter_func(item),
                     value=item
                 )
@@ -1034,7 +1578,7 @@ class InteractiveAPKInstaller:
                 if self.console:
                     self.console.print("\n💡 Controls: [#00ff88 bold]SPACEBAR[/#00ff88 bold] select/deselect • [#00ff88 bold]A[/#00ff88 bold] select all • [#00ff88 bold]I[/#00ff88 bold] invert • [#00ff88 bold]ENTER[/#00ff88 bold] confirm", style="#95a5a6")
                 
-                selected = questionary.checkbox(
+                selected = _get_questionary().checkbox(
                     f"📋 Select {plural_name.lower()}:",
                     choices=choices,
                     style=self.app_style
@@ -1053,7 +1597,7 @@ class InteractiveAPKInstaller:
                     return selected
                 else:
                     self._log_message(f"⚠️ No {plural_name.lower()} selected! Use [bold]SPACEBAR[/bold] to select items, then [bold]ENTER[/bold].", "warning")
-                    if not questionary.confirm(f"❓ Continue with no {plural_name.lower()} selected?", default=False, style=self.app_style).ask():
+                    if not _get_questionary().confirm(f"❓ Continue with no {plural_name.lower()} selected?", default=False, style=self.app_style).ask():
                         continue
                     else:
                         self._log_message(f"No {plural_name.lower()} selected.", "warning")
@@ -1090,7 +1634,16 @@ class InteractiveAPKInstaller:
 
     def confirm_installation(self, selected_devices_list, selected_files_list):
         """Confirm installation details with user."""
-        if self.console and RICH_AVAILABLE:
+        device_rows = [(device['id'], device['info']) for device in selected_devices_list]
+        file_rows = [
+            (file_info['name'], f"{file_info['size_mb']} MB", file_info['type'])
+            for file_info in selected_files_list
+        ]
+        
+        if self.console and RICH_AVAILABLE and len(device_rows) + len(file_rows) <= SUMMARY_TABLE_MAX_ROWS:
+            # rich.table is only needed here, so it isn't imported at startup
+            from rich.table import Table
+            
             self.console.print("\n" + "="*50, style="green")
             self.console.print("  INSTALLATION SUMMARY", style="bold green")
             self.console.print("="*50, style="green")
@@ -1100,8 +1653,8 @@ class InteractiveAPKInstaller:
             devices_table.add_column("Device ID", style="cyan")
             devices_table.add_column("Device Info", style="white")
             
-            for device in selected_devices_list:
-                devices_table.add_row(device['id'], device['info'])
+            for row in device_rows:
+                devices_table.add_row(*row)
             
             self.console.print(devices_table)
             self.console.print()
@@ -1112,32 +1665,23 @@ class InteractiveAPKInstaller:
             files_table.add_column("Size", style="white")
             files_table.add_column("Type", style="magenta")
             
-            for file_info in selected_files_list:
-                files_table.add_row(
-                    file_info['name'],
-                    f"{file_info['size_mb']} MB",
-                    file_info['type']
-                )
+            for row in file_rows:
+                files_table.add_row(*row)
             
             self.console.print(files_table)
         else:
-            print("\n" + "="*50)
-            print("  INSTALLATION SUMMARY")
-            print("="*50)
-            
-            print(f"\nDevices ({len(selected_devices_list)}):")
-            for device in selected_devices_list:
-                print(f"  - {device['id']} - {device['info']}")
-            
-            print(f"\nFiles ({len(selected_files_list)}):")
-            for file_info in selected_files_list:
-                print(f"  - {file_info['name']} ({file_info['size_mb']} MB, {file_info['type']})")
+            # Large selections (or no Rich): one write of plain lines, no per-row table layout
+            lines = ["", "="*50, "  INSTALLATION SUMMARY", "="*50, "", f"Devices ({len(device_rows)}):"]
+            lines += [f"  - {device_id} - {info}" for device_id, info in device_rows]
+            lines += ["", f"Files ({len(file_rows)}):"]
+            lines += [f"  - {name} ({size}, {file_type})" for name, size, file_type in file_rows]
+            sys.stdout.write("\n".join(lines) + "\n")
         
         total_operations = len(selected_devices_list) * len(selected_files_list)
         
         if QUESTIONARY_AVAILABLE:
             try:
-                confirm = questionary.confirm(
+                confirm = _get_questionary().confirm(
                     f"🚀 Proceed with {total_operations} installation operations?",
                     default=True,
                     style=self.app_style
@@ -1156,27 +1700,23 @@ class InteractiveAPKInstaller:
     def install_selected_apks(self, selected_devices_list, selected_files_info_list):
         """Install selected APKs on selected devices."""
         total_ops = len(selected_devices_list) * len(selected_files_info_list)
-        successful_ops = 0
         
         if self.console and RICH_AVAILABLE:
             self.console.print(f"\n🚀 Starting installation of {len(selected_files_info_list)} files on {len(selected_devices_list)} devices...", style="#5f87ff bold")
         else:
             print(f"\nStarting installation of {len(selected_files_info_list)} files on {len(selected_devices_list)} devices...")
         
-        for device_dict in selected_devices_list:
+        def install_on_device(device_dict):
             device_successes = 0
             device_failures = 0
             
-            if self.console and RICH_AVAILABLE:
-                self.console.print(f"\n📱 Installing on {device_dict['id']} - {device_dict['info']}", style="#17a2b8 bold")
-            else:
-                print(f"\nInstalling on {device_dict['id']} - {device_dict['info']}")
+            # Logged rather than printed: with parallel installs this runs on a worker thread
+            self._log_plain_message(f"\n📱 Installing on {device_dict['id']} - {device_dict['info']}", "bold cyan")
             
             for file_info_dict in selected_files_info_list:
                 try:
                     success = self.install_apk_or_xapk(device_dict, file_info_dict)
                     if success:
-                        successful_ops += 1
                         device_successes += 1
                     else:
                         device_failures += 1
@@ -1185,8 +1725,9 @@ class InteractiveAPKInstaller:
                     self._log_message(f"Installation error: {e}", "error")
                     device_failures += 1
             
-            # Show device summary
-            self.show_device_installation_summary(device_dict['id'], device_successes, device_failures)
+            return device_successes, device_failures
+        
+        successful_ops = self._install_on_devices(selected_devices_list, install_on_device, selected_files_info_list)
         
         # Show overall summary
         self.show_summary(successful_ops, total_ops)
@@ -1196,7 +1737,6 @@ class InteractiveAPKInstaller:
     def simple_install_apks(self, selected_devices_list, selected_files_info_list):
         """Simple force installation of APKs with overwrite capability."""
         total_ops = len(selected_devices_list) * len(selected_files_info_list)
-        successful_ops = 0
         
         if self.console and RICH_AVAILABLE:
             self.console.print(f"\n⚡ Force installing {len(selected_files_info_list)} files on {len(selected_devices_list)} devices with overwrite...", style="#f39c12 bold")
@@ -1204,44 +1744,119 @@ class InteractiveAPKInstaller:
         else:
             print(f"\nForce installing {len(selected_files_info_list)} files on {len(selected_devices_list)} devices with overwrite...")
         
-        for device_dict in selected_devices_list:
+        def install_on_device(device_dict):
             device_successes = 0
             device_failures = 0
             
-            if self.console and RICH_AVAILABLE:
-                self.console.print(f"\n📱 Force installing on {device_dict['id']} - {device_dict['info']}", style="#17a2b8 bold")
-            else:
-                print(f"\nForce installing on {device_dict['id']} - {device_dict['info']}")
+            # Logged rather than printed: with parallel installs this runs on a worker thread
+            self._log_plain_message(f"\n📱 Force installing on {device_dict['id']} - {device_dict['info']}", "bold cyan")
             
+            # Per-file results are printed as one block after the device's loop, not a write per file
+            result_lines = []
             for file_info_dict in selected_files_info_list:
                 try:
                     # Force install with overwrite - always replace existing packages
                     if self.simple_force_install_apk(device_dict, file_info_dict):
-                        successful_ops += 1
                         device_successes += 1
-                        if self.console and RICH_AVAILABLE:
-                            self.console.print(f"  ✅ {file_info_dict['name']}", style="green")
-                        else:
-                            print(f"  ✅ {file_info_dict['name']}")
+                        result_lines.append((f"  ✅ {file_info_dict['name']}", "green"))
                     else:
                         device_failures += 1
-                        if self.console and RICH_AVAILABLE:
-                            self.console.print(f"  ❌ {file_info_dict['name']}", style="red")
-                        else:
-                            print(f"  ❌ {file_info_dict['name']}")
+                        result_lines.append((f"  ❌ {file_info_dict['name']}", "red"))
                             
                 except Exception as e:
                     device_failures += 1
                     self._log_message(f"Installation error for {file_info_dict['name']}: {e}", "error")
             
-            # Show device summary
-            self.show_device_installation_summary(device_dict['id'], device_successes, device_failures)
+            if result_lines:
+                self._log_records([(line, level, False, False) for line, level in result_lines])
+            
+            return device_successes, device_failures
+        
+        successful_ops = self._install_on_devices(selected_devices_list, install_on_device, selected_files_info_list)
         
         # Show overall summary
         self.show_summary(successful_ops, total_ops)
         
         return successful_ops > 0
 
+    def _install_on_devices(self, selected_devices_list, install_on_device, selected_files_info_list=()):
+        """Run install_on_device(device_dict) -> (successes, failures) for each device; returns total successes."""
+        prefetch_executor = self._prefetch_bundle_extractions(selected_files_info_list)
+        try:
+            return self._install_on_each_device(selected_devices_list, install_on_device)
+        finally:
+            if prefetch_executor:
+                # The installs have asked for every bundle by now, so leftover tasks just hit the cache
+                prefetch_executor.shutdown(wait=True)
+            # Bundles are extracted once and shared by every device, then dropped together
+            self._release_bundle_extractions()
+
+    def _prefetch_bundle_extractions(self, selected_files_info_list):
+        """Start extracting the selected bundles in the background; returns the executor, or None."""
+        bundle_paths = [
+            file_info_dict['path'] for file_info_dict in selected_files_info_list
+            if file_info_dict.get('type', 'APK') != 'APK'
+        ]
+        if len(bundle_paths) < 2:
+            return None
+        # A device installs one file at a time, so later bundles unpack while earlier ones install;
+        # the per-bundle locks make an install wait for an extraction already under way
+        executor = ThreadPoolExecutor(max_workers=BUNDLE_PREFETCH_WORKERS, thread_name_prefix="extract")
+        for bundle_path in bundle_paths:
+            executor.submit(self._extracted_bundle_apks, bundle_path)
+        return executor
+
+    def _install_on_each_device(self, selected_devices_list, install_on_device):
+        """Device loop for _install_on_devices, parallel when parallel_installations is on."""
+        # Devices are independent, so with parallel_installations on each gets its own worker;
+        # files still go one at a time per device
+        if len(selected_devices_list) > 1 and self._get_config_boolean("INSTALLATION", "parallel_installations", False):
+            devices_by_id = {device_dict['id']: device_dict for device_dict in selected_devices_list}
+            results = self._run_on_devices(
+                list(devices_by_id), lambda device_id: install_on_device(devices_by_id[device_id])
+            )
+            # Per-device summaries are printed afterwards, as one block, so they aren't interleaved with live output
+            self.show_device_installation_summaries(
+                (device_id, successes, failures) for device_id, (successes, failures) in results.items()
+            )
+            return sum(successes for successes, _ in results.values())
+        
+        successful_ops = 0
+        for device_dict in selected_devices_list:
+            successes, failures = install_on_device(device_dict)
+            self.show_device_installation_summary(device_dict['id'], successes, failures)
+            successful_ops += successes
+        return successful_ops
+
+    def _uninstall_packages(self, device_id, package_names):
+        """Uninstall packages over the device's persistent shell, ignoring failures."""
+        if not package_names:
+            return
+        # Most packages won't be installed yet, so pm's complaints are discarded
+        script = "; ".join(
+            f"pm uninstall {shlex.quote(package_name)} >/dev/null 2>&1"
+            for package_name in dict.fromkeys(package_names)
+        )
+        try:
+            self.spoofing_manager._run_adb_shell_command(device_id, [script], timeout=30 * len(package_names))
+        except (subprocess.SubprocessError, OSError):
+            pass
+
+    def _install_with_uninstall_fallback(self, device_id, file_info_dict, install_cmd):
+        """Run install_cmd; if the installed copy can't be replaced in place, uninstall it and retry once."""
+        result = _run_captured(install_cmd, timeout=300, text=False)
+        if result.returncode == 0:
+            return result
+        
+        failure_code = _INSTALL_FAILURE_CODE_RE.search(_failure_text(result))
+        if failure_code and failure_code.group() in self._UNINSTALL_RETRY_FAILURES:
+            package_name = self.get_package_name_from_apk(str(file_info_dict['path']))
+            if package_name and package_name != "unknown_package":
+                self._log_message(f"  ⚠️ {file_info_dict['name']} - Removing the installed copy and retrying...", "warning")
+                self._uninstall_packages(device_id, [package_name])
+                result = _run_captured(install_cmd, timeout=300, text=False)
+        return result
+
     def simple_force_install_apk(self, device_dict, file_info_dict):
         """Force install APK with overwrite, bypassing all conflicts."""
         try:
@@ -1249,18 +1864,6 @@ class InteractiveAPKInstaller:
             file_type = file_info_dict.get('type', 'APK')
             device_id = device_dict['id']
             
-            # Get package name first for uninstallation if needed
-            package_name = self.get_package_name_from_apk(str(file_path))
-            
-            # First try to uninstall existing package (ignore failures)
-            if package_name and package_name != "unknown_package":
-                try:
-                    uninstall_cmd = [self.adb_path, "-s", device_id, "uninstall", package_name]
-                    subprocess.run(uninstall_cmd, capture_output=True, timeout=30)
-                    # We don't care if uninstall fails - continue with install
-                except:
-                    pass  # Ignore uninstall failures
-            
             # Force install with all aggressive flags
             if file_type == 'APK':
                 install_cmd = [
@@ -1273,30 +1876,23 @@ class InteractiveAPKInstaller:
                 ]
                 
                 # Add bypass flag only for newer Android versions that support it
-                try:
-                    # Check Android API level to determine if bypass flag is supported
-                    check_result = subprocess.run(
-                        [self.adb_path, "-s", device_id, "shell", "getprop", "ro.build.version.sdk"],
-                        capture_output=True, text=True, timeout=10
-                    )
-                    if check_result.returncode == 0:
-                        sdk_level = int(check_result.stdout.strip())
-                        if sdk_level >= 30:  # Android 11+ supports this flag
-                            install_cmd.insert(-1, "--bypass-low-target-sdk-block")
-                except:
-                    pass  # If we can't determine SDK level, proceed without the flag
+                # Check Android API level to determine if bypass flag is supported
+                # (an unknown level reads as 0, so we proceed without the flag)
+                if self.spoofing_manager.get_sdk_version(device_id) >= 30:  # Android 11+ supports this flag
+                    install_cmd.insert(-1, "--bypass-low-target-sdk-block")
             else:
                 # For XAPK/APKM bundles, extract and install
                 return self._simple_install_bundle_file(device_dict, file_info_dict)
             
-            # Execute installation
-            result = subprocess.run(install_cmd, capture_output=True, text=True, timeout=300)
+            # Execute installation; output stays as bytes and is only decoded on failure.
+            # -r -d replaces same-signature installs in place, so uninstalling is only a fallback
+            result = self._install_with_uninstall_fallback(device_id, file_info_dict, install_cmd)
             
             if result.returncode == 0:
                 self._log_message(f"  ✅ {file_info_dict['name']} force installed successfully", "success")
                 return True
             else:
-                error_msg = result.stderr.strip() or result.stdout.strip()
+                error_msg = _failure_text(result)
                 
                 # Provide helpful error messages for common issues
                 if "Unknown option --bypass-low-target-sdk-block" in error_msg:
@@ -1307,22 +1903,22 @@ class InteractiveAPKInstaller:
                         "-r", "-t", "-d", "-g",
                         str(file_path)
                     ]
-                    retry_result = subprocess.run(basic_install_cmd, capture_output=True, text=True, timeout=300)
+                    retry_result = self._install_with_uninstall_fallback(device_id, file_info_dict, basic_install_cmd)
                     if retry_result.returncode == 0:
                         self._log_message(f"  ✅ {file_info_dict['name']} installed successfully (compatibility mode)", "success")
                         return True
                     else:
-                        error_msg = retry_result.stderr.strip() or retry_result.stdout.strip()
-                elif "INSTALL_FAILED_MISSING_SPLIT" in error_msg:
-                    self._log_message(f"  ❌ {file_info_dict['name']} - Split APK missing additional files", "error")
-                    self._log_message("  💡 Try using the XAPK or bundle version instead", "warning")
-                    return False
-                elif "INSTALL_FAILED_ALREADY_EXISTS" in error_msg:
-                    self._log_message(f"  ❌ {file_info_dict['name']} - Signature conflict with existing app", "error")
-                    return False
-                elif "INSTALL_FAILED_INSUFFICIENT_STORAGE" in error_msg:
-                    self._log_message(f"  ❌ {file_info_dict['name']} - Not enough storage space", "error")
-                    return False
+                        error_msg = _failure_text(retry_result)
+                else:
+                    # One regex pass pulls out the failure code, then a single table lookup
+                    failure_code = _INSTALL_FAILURE_CODE_RE.search(error_msg)
+                    known_failure = failure_code and self._INSTALL_FAILURE_MESSAGES.get(failure_code.group())
+                    if known_failure:
+                        explanation, hint = known_failure
+                        self._log_message(f"  ❌ {file_info_dict['name']} - {explanation}", "error")
+                        if hint:
+                            self._log_message(f"  💡 {hint}", "warning")
+                        return False
                 
                 # Generic error message for other failures
                 self._log_message(f"  ❌ {file_info_dict['name']} - {error_msg}", "error")
@@ -1335,28 +1931,23 @@ class InteractiveAPKInstaller:
     def _simple_install_bundle_file(self, device_dict, file_info_dict):
         """Simple installation for bundle files (XAPK/APKM)."""
         try:
-            # Extract bundle to temp directory
-            bundle_path = file_info_dict['path']
-            temp_extract_dir = self.ensure_temp_directory()
-            extract_dir = os.path.join(temp_extract_dir, f"bundle_{int(time.time())}")
-            
-            # Extract archive
-            with zipfile.ZipFile(bundle_path, 'r') as zip_ref:
-                zip_ref.extractall(extract_dir)
-            
-            # Find APK files in extracted content
-            apk_files = []
-            for root, dirs, files in os.walk(extract_dir):
-                for file in files:
-                    if file.endswith('.apk'):
-                        apk_files.append(os.path.join(root, file))
-            
+            # Extract bundle to temp directory, or reuse this workflow's earlier extraction
+            apk_files = self._extracted_bundle_apks(file_info_dict['path'])
             if not apk_files:
-                self._log_message(f"No APK files found in bundle {file_info_dict['name']}", "error")
                 return False
             
-            # Force install each APK
             device_id = device_dict['id']
+            
+            # Base + splits go in as one package through a single install-multiple session
+            if len(apk_files) > 1:
+                result = self._install_multiple(device_id, apk_files, ["-r", "-t", "-d", "-g"], timeout=300)
+                if result.returncode == 0:
+                    return True
+                self._log_message(
+                    f"install-multiple failed ({_failure_text(result)}); installing APKs one by one", "debug", dim_style=True
+                )
+            
+            # Force install each APK
             all_success = True
             
             for apk_file in apk_files:
@@ -1367,8 +1958,7 @@ class InteractiveAPKInstaller:
                         apk_file
                     ]
                     
-                    result = subprocess.run(install_cmd, capture_output=True, text=True, timeout=300)
-                    if result.returncode != 0:
+                    if _run_status(install_cmd, timeout=300) != 0:
                         all_success = False
                         self._log_message(f"APK install failed: {os.path.basename(apk_file)}", "debug", dim_style=True)
                         
@@ -1376,12 +1966,6 @@ class InteractiveAPKInstaller:
                     all_success = False
                     self._log_message(f"APK install error: {e}", "debug", dim_style=True)
             
-            # Cleanup temp directory
-            try:
-                shutil.rmtree(extract_dir)
-            except:
-                pass
-                
             return all_success
             
         except Exception as e:
@@ -1406,42 +1990,18 @@ class InteractiveAPKInstaller:
         self._log_message(f"  📦 Installing {apk_name}...", "info")
         
         try:
-            # Get package name
-            package_name = self.get_package_name_from_apk(apk_path)
-            
             # Install APK
-            install_cmd = ["adb", "-s", device_id, "install"]
-            
-            # Add user parameter if specified
-            if target_user_id_str:
-                install_cmd.extend(["--user", target_user_id_str])
-            
-            # Add installation options from config
-            if self.config.get("INSTALLATION", {}).get("allow_downgrade", "false") == "true":
-                install_cmd.append("-d")
-            
-            if self.config.get("INSTALLATION", {}).get("replace_existing", "false") == "true":
-                install_cmd.append("-r")
-            
-            if self.config.get("INSTALLATION", {}).get("grant_runtime_permissions", "true") == "true":
-                install_cmd.append("-g")
-            
-            install_cmd.append(apk_path)
+            install_cmd = [self.adb_path, "-s", device_id, "install", *self._install_flags(target_user_id_str), apk_path]
             
             # Execute installation
-            timeout = int(self.config.get("INSTALLATION", {}).get("installation_timeout_seconds", "300"))
-            result = subprocess.run(
-                install_cmd,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
+            timeout = self._get_config_int("INSTALLATION", "installation_timeout_seconds")
+            result = _run_captured(install_cmd, timeout=timeout, text=False)
             
-            if result.returncode == 0 and "Success" in result.stdout:
+            if result.returncode == 0 and b"Success" in result.stdout:
                 self._log_message(f"  ✅ {apk_name} installed successfully", "success")
                 return True
             else:
-                error_msg = result.stderr.strip() or result.stdout.strip()
+                error_msg = _failure_text(result)
                 self._log_message(f"  ❌ {apk_name} installation failed: {error_msg}", "error")
                 return False
                 
@@ -1452,6 +2012,28 @@ class InteractiveAPKInstaller:
             self._log_message(f"  ❌ {apk_name} installation error: {e}", "error")
             return False
 
+    def _install_flags(self, target_user_id_str=None):
+        """adb install options from the INSTALLATION settings, plus --user when targeting a profile."""
+        base_flags = self._typed_config_cache.get(("install_flags",))
+        if base_flags is None:
+            base_flags = tuple(
+                flag for flag, key, fallback in (
+                    ("-d", "allow_downgrade", False),
+                    ("-r", "replace_existing", False),
+                    ("-g", "grant_runtime_permissions", True),
+                )
+                if self._get_config_boolean("INSTALLATION", key, fallback)
+            )
+            self._typed_config_cache[("install_flags",)] = base_flags
+        user_flags = ["--user", target_user_id_str] if target_user_id_str else []
+        return [*user_flags, *base_flags]
+
+    def _install_multiple(self, device_id, apk_paths, flags, timeout):
+        """Install a base APK and its splits as one package with a single `adb install-multiple`."""
+        return _run_captured(
+            [self.adb_path, "-s", device_id, "install-multiple", *flags, *apk_paths], timeout=timeout, text=False
+        )
+
     def _install_bundle_file(self, device_dict, bundle_file_data, target_user_id_str=None):
         """Install XAPK/APKM/ZIP bundle file."""
         device_id = device_dict['id']
@@ -1461,22 +2043,23 @@ class InteractiveAPKInstaller:
         self._log_message(f"  📦 Extracting and installing {bundle_name}...", "info")
         
         try:
-            # Extract bundle
-            extract_dir = self.extract_xapk(bundle_path)
-            if not extract_dir:
-                return False
-            
-            # Find APKs in extraction
-            apk_files = []
-            for root, dirs, files in os.walk(extract_dir):
-                for file in files:
-                    if file.lower().endswith('.apk'):
-                        apk_files.append(os.path.join(root, file))
-            
+            # Extract bundle, or reuse this workflow's earlier extraction (e.g. for another device)
+            apk_files = self._extracted_bundle_apks(bundle_path)
             if not apk_files:
-                self._log_message(f"  ❌ No APK files found in {bundle_name}", "error")
                 return False
             
+            # One adb process and one install session for the whole bundle
+            if len(apk_files) > 1:
+                timeout = self._get_config_int("INSTALLATION", "installation_timeout_seconds")
+                result = self._install_multiple(device_id, apk_files, self._install_flags(target_user_id_str), timeout)
+                if result.returncode == 0 and b"Success" in result.stdout:
+                    self._log_message(f"  ✅ {bundle_name} installed successfully ({len(apk_files)} APKs)", "success")
+                    return True
+                # Not a split set after all (e.g. a ZIP of separate apps): install the APKs individually
+                self._log_message(
+                    f"  install-multiple failed ({_failure_text(result)}); installing APKs one by one", "debug", dim_style=True
+                )
+            
             # Install APK files
             success_count = 0
             for apk_path in apk_files:
@@ -1501,16 +2084,53 @@ class InteractiveAPKInstaller:
             self._log_message(f"  ❌ {bundle_name} installation error: {e}", "error")
             return False
 
+    def _extracted_bundle_apks(self, bundle_path):
+        """Extract a bundle's APKs once per install workflow; returns their paths, or None on failure."""
+        try:
+            stat_result = os.stat(bundle_path)
+        except OSError as e:
+            self._log_message(f"Extraction failed: {e}", "error")
+            return None
+        cache_key = (os.path.abspath(bundle_path), stat_result.st_mtime_ns, stat_result.st_size)
+        with self._temp_dir_lock:
+            key_lock = self._bundle_extraction_locks.setdefault(cache_key, threading.Lock())
+        
+        # Parallel installs of the same bundle wait for one extraction instead of each unpacking it
+        with key_lock:
+            extracted = self._bundle_extractions.get(cache_key, False)
+            if extracted is False or (extracted and not os.path.isdir(extracted[0])):
+                extracted = self.extract_xapk(bundle_path)
+                self._bundle_extractions[cache_key] = extracted  # None: failed, and already reported
+        return extracted[1] if extracted else None
+
+    def _release_bundle_extractions(self):
+        """Delete the bundles extracted during the last install workflow in the background."""
+        with self._temp_dir_lock:
+            extractions = list(self._bundle_extractions.values())
+            self._bundle_extractions.clear()
+            self._bundle_extraction_locks.clear()
+        for extracted in extractions:
+            if extracted:
+                self._remove_tree_in_background(extracted[0])
+
     def extract_xapk(self, xapk_path_str):
-        """Extract XAPK/APKM/ZIP file to temporary directory."""
+        """Extract the APKs of an XAPK/APKM/ZIP file to a temporary directory; returns (directory, APK paths)."""
         try:
-            extract_dir = os.path.join(self.ensure_temp_directory(), f"extracted_{int(time.time())}")
-            
+            # Opening reads only the central directory, so a corrupt or APK-less bundle
+            # is rejected before any temp directory exists
             with zipfile.ZipFile(xapk_path_str, 'r') as zip_ref:
-                zip_ref.extractall(extract_dir)
+                if not any(map(_is_apk_member_name, zip_ref.namelist())):
+                    self._log_message(f"  ❌ No APK files found in {os.path.basename(xapk_path_str)}", "error")
+                    return None
+                temp_dir = self.ensure_temp_directory()
+                extract_dir = tempfile.mkdtemp(prefix="extracted_", dir=temp_dir)
+                member_cache_dir = os.path.join(temp_dir, "member_cache")
+                os.makedirs(member_cache_dir, exist_ok=True)
+                # Only the APKs are installed, so nothing else in the bundle is unpacked
+                apk_paths = _extract_apk_members(zip_ref, extract_dir, member_cache_dir)
             
             self._log_message(f"Extracted to: {extract_dir}", "debug", dim_style=True)
-            return extract_dir
+            return extract_dir, apk_paths
             
         except Exception as e:
             self._log_message(f"Extraction failed: {e}", "error")
@@ -1518,30 +2138,28 @@ class InteractiveAPKInstaller:
 
     def show_device_installation_summary(self, device_id_str, successes_on_device_count, failures_on_device_count):
         """Show installation summary for a specific device."""
-        total_on_device = successes_on_device_count + failures_on_device_count
-        
-        if total_on_device == 0:
+        self.show_device_installation_summaries([(device_id_str, successes_on_device_count, failures_on_device_count)])
+
+    def show_device_installation_summaries(self, device_results):
+        """Show the summaries of several devices, given as (device_id, successes, failures), in one write."""
+        lines = []
+        for device_id_str, successes_on_device_count, failures_on_device_count in device_results:
+            total_on_device = successes_on_device_count + failures_on_device_count
+            if total_on_device == 0:
+                continue
+            success_rate = (successes_on_device_count / total_on_device) * 100
+            _, style, icon = next(bucket for bucket in self._DEVICE_SUMMARY_BUCKETS if success_rate >= bucket[0])
+            lines.append((
+                f"Device {device_id_str}: {successes_on_device_count}/{total_on_device} successful ({success_rate:.0f}%)",
+                style, icon,
+            ))
+        if not lines:
             return
         
-        success_rate = (successes_on_device_count / total_on_device) * 100
-        
-        if self.console and RICH_AVAILABLE:
-            if success_rate == 100:
-                style = "#00ff88 bold"
-                icon = "✅"
-            elif success_rate >= 50:
-                style = "#f39c12 bold"  
-                icon = "⚠️"
-            else:
-                style = "#e74c3c bold"
-                icon = "❌"
-            
-            self.console.print(
-                f"  {icon} Device {device_id_str}: {successes_on_device_count}/{total_on_device} successful ({success_rate:.0f}%)",
-                style=style
-            )
+        if self._rich_active:
+            self.console.print(Text("\n").join(Text(f"  {icon} {line}", style=style) for line, style, icon in lines))
         else:
-            print(f"  Device {device_id_str}: {successes_on_device_count}/{total_on_device} successful ({success_rate:.0f}%)")
+            print("\n".join(f"  {line}" for line, _, _ in lines))
 
     def show_summary(self, successful_ops_count, total_ops_count):
         """Show overall installation summary."""
@@ -1550,24 +2168,11 @@ class InteractiveAPKInstaller:
         
         success_rate = (successful_ops_count / total_ops_count) * 100
         
-        if self.console and RICH_AVAILABLE:
+        if self._rich_active:
             # Beautiful rule separator with cohesive colors
-            if success_rate == 100:
-                rule_color, text_style = "#00ff88", "#00ff88 bold"
-                message = "🎉 ALL INSTALLATIONS COMPLETED SUCCESSFULLY!"
-                emoji = "🌟"
-            elif success_rate >= 75:
-                rule_color, text_style = "#00ff88", "#00ff88 bold" 
-                message = "✅ MOST INSTALLATIONS COMPLETED SUCCESSFULLY"
-                emoji = "✅"
-            elif success_rate >= 25:
-                rule_color, text_style = "#f39c12", "#f39c12 bold"
-                message = "⚠️ SOME INSTALLATIONS COMPLETED"
-                emoji = "⚠️"
-            else:
-                rule_color, text_style = "#e74c3c", "#e74c3c bold"
-                message = "❌ MOST INSTALLATIONS FAILED"
-                emoji = "💥"
+            _, rule_color, text_style, message, emoji = next(
+                bucket for bucket in self._SUMMARY_BUCKETS if success_rate >= bucket[0]
+            )
             
             self.console.rule(f"[{rule_color}]Installation Complete[/{rule_color}]", style=rule_color)
             self.console.print(f"\n{message}", style=text_style)
@@ -1589,7 +2194,7 @@ class InteractiveAPKInstaller:
 
     def _show_spoofing_configuration_menu(self):
         """Show spoofing configuration submenu."""
-        if self.console and RICH_AVAILABLE:
+        if self._rich_active:
             self.console.rule("[#f39c12]🎭 Spoofing Configuration[/#f39c12]", style="#f39c12")
             self.console.print("🚧 Advanced spoofing features coming soon!", style="#f39c12 bold")
             self.console.print("📱 Device fingerprint spoofing, Android ID modification, and more...", style="#95a5a6")
@@ -1598,7 +2203,7 @@ class InteractiveAPKInstaller:
 
     def _show_phone_management_tools_menu(self):
         """Show phone management tools submenu."""
-        if self.console and RICH_AVAILABLE:
+        if self._rich_active:
             self.console.rule("[#17a2b8]📱 Phone Management Tools[/#17a2b8]", style="#17a2b8") 
             self.console.print("🛠️ Device management features under development!", style="#17a2b8 bold")
             self.console.print("🔧 User profiles, permissions, cleanup tools, and diagnostics...", style="#95a5a6")
@@ -1607,9 +2212,13 @@ class InteractiveAPKInstaller:
 
     def _display_configuration_menu(self):
         """Show configuration settings menu."""
-        if self.console and RICH_AVAILABLE:
+        if self._rich_active:
             self.console.rule("[#5f87ff]⚙️ Configuration Settings[/#5f87ff]", style="#5f87ff")
             self.console.print("⚙️ Settings management interface in development!", style="#5f87ff bold") 
             self.console.print("🎛️ Installation options, device preferences, and advanced configs...", style="#95a5a6")
         else:
-            self._log_message("⚙️ Configuration settings - Interface coming soon!", "warning") 
\ No newline at end of file
+            self._log_message("⚙️ Configuration settings - Interface coming soon!", "warning")
+        
+        # Pick up any edits made to the config file since startup
+        self.reload_config()
+        self._log_message("🔄 Settings reloaded from configuration file", "info") 
\ No newline at end of file
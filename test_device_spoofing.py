@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Tests for DeviceSpoofingManager internals that can run without a real device.
+The `fake_adb` fixture (conftest.py) stands in for the device shell where needed.
+"""
+
+import os
+import random
+import stat
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from device_spoofing import (
+    DeviceSpoofingManager,
+    PersistentAdbShell,
+    _build_charset_table,
+    _random_string_from_table,
+    parse_pm_list_users,
+    run_with_hard_timeout,
+)
+
+posix_only = pytest.mark.skipif(os.name == "nt", reason="fake adb is a POSIX shell script")
+
+
+@posix_only
+def test_persistent_shell_runs_commands_in_one_process(fake_adb):
+    shell = PersistentAdbShell(fake_adb, "emulator-5554")
+    try:
+        first = shell.run("echo hello; echo oops >&2")
+        second = shell.run("printf no-newline; exit_code() { return 3; }; exit_code")
+        assert (first.returncode, first.stdout, first.stderr) == (0, "hello\n", "oops\n")
+        assert (second.returncode, second.stdout) == (3, "no-newline")
+        assert shell.is_alive()
+    finally:
+        shell.close()
+    assert not shell.is_alive()
+
+
+@posix_only
+def test_persistent_shell_timeout_closes_shell(fake_adb):
+    shell = PersistentAdbShell(fake_adb, None)
+    result = shell.run("echo partial; sleep 5", timeout=0.5)
+    assert (result.returncode, result.stdout, result.stderr) == (-1, "partial\n", "Timeout")
+    assert not shell.is_alive()
+
+
+@posix_only
+def test_persistent_shell_detects_merged_stderr(fake_adb_merged_stderr):
+    shell = PersistentAdbShell(fake_adb_merged_stderr, "emulator-5554")
+    try:
+        start = time.monotonic()
+        result = shell.run("echo hello; echo oops >&2; exit_code() { return 3; }; exit_code", timeout=10)
+        assert time.monotonic() - start < 2
+        assert (result.returncode, result.stdout, result.stderr) == (3, "hello\noops\n", "")
+        assert shell.merged_streams
+    finally:
+        shell.close()
+
+
+@posix_only
+def test_merged_stderr_device_switches_to_one_process_per_command(fake_adb_merged_stderr):
+    manager = DeviceSpoofingManager(adb_path=fake_adb_merged_stderr)
+    try:
+        start = time.monotonic()
+        results = [manager._run_adb_shell_command("emulator-5554", "echo $$", timeout=10) for _ in range(3)]
+        assert time.monotonic() - start < 3
+        assert [r.returncode for r in results] == [0, 0, 0]
+        assert "emulator-5554" in manager._persistent_shell_unsupported
+        assert len({r.stdout for r in results}) == 3  # A fresh process each time
+    finally:
+        manager.close_persistent_shells()
+
+
+@posix_only
+def test_command_is_not_rerun_when_the_shell_exits_mid_command(fake_adb, tmp_path):
+    runs = tmp_path / "runs"
+    manager = DeviceSpoofingManager(adb_path=fake_adb)
+    try:
+        result = manager._run_adb_shell_command("emulator-5554", f"echo ran >> {runs}; exit 0", timeout=5)
+        assert (result.returncode, result.stderr) == (-1, "Shell closed")
+        assert runs.read_text() == "ran\n"
+    finally:
+        manager.close_persistent_shells()
+
+
+@posix_only
+def test_run_adb_shell_command_reuses_persistent_shell(fake_adb):
+    manager = DeviceSpoofingManager(adb_path=fake_adb)
+    try:
+        first = manager._run_adb_shell_command("emulator-5554", ["echo", "$$"])
+        second = manager._run_adb_shell_command("emulator-5554", "echo $$")
+        assert first.returncode == 0
+        assert first.stdout == second.stdout
+    finally:
+        manager.close_persistent_shells()
+
+
+@posix_only
+def test_run_adb_many_starts_commands_together(fake_adb):
+    manager = DeviceSpoofingManager(adb_path=fake_adb)
+    start = time.monotonic()
+    results = manager._run_adb_many(
+        "emulator-5554", [["sleep 1; echo a"], ["sleep 1; echo b >&2; exit 2"], ["echo c; exec sleep 5"]], timeout=1.5
+    )
+    assert time.monotonic() - start < 3
+    assert [(r.returncode, r.stdout, r.stderr) for r in results] == [
+        (0, "a\n", ""), (2, "", "b\n"), (-1, "c\n", "Timeout")
+    ]
+
+
+@posix_only
+def test_run_with_hard_timeout_kills_grandchildren():
+    # The background sleep inherits the pipes; plain subprocess.run would wait for it
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_with_hard_timeout(["sh", "-c", "sleep 5 & sleep 5"], 0.5)
+    assert time.monotonic() - start < 3
+
+    result = run_with_hard_timeout(["sh", "-c", "echo ok; exit 4"], 5, text=True)
+    assert (result.returncode, result.stdout) == (4, "ok\n")
+
+
+def test_run_on_devices_runs_concurrently():
+    manager = DeviceSpoofingManager()
+    barrier = threading.Barrier(3, timeout=5)
+
+    def probe(device_id, suffix):
+        barrier.wait()  # Only passes if all three devices run at once
+        return device_id + suffix
+
+    results = manager.run_on_devices(["a", "b", "c"], probe, "-ok")
+    assert results == {"a": "a-ok", "b": "b-ok", "c": "c-ok"}
+    assert manager.run_on_devices([], probe, "-ok") == {}
+
+
+def test_sdk_version_is_cached_per_device():
+    manager = DeviceSpoofingManager()
+    calls = []
+    manager.get_current_property_value = lambda device_id, prop: calls.append(prop) or "33"
+
+    assert manager.get_sdk_version("emulator-5554") == 33
+    assert manager.get_sdk_version("emulator-5554") == 33
+    assert calls == ["ro.build.version.sdk"]
+
+    manager.forget_device("emulator-5554")
+    assert manager.get_sdk_version("emulator-5554") == 33
+    assert len(calls) == 2
+
+
+@posix_only
+def test_remove_users_batches_into_one_shell_call(fake_adb, tmp_path, monkeypatch):
+    # Fake `pm` that succeeds for user 10 and fails for anything else
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    pm = bin_dir / "pm"
+    pm.write_text('#!/bin/sh\necho "$2" >> "$PM_LOG"\n[ "$2" = "10" ]\n')
+    pm.chmod(pm.stat().st_mode | stat.S_IEXEC)
+    pm_log = tmp_path / "pm.log"
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("PM_LOG", str(pm_log))
+
+    manager = DeviceSpoofingManager(adb_path=fake_adb)
+    calls = []
+    run = manager._run_adb_shell_command
+    manager._run_adb_shell_command = lambda *a, **k: calls.append(a) or run(*a, **k)
+    try:
+        results = manager.remove_users("emulator-5554", ["10", 11, "0", "1; reboot"])
+    finally:
+        manager.close_persistent_shells()
+
+    assert results == {"10": True, "11": False, "0": False, "1; reboot": False}
+    assert len(calls) == 1
+    assert pm_log.read_text().split() == ["10", "11"]
+
+
+# Like Magisk su: `-c` takes the rest of the arguments as the command, otherwise read stdin
+FAKE_SU = '[ "$1" = 0 ] && shift; if [ "$1" = -c ]; then shift; exec sh -c "$*"; fi; exec sh'
+
+
+def _install_fake_tools(tmp_path, monkeypatch, tools):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    for name, body in tools.items():
+        tool = bin_dir / name
+        tool.write_text(f"#!/bin/sh\n{body}\n")
+        tool.chmod(tool.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+
+@posix_only
+def test_backup_properties_reads_in_one_shell_call(fake_adb, tmp_path, monkeypatch):
+    _install_fake_tools(tmp_path, monkeypatch, {
+        "getprop": 'case "$1" in ro.product.brand) echo google;; ro.product.model) echo "Pixel 8";; esac',
+    })
+    manager = DeviceSpoofingManager(adb_path=fake_adb)
+    calls = []
+    run = manager._run_adb_shell_command
+    manager._run_adb_shell_command = lambda *a, **k: calls.append(a) or run(*a, **k)
+    try:
+        manager.backup_properties(
+            "emulator-5554", ["ro.product.brand", "ro.product.model", "ro.serialno"]
+        )
+        manager.backup_property("emulator-5554", "ro.product.model")
+    finally:
+        manager.close_persistent_shells()
+
+    assert manager.property_backups["emulator-5554"] == {
+        "ro.product.brand": "google",
+        "ro.product.model": "Pixel 8",
+        "ro.serialno": "",
+    }
+    assert len(calls) == 1
+    assert str(calls[0]).count("ro.product.brand") == 1  # Each property is read once
+
+
+@posix_only
+def test_property_values_fall_back_when_batch_output_is_garbled(fake_adb, tmp_path, monkeypatch):
+    # A value that itself contains the batch marker can't be split; each property is re-read alone
+    _install_fake_tools(tmp_path, monkeypatch, {
+        "getprop": 'case "$1" in ro.product.brand) echo google;; '
+                   'ro.build.description) printf "a\\n---GETPROP---\\nb\\n";; esac',
+    })
+    manager = DeviceSpoofingManager(adb_path=fake_adb)
+    try:
+        values = manager.get_current_property_values(
+            "emulator-5554", ["ro.product.brand", "ro.build.description"]
+        )
+    finally:
+        manager.close_persistent_shells()
+
+    assert values == ["google", "a\n---GETPROP---\nb"]
+
+
+@posix_only
+def test_detect_capabilities_single_probe(fake_adb, tmp_path, monkeypatch):
+    _install_fake_tools(tmp_path, monkeypatch, {
+        "getprop": "echo 34",
+        "pm": "echo 'Maximum supported users: 1'",
+        "settings": "echo 1",
+        "su": FAKE_SU,
+        "id": 'echo "uid=0(root) gid=0(root)"',
+        "resetprop": 'echo "resetprop - System Property Manipulation Tool"; '
+                     'echo "   -n      set properties bypassing property_service" >&2; exit 1',
+    })
+    manager = DeviceSpoofingManager(adb_path=fake_adb)
+    calls = []
+    run = manager._run_adb_shell_command
+    manager._run_adb_shell_command = lambda *a, **k: calls.append(a) or run(*a, **k)
+    try:
+        caps = manager.detect_capabilities("emulator-5554")
+    finally:
+        manager.close_persistent_shells()
+
+    assert caps == {
+        "multiuser_support": True,
+        "root_access": True,
+        "magisk_available": True,
+        "ephemeral_user_support": True,
+        "android_sdk_version": 34,
+        "resetprop_flags": {"non_persistent": True, "force": False},
+    }
+    assert len(calls) == 1
+    assert manager.get_sdk_version("emulator-5554") == 34
+
+
+@posix_only
+def test_stalled_su_does_not_hide_sdk_or_multiuser(fake_adb, tmp_path, monkeypatch):
+    # Like Magisk waiting on its grant prompt
+    _install_fake_tools(tmp_path, monkeypatch, {
+        "getprop": "echo 34",
+        "pm": "echo 'Maximum supported users: 4'",
+        "su": "exec sleep 30",
+    })
+    manager = DeviceSpoofingManager(adb_path=fake_adb)
+    try:
+        start = time.monotonic()
+        caps = manager.detect_capabilities("emulator-5554")
+        assert time.monotonic() - start < 8
+        assert manager._run_adb_shell_command("emulator-5554", "echo $$").stdout.strip()
+        assert len(manager._persistent_shells) == 1  # The probe's shell survived the su timeout
+    finally:
+        manager.close_persistent_shells()
+
+    assert (caps["android_sdk_version"], caps["multiuser_support"], caps["root_access"]) == (34, True, False)
+
+
+@posix_only
+def test_set_properties_with_resetprop_batches_and_falls_back(fake_adb, tmp_path, monkeypatch):
+    prop_dir = tmp_path / "props"
+    prop_dir.mkdir()
+    (prop_dir / "ro.product.model").write_text("Pixel 8\n")
+    _install_fake_tools(tmp_path, monkeypatch, {
+        "su": f'echo su >> "$SU_LOG"; {FAKE_SU}',
+        "getprop": 'cat "$PROP_DIR/$1" 2>/dev/null || echo',
+        # The plain form is ignored for ro.stubborn; only the -n strategy sticks
+        "resetprop": 'if [ "$1" = -n ]; then shift; elif [ "$1" = ro.stubborn ]; then exit 0; fi\n'
+                     'echo "$2" > "$PROP_DIR/$1"',
+    })
+    monkeypatch.setenv("PROP_DIR", str(prop_dir))
+    su_log = tmp_path / "su.log"
+    monkeypatch.setenv("SU_LOG", str(su_log))
+
+    manager = DeviceSpoofingManager(adb_path=fake_adb)
+    try:
+        results = manager.set_properties_with_resetprop(
+            "emulator-5554", {"ro.product.model": "SM-S908B", "ro.serialno": "R5CT 1'2", "ro.stubborn": "1"}
+        )
+    finally:
+        manager.close_persistent_shells()
+
+    assert results == {"ro.product.model": True, "ro.serialno": True, "ro.stubborn": True}
+    assert (prop_dir / "ro.serialno").read_text() == "R5CT 1'2\n"
+    assert su_log.read_text().split() == ["su"]  # Batch and straggler round share one root session
+    assert manager.property_backups["emulator-5554"] == {
+        "ro.product.model": "Pixel 8",
+        "ro.serialno": "",
+        "ro.stubborn": "",
+    }
+
+
+@posix_only
+def test_set_properties_without_root_session_runs_whole_script_as_root(fake_adb, tmp_path, monkeypatch):
+    prop_dir = tmp_path / "props"
+    prop_dir.mkdir()
+    _install_fake_tools(tmp_path, monkeypatch, {
+        "su": FAKE_SU,
+        "getprop": 'cat "$PROP_DIR/$1" 2>/dev/null || echo',
+        # Only root may write, so each resetprop in the script must run under su
+        "resetprop": '[ -n "$IN_SU" ] || exit 1; echo "$2" > "$PROP_DIR/$1"',
+    })
+    (tmp_path / "bin" / "su").write_text(f"#!/bin/sh\nexport IN_SU=1\n{FAKE_SU}\n")
+    monkeypatch.setenv("PROP_DIR", str(prop_dir))
+
+    manager = DeviceSpoofingManager(adb_path=fake_adb)
+    manager._root_shell_unavailable.add("emulator-5554")  # Force the `su 0 -c` fallback
+    try:
+        results = manager.set_properties_with_resetprop(
+            "emulator-5554", {"ro.product.model": "SM S908B", "ro.serialno": "R5CT"}
+        )
+    finally:
+        manager.close_persistent_shells()
+
+    assert results == {"ro.product.model": True, "ro.serialno": True}
+    assert (prop_dir / "ro.product.model").read_text() == "SM S908B\n"
+
+
+@posix_only
+def test_root_commands_use_persistent_su_session(fake_adb, tmp_path, monkeypatch):
+    manager = DeviceSpoofingManager(adb_path=fake_adb)
+    try:
+        # No su on the "device": the root session fails once and is not retried
+        first = manager._run_adb_shell_command("emulator-5554", "echo $$", as_root=True)
+        assert first.returncode != 0
+        assert "emulator-5554" in manager._root_shell_unavailable
+
+        _install_fake_tools(tmp_path, monkeypatch, {"su": FAKE_SU})
+        manager.forget_device("emulator-5554")
+        first = manager._run_adb_shell_command("emulator-5554", "echo $$", as_root=True)
+        second = manager._run_adb_shell_command("emulator-5554", "echo $$", as_root=True)
+        plain = manager._run_adb_shell_command("emulator-5554", "echo $$")
+        assert first.returncode == 0
+        assert first.stdout == second.stdout != plain.stdout
+    finally:
+        manager.close_persistent_shells()
+
+
+def test_capabilities_are_cached_for_max_age():
+    manager = DeviceSpoofingManager()
+    probes = []
+    manager._run_adb_shell_command = lambda *a, **k: probes.append(a) or subprocess.CompletedProcess(
+        a, 0, "SDK:34\n", ""
+    )
+    manager._run_adb_many = lambda *a, **k: [
+        subprocess.CompletedProcess(a, 0, "ROOT:uid=0(root)\nRESETPROP:/sbin/resetprop\n", "")
+    ]
+
+    caps = manager.get_capabilities("emulator-5554")
+    assert caps["root_access"] and caps["magisk_available"]
+    assert manager.get_capabilities("emulator-5554") is caps
+    assert len(probes) == 1
+
+    manager.get_capabilities("emulator-5554", max_age=0)
+    assert len(probes) == 2
+
+    # A probe that timed out isn't cached
+    manager._run_adb_shell_command = lambda *a, **k: probes.append(a) or subprocess.CompletedProcess(
+        a, -1, "", "Timeout"
+    )
+    manager.get_capabilities("emulator-5554", max_age=0)
+    manager.get_capabilities("emulator-5554")
+    assert len(probes) == 4
+
+
+def test_config_boolean_is_memoized_until_config_changes():
+    manager = DeviceSpoofingManager(config={"ADVANCED_SPOOFING": {"backup_original_properties": "false"}})
+    assert manager._get_config_boolean("ADVANCED_SPOOFING", "backup_original_properties") is False
+
+    manager.config["ADVANCED_SPOOFING"]["backup_original_properties"] = "true"
+    assert manager._get_config_boolean("ADVANCED_SPOOFING", "backup_original_properties") is False
+
+    manager.config = {"ADVANCED_SPOOFING": {"backup_original_properties": "yes"}}
+    assert manager._get_config_boolean("ADVANCED_SPOOFING", "backup_original_properties") is True
+    assert manager._get_config_boolean("MISSING", "key", fallback=False) is False
+
+
+def test_generate_serial_number_fills_each_token():
+    manager = DeviceSpoofingManager()
+    manager.device_manufacturers_patterns = {
+        "samsung": {"serial_pattern": "R{8}", "serial_chars": "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"},
+        "google": {"serial_pattern": "{8}{8}", "serial_chars": "abcdef0123456789"},
+    }
+    manager._index_patterns()
+    samsung = manager.generate_serial_number("samsung")
+    assert len(samsung) == 9 and samsung[0] == "R" and samsung[1:].isalnum()
+
+    google = manager.generate_serial_number("google")
+    assert len(google) == 16 and set(google) <= set("ABCDEF0123456789")
+    assert google[:8] != google[8:]
+
+    assert len(manager.generate_serial_number("unknown")) == 8
+
+    seeded = [manager.generate_serial_number("google", rng=random.Random(7)) for _ in range(2)]
+    assert seeded[0] == seeded[1]
+
+
+def test_charset_table_is_uniform():
+    # 36 doesn't divide 256: bytes 252-255 must be dropped, not wrapped onto "A".."D"
+    charset = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+    table = _build_charset_table(charset)
+    assert table[1] == bytes(range(252, 256))
+    assert table[0][:36] == table[0][36:72] == charset.encode()
+    serial = _random_string_from_table(table, 500)
+    assert len(serial) == 500 and set(serial) <= set(charset)
+
+
+def test_parse_pm_list_users():
+    output = (
+        "Users:\n"
+        "\tUserInfo{0:Owner:c13} running\n"
+        "\tUserInfo{10:Work profile:1030}\n"
+        "\tUserInfo{11:Guest:414} running\n"
+    )
+    assert parse_pm_list_users(output) == [
+        {"id": "0", "name": "Owner", "is_primary": True, "running": True},
+        {"id": "10", "name": "Work profile", "is_primary": False, "running": False},
+        {"id": "11", "name": "Guest", "is_primary": False, "running": True},
+    ]
+    assert parse_pm_list_users("Error: could not access users\n") == []
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
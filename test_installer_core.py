@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+"""
+Tests for InteractiveAPKInstaller helpers that do not require a connected device.
+"""
+
+import configparser
+import io
+import os
+import stat
+import struct
+import threading
+import time
+import zipfile
+
+import pytest
+
+from installer_constants import DEFAULT_CONFIG
+from installer_core import InteractiveAPKInstaller, _extract_apk_members, _read_manifest_package
+
+posix_only = pytest.mark.skipif(os.name == "nt", reason="fake adb is a POSIX shell script")
+
+
+def test_run_on_devices_runs_concurrently():
+    installer = InteractiveAPKInstaller()
+    device_ids = ["emulator-5554", "emulator-5556", "R58M123456"]
+    barrier = threading.Barrier(len(device_ids), timeout=5)
+
+    def probe(device_id):
+        # Every worker must reach the barrier at once, otherwise this times out
+        barrier.wait()
+        return device_id.upper()
+
+    start = time.monotonic()
+    results = installer._run_on_devices(device_ids, probe)
+
+    assert results == {d: d.upper() for d in device_ids}
+    assert list(results) == device_ids
+    assert time.monotonic() - start < 5
+
+
+def test_worker_logs_are_printed_before_the_next_main_thread_line(capsys):
+    installer = InteractiveAPKInstaller()
+    device_ids = ["emulator-5554", "emulator-5556"]
+    capsys.readouterr()
+
+    def work(device_id):
+        installer._log_message(f"worker {device_id}")
+        # The spoofing manager logs through the installer, so its lines are queued too
+        installer.spoofing_manager._log_message(f"manager [{device_id}]")
+
+    installer._run_on_devices(device_ids, work)
+    installer._log_message("main done")
+
+    lines = capsys.readouterr().out.splitlines()
+    assert sorted(lines[:4]) == [
+        "manager [emulator-5554]", "manager [emulator-5556]", "worker emulator-5554", "worker emulator-5556",
+    ]
+    assert lines[4:] == ["main done"]
+
+
+def test_summaries_print_plain_lines_when_output_is_piped(capsys):
+    installer = InteractiveAPKInstaller()  # capsys output is not a TTY
+    capsys.readouterr()
+
+    installer.show_device_installation_summary("emulator-5554", 1, 1)
+    installer.show_summary(3, 4)
+
+    assert capsys.readouterr().out.splitlines() == [
+        "  Device emulator-5554: 1/2 successful (50%)",
+        "",
+        "=" * 60,
+        "📊 Installation Summary: 3/4 successful (75.0%)",
+        "=" * 60,
+    ]
+
+    installer.show_device_installation_summaries([("a", 2, 0), ("b", 0, 0), ("c", 0, 3)])
+    assert capsys.readouterr().out.splitlines() == [
+        "  Device a: 2/2 successful (100%)",
+        "  Device c: 0/3 successful (0%)",
+    ]
+
+
+def test_parallel_installations_run_devices_concurrently(monkeypatch):
+    installer = InteractiveAPKInstaller()
+    installer.config = {"INSTALLATION": {"parallel_installations": "true"}}
+    devices = [{"id": "emulator-5554", "info": "Pixel 6"}, {"id": "emulator-5556", "info": "Pixel 7"}]
+    files = [{"name": "a.apk", "path": "a.apk", "type": "APK"}, {"name": "b.apk", "path": "b.apk", "type": "APK"}]
+    barrier = threading.Barrier(len(devices), timeout=5)
+    installed = []
+
+    def install(device_dict, file_info_dict):
+        # Both devices must be mid-install at once, otherwise this times out
+        barrier.wait()
+        installed.append((device_dict["id"], file_info_dict["name"]))
+        return file_info_dict["name"] == "a.apk"
+
+    monkeypatch.setattr(installer, "install_apk_or_xapk", install)
+    assert installer.install_selected_apks(devices, files)
+    assert sorted(installed) == [(d["id"], f["name"]) for d in devices for f in files]
+
+
+@posix_only
+def test_simple_force_install_uninstalls_only_when_replace_fails(tmp_path, monkeypatch):
+    replaceable = tmp_path / "replaceable"
+    adb = tmp_path / "adb"
+    adb.write_text(
+        f"#!/bin/sh\nif [ -e {replaceable} ]; then echo Success; exit 0; fi\n"
+        "echo 'Failure [INSTALL_FAILED_UPDATE_INCOMPATIBLE: signatures do not match]' >&2\nexit 1\n"
+    )
+    adb.chmod(adb.stat().st_mode | stat.S_IEXEC)
+
+    installer = InteractiveAPKInstaller()
+    installer.adb_path = str(adb)
+    monkeypatch.setattr(installer.spoofing_manager, "get_sdk_version", lambda device_id: 29)
+    monkeypatch.setattr(installer, "get_package_name_from_apk", lambda path: "com.example.app")
+    uninstalls = []
+    monkeypatch.setattr(installer, "_uninstall_packages",
+                        lambda device_id, names: uninstalls.append((device_id, names)) or replaceable.touch())
+    file_info = {"name": "a.apk", "path": str(tmp_path / "a.apk"), "type": "APK"}
+
+    assert installer.simple_force_install_apk({"id": "emulator-5554"}, file_info)
+    assert uninstalls == [("emulator-5554", ["com.example.app"])]
+
+    # Same-signature replacement succeeds in place: no uninstall
+    assert installer.simple_force_install_apk({"id": "emulator-5554"}, file_info)
+    assert len(uninstalls) == 1
+
+
+def test_main_menu_plain_input_fallback(monkeypatch, capsys):
+    installer = InteractiveAPKInstaller()
+    answers = iter(["9", "2", "6"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    monkeypatch.setattr("sys.stdin.isatty", lambda: False)
+    calls = []
+    monkeypatch.setattr(installer, "_run_simple_install_workflow", lambda: calls.append("simple"))
+
+    assert installer._show_main_menu() is True
+    output = capsys.readouterr().out
+    assert "6. ❌ Exit" in output
+    assert "Invalid choice" in output
+    assert calls == ["simple"]
+
+
+def test_get_connected_devices_reuses_recent_scan(monkeypatch):
+    installer = InteractiveAPKInstaller()
+    scans = []
+    monkeypatch.setattr(
+        installer, "_scan_connected_devices",
+        lambda: scans.append(1) or [{"id": "emulator-5554", "info": "Pixel 6 (Android 13)"}]
+    )
+
+    first = installer.get_connected_devices()
+    second = installer.get_connected_devices()
+    assert first == second and len(scans) == 1
+
+    installer.get_connected_devices(use_cache=False)
+    assert len(scans) == 2
+
+    monkeypatch.setattr(installer, "_usb_topology_signature", lambda: frozenset({"1-1"}))
+    installer.get_connected_devices()
+    assert len(scans) == 3
+
+    monkeypatch.setattr("installer_core.DEVICE_LIST_CACHE_TTL_SECONDS", 0)
+    installer.get_connected_devices()
+    assert len(scans) == 4
+
+
+
+def test_get_config_int_falls_back_to_typed_default():
+    installer = InteractiveAPKInstaller()
+    installer.config = {"INSTALLATION": {"installation_timeout_seconds": "120"}, "FILE_DISCOVERY": {"max_file_size_mb": "big"}}
+
+    assert installer._get_config_int("INSTALLATION", "installation_timeout_seconds") == 120
+    assert installer._get_config_int("FILE_DISCOVERY", "max_file_size_mb") == 2048
+    assert installer._get_config_int("SPOOF_VALIDATION", "min_storage_mb") == 500
+
+    # Parsed values are cached per config object and dropped when the config is replaced
+    installer.config = {"INSTALLATION": {"installation_timeout_seconds": "60"}}
+    assert installer._get_config_int("INSTALLATION", "installation_timeout_seconds") == 60
+
+
+
+def test_install_flags_follow_config_replacement():
+    installer = InteractiveAPKInstaller()
+    installer.config = {"INSTALLATION": {"allow_downgrade": "true", "replace_existing": "true"}}
+
+    assert installer._install_flags() == ["-d", "-r", "-g"]
+    assert installer._install_flags("10") == ["--user", "10", "-d", "-r", "-g"]
+
+    installer.config = {"INSTALLATION": {"grant_runtime_permissions": "false"}}
+    assert installer._install_flags() == []
+
+
+def test_find_apk_files_scans_nested_directories(tmp_path):
+    installer = InteractiveAPKInstaller()
+    installer.apk_directory = str(tmp_path)
+    (tmp_path / "nested" / "deeper").mkdir(parents=True)
+    payload = b"\0" * 20 * 1024
+    (tmp_path / "top.apk").write_bytes(payload)
+    (tmp_path / "nested" / "Bundle.XAPK").write_bytes(payload)
+    (tmp_path / "nested" / "deeper" / "split.apkm").write_bytes(payload)
+    (tmp_path / "nested" / "notes.txt").write_bytes(payload)
+    (tmp_path / "empty.apk").write_bytes(b"")
+
+    found = installer.find_apk_files()
+    assert sorted((f["name"], f["type"]) for f in found) == [
+        ("Bundle.XAPK", "XAPK"), ("split.apkm", "APKM"), ("top.apk", "APK"),
+    ]
+    assert all(os.path.isabs(f["path"]) and os.path.isfile(f["path"]) for f in found)
+
+    installer.config = {**installer.config, "FILE_DISCOVERY": {"search_subdirectories": "false"}}
+    assert [f["name"] for f in installer.find_apk_files()] == ["top.apk"]
+
+    # Within a type, newest first
+    (tmp_path / "older.apk").write_bytes(payload)
+    os.utime(tmp_path / "older.apk", (1_000_000_000, 1_000_000_000))
+    assert [f["name"] for f in installer.find_apk_files()] == ["top.apk", "older.apk"]
+
+def test_find_apk_files_reuses_scan_until_a_directory_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr("installer_core.APK_INDEX_CACHE_FILE", str(tmp_path / "cache" / "apk_index.json"))
+    apk_dir = tmp_path / "apks"
+    installer = InteractiveAPKInstaller()
+    installer.apk_directory = str(apk_dir)
+    (apk_dir / "nested").mkdir(parents=True)
+    (apk_dir / "nested" / "app.apk").write_bytes(b"\0" * 20 * 1024)
+    # Old mtimes, so the scan isn't discarded as racy
+    for directory in (apk_dir / "nested", apk_dir):
+        os.utime(directory, (1_000_000_000, 1_000_000_000))
+
+    scans = []
+    collect = installer._collect_apk_files
+    monkeypatch.setattr(installer, "_collect_apk_files", lambda *args: scans.append(1) or collect(*args))
+    assert installer.find_apk_files() == installer.find_apk_files()
+    assert len(scans) == 1
+
+    # The index outlives the process
+    installer.cleanup_temp_files()
+    restarted = InteractiveAPKInstaller()
+    restarted.apk_directory = str(apk_dir)
+    monkeypatch.setattr(restarted, "_collect_apk_files", lambda *args: pytest.fail("should come from the index"))
+    assert restarted.find_apk_files() == installer.find_apk_files()
+
+    (apk_dir / "nested" / "new.apk").write_bytes(b"\0" * 20 * 1024)
+    assert sorted(f["name"] for f in installer.find_apk_files()) == ["app.apk", "new.apk"]
+    assert len(scans) == 2
+
+
+def test_files_passed_to_run_skip_discovery_once(tmp_path, monkeypatch):
+    apk = tmp_path / "App.APK"
+    apk.write_bytes(b"\0" * 20 * 1024)
+    (tmp_path / "notes.txt").write_text("x")
+
+    installer = InteractiveAPKInstaller()
+    installer.initial_files = [str(apk), str(tmp_path / "notes.txt"), str(tmp_path / "missing.apk")]
+    monkeypatch.setattr(installer, "find_apk_files", lambda: pytest.fail("explicit files shouldn't scan"))
+    [chosen] = installer._choose_apk_files()
+    assert (chosen["name"], chosen["path"], chosen["type"]) == ("App.APK", str(apk), "APK")
+
+    monkeypatch.setattr(installer, "find_apk_files", lambda: [])
+    assert installer._choose_apk_files() == []
+
+
+def test_cleanup_temp_files_unlinks_strays_and_temp_dir(tmp_path):
+    installer = InteractiveAPKInstaller()
+    temp_dir = installer.ensure_temp_directory()
+    inside = os.path.join(temp_dir, "base.apk")
+    open(inside, "wb").close()
+    strays = [tmp_path / "a.apk", tmp_path / "b.apk", tmp_path / "sub" / "c.apk"]
+    (tmp_path / "sub").mkdir()
+    for stray in strays:
+        stray.write_bytes(b"x")
+    installer.temp_files_to_cleanup.extend([inside, *map(str, strays), str(tmp_path / "missing.apk")])
+
+    installer.cleanup_temp_files()
+
+    assert not os.path.exists(temp_dir)
+    assert not any(stray.exists() for stray in strays)
+    assert installer.temp_files_to_cleanup == []
+
+
+
+def test_create_default_config_matches_configparser_output(tmp_path):
+    config_file = tmp_path / "apk_installer_config.ini"
+    assert InteractiveAPKInstaller().create_default_config(str(config_file))
+
+    parser = configparser.ConfigParser()
+    parser.read_dict(DEFAULT_CONFIG)
+    expected = io.StringIO()
+    parser.write(expected)
+    assert config_file.read_text(encoding="utf-8") == expected.getvalue()
+
+@posix_only
+def test_simple_force_install_retries_without_bypass_flag(tmp_path, monkeypatch):
+    adb = tmp_path / "adb"
+    adb.write_text(
+        '#!/bin/sh\ncase "$*" in *--bypass-low-target-sdk-block*) '
+        'echo "adb: Unknown option --bypass-low-target-sdk-block" >&2; exit 1;; esac\necho Success\n'
+    )
+    adb.chmod(adb.stat().st_mode | stat.S_IEXEC)
+
+    installer = InteractiveAPKInstaller()
+    installer.adb_path = str(adb)
+    monkeypatch.setattr(installer.spoofing_manager, "get_sdk_version", lambda device_id: 33)
+    file_info = {"name": "a.apk", "path": str(tmp_path / "a.apk"), "type": "APK"}
+    assert installer.simple_force_install_apk({"id": "emulator-5554"}, file_info)
+
+
+@posix_only
+def test_simple_force_install_explains_known_failures(tmp_path, monkeypatch, capsys):
+    adb = tmp_path / "adb"
+    adb.write_text("#!/bin/sh\necho 'adb: failed to install a.apk: Failure [INSTALL_FAILED_ALREADY_EXISTS: dup]' >&2\nexit 1\n")
+    adb.chmod(adb.stat().st_mode | stat.S_IEXEC)
+
+    installer = InteractiveAPKInstaller()
+    installer.adb_path = str(adb)
+    monkeypatch.setattr(installer.spoofing_manager, "get_sdk_version", lambda device_id: 29)
+    file_info = {"name": "a.apk", "path": str(tmp_path / "a.apk"), "type": "APK"}
+    assert not installer.simple_force_install_apk({"id": "emulator-5554"}, file_info)
+    assert "a.apk - Signature conflict with existing app" in capsys.readouterr().out
+
+
+@posix_only
+def test_bundle_installs_splits_in_one_install_multiple(tmp_path):
+    calls = tmp_path / "calls"
+    adb = tmp_path / "adb"
+    adb.write_text(f'#!/bin/sh\necho "$*" >> {calls}\necho Success\n')
+    adb.chmod(adb.stat().st_mode | stat.S_IEXEC)
+    bundle = tmp_path / "app.xapk"
+    with zipfile.ZipFile(bundle, "w") as zf:
+        zf.writestr("manifest.json", "{}")
+        zf.writestr("base.apk", b"base")
+        zf.writestr("config.arm64_v8a.apk", b"split")
+
+    installer = InteractiveAPKInstaller()
+    installer.adb_path = str(adb)
+    file_info = {"name": "app.xapk", "path": str(bundle)}
+    try:
+        assert installer._install_bundle_file({"id": "emulator-5554"}, file_info)
+        assert installer._install_bundle_file({"id": "emulator-5556"}, file_info)
+        # Second device reuses the extraction
+        assert sorted(os.listdir(installer.temp_dir))[0].startswith("extracted_")
+        assert len(os.listdir(installer.temp_dir)) == 2  # ...plus the shared member cache
+        installer._release_bundle_extractions()
+        installer._cleanup_executor.shutdown(wait=True)  # Extracted APKs are deleted in the background
+        assert os.listdir(installer.temp_dir) == ["member_cache"]
+    finally:
+        installer.cleanup_temp_files()
+    first, second = calls.read_text().splitlines()
+    assert first.startswith("-s emulator-5554 install-multiple ")
+    assert second.startswith("-s emulator-5556 install-multiple ")
+    assert sorted(os.path.basename(arg) for arg in first.split() if arg.endswith(".apk")) == [
+        "base.apk", "config.arm64_v8a.apk",
+    ]
+
+
+@posix_only
+def test_install_workflow_extracts_each_bundle_once(tmp_path, monkeypatch):
+    adb = tmp_path / "adb"
+    adb.write_text("#!/bin/sh\necho Success\n")
+    adb.chmod(adb.stat().st_mode | stat.S_IEXEC)
+    files = []
+    for name in ("one.xapk", "two.xapk"):
+        with zipfile.ZipFile(tmp_path / name, "w") as zf:
+            zf.writestr("base.apk", name.encode())
+        files.append({"name": name, "path": str(tmp_path / name), "type": "XAPK"})
+
+    installer = InteractiveAPKInstaller()
+    installer.adb_path = str(adb)
+    extracted = []
+    extract_xapk = installer.extract_xapk
+    monkeypatch.setattr(installer, "extract_xapk", lambda path: extracted.append(path) or extract_xapk(path))
+    devices = [{"id": "emulator-5554", "info": "Pixel 6"}, {"id": "emulator-5556", "info": "Pixel 7"}]
+    try:
+        assert installer.install_selected_apks(devices, files)
+    finally:
+        installer.cleanup_temp_files()
+    assert sorted(extracted) == [f["path"] for f in files]
+
+
+def test_extract_xapk_rejects_bad_bundles_before_creating_a_directory(tmp_path):
+    no_apks = tmp_path / "empty.xapk"
+    with zipfile.ZipFile(no_apks, "w") as zf:
+        zf.writestr("manifest.json", "{}")
+    not_zip = tmp_path / "broken.xapk"
+    not_zip.write_bytes(b"PK\x03\x04truncated")
+
+    installer = InteractiveAPKInstaller()
+    assert installer.extract_xapk(str(no_apks)) is None
+    assert installer.extract_xapk(str(not_zip)) is None
+    assert installer.temp_dir is None
+
+
+def test_extract_apk_members_skips_other_payload(tmp_path):
+    bundle = tmp_path / "app.xapk"
+    with zipfile.ZipFile(bundle, "w") as zf:
+        zf.writestr("icon.png", b"png")
+        zf.writestr("base.apk", b"base")
+        zf.writestr("splits/", b"")
+        zf.writestr("splits/base.apk", b"other")
+    out = tmp_path / "out"
+    out.mkdir()
+    with zipfile.ZipFile(bundle) as zf:
+        paths = _extract_apk_members(zf, str(out))
+    assert [os.path.basename(p) for p in paths] == ["base.apk", "1_base.apk"]
+    assert sorted(os.listdir(out)) == ["1_base.apk", "base.apk"]
+    assert (out / "1_base.apk").read_bytes() == b"other"
+
+
+def test_extract_apk_members_copies_stored_and_deflated(tmp_path):
+    bundle = tmp_path / "app.apkm"
+    payload = os.urandom(256 * 1024)
+    with zipfile.ZipFile(bundle, "w") as zf:
+        zf.writestr("base.apk", payload, compress_type=zipfile.ZIP_DEFLATED)
+        zf.writestr("split_config.en.apk", payload[::-1], compress_type=zipfile.ZIP_STORED)
+    with zipfile.ZipFile(bundle) as zf:
+        paths = _extract_apk_members(zf, str(tmp_path))
+    assert [open(p, "rb").read() for p in paths] == [payload, payload[::-1]]
+
+    # Archives without a real file descriptor fall back to the zipfile reader
+    with zipfile.ZipFile(io.BytesIO(bundle.read_bytes())) as zf:
+        out = tmp_path / "out"
+        out.mkdir()
+        paths = _extract_apk_members(zf, str(out))
+    assert [open(p, "rb").read() for p in paths] == [payload, payload[::-1]]
+
+
+def test_extract_apk_members_links_splits_shared_between_bundles(tmp_path):
+    cache = tmp_path / "member_cache"
+    cache.mkdir()
+    paths = []
+    for variant in ("free", "pro"):
+        bundle = tmp_path / f"{variant}.apks"
+        with zipfile.ZipFile(bundle, "w") as zf:
+            zf.writestr("base.apk", variant.encode())
+            zf.writestr("split_config.arm64_v8a.apk", b"native libs")
+        out = tmp_path / variant
+        out.mkdir()
+        with zipfile.ZipFile(bundle) as zf:
+            paths.append(_extract_apk_members(zf, str(out), str(cache)))
+
+    (free_base, free_split), (pro_base, pro_split) = paths
+    assert open(free_base, "rb").read() == b"free" and open(pro_base, "rb").read() == b"pro"
+    assert os.path.samefile(free_split, pro_split)
+    assert len(os.listdir(cache)) == 3
+
+
+def _binary_manifest(package, utf8=False):
+    """Minimal AXML document: a string pool and a <manifest package=...> start tag."""
+    strings = ["package", package, "manifest"]
+    if utf8:
+        encoded = [bytes([len(t), len(t.encode())]) + t.encode() + b"\0" for t in strings]
+    else:
+        encoded = [struct.pack("<H", len(t)) + t.encode("utf-16-le") + b"\0\0" for t in strings]
+    offsets, blob = [], b""
+    for item in encoded:
+        offsets.append(len(blob))
+        blob += item
+    blob += b"\0" * (-len(blob) % 4)
+    pool_header = 28 + 4 * len(strings)
+    pool = struct.pack(
+        "<HHIIIIII", 0x0001, 28, pool_header + len(blob), len(strings), 0, 0x100 if utf8 else 0, pool_header, 0
+    ) + struct.pack(f"<{len(strings)}I", *offsets) + blob
+    attribute = struct.pack("<IIIHBBI", 0xFFFFFFFF, 0, 1, 8, 0, 0x03, 1)
+    element = struct.pack("<IIIHHHHHH", 0xFFFFFFFF, 0xFFFFFFFF, 2, 20, 20, 1, 0, 0, 0) + attribute
+    start_tag = struct.pack("<HHII", 0x0102, 16, 16 + len(element), 1) + element
+    body = pool + start_tag
+    return struct.pack("<HHI", 0x0003, 8, 8 + len(body)) + body
+
+
+@pytest.mark.parametrize("utf8", [False, True])
+def test_read_manifest_package(tmp_path, monkeypatch, utf8):
+    monkeypatch.setattr("installer_core.PACKAGE_NAME_CACHE_FILE", str(tmp_path / "package_names.json"))
+    apk = tmp_path / "app.apk"
+    with zipfile.ZipFile(apk, "w") as archive:
+        archive.writestr("AndroidManifest.xml", _binary_manifest("com.example.app", utf8=utf8))
+        archive.writestr("classes.dex", b"dex\n035")
+
+    assert _read_manifest_package(str(apk)) == "com.example.app"
+    assert InteractiveAPKInstaller().get_package_name_from_apk(str(apk)) == "com.example.app"
+
+
+def test_package_name_cache_survives_restart(tmp_path, monkeypatch):
+    monkeypatch.setattr("installer_core.PACKAGE_NAME_CACHE_FILE", str(tmp_path / "cache" / "package_names.json"))
+    apk = tmp_path / "app.apk"
+    apk.write_bytes(b"not really an apk")
+    detections = []
+
+    installer = InteractiveAPKInstaller()
+    monkeypatch.setattr(installer, "_detect_package_name", lambda path: detections.append(path) or "com.example.app")
+    assert installer.get_package_name_from_apk(str(apk)) == "com.example.app"
+    assert installer.get_package_name_from_apk(str(apk)) == "com.example.app"
+    assert len(detections) == 1
+    installer.cleanup_temp_files()
+
+    restarted = InteractiveAPKInstaller()
+    monkeypatch.setattr(restarted, "_detect_package_name", lambda path: pytest.fail("should come from the cache"))
+    assert restarted.get_package_name_from_apk(str(apk)) == "com.example.app"
+
+    # A rewritten file gets a new (mtime, size) key and is parsed again
+    apk.write_bytes(b"a different, longer payload")
+    monkeypatch.setattr(restarted, "_detect_package_name", lambda path: "com.example.other")
+    assert restarted.get_package_name_from_apk(str(apk)) == "com.example.other"
+
+@posix_only
+def test_detect_basic_capabilities_single_probe(fake_adb, tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    for name, body in {
+        "su": '[ "$1" = 0 ] && shift; [ "$1" = -c ] && shift; exec sh -c "$*"',
+        "id": 'echo "uid=0(root) gid=0(root)"',
+        "resetprop": "echo usage: resetprop -n NAME VALUE",
+        "pm": "echo 'Maximum supported users: 4'",
+        "getprop": 'case "$1" in ro.build.version.sdk) echo 34;; ro.product.model) echo Pixel 8;; '
+                   'ro.build.version.release) echo 14;; esac',
+    }.items():
+        tool = bin_dir / name
+        tool.write_text(f"#!/bin/sh\n{body}\n")
+        tool.chmod(tool.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    installer = InteractiveAPKInstaller()
+    installer.spoofing_manager.adb_path = fake_adb
+    installer.spoofing_manager.get_sdk_version = lambda device_id: pytest.fail("SDK should come from the probe")
+    try:
+        caps = installer._detect_basic_capabilities("emulator-5554")
+        info = installer.get_basic_device_info_str("emulator-5554", "hint")
+    finally:
+        installer.spoofing_manager.close_persistent_shells()
+
+    assert caps == {
+        "multiuser_support": True,
+        "root_access": True,
+        "magisk_available": True,
+        "ephemeral_user_support": True,
+        "android_sdk_version": 34,
+        "resetprop_flags": {"non_persistent": True, "force": False},
+    }
+    # Same answer the spoofing manager holds for the device
+    assert caps == installer.spoofing_manager.device_capabilities["emulator-5554"]
+
+    # The probe seeded the manager's SDK cache, so installs don't getprop it again
+    del installer.spoofing_manager.get_sdk_version
+    monkeypatch.setattr(
+        installer.spoofing_manager, "get_current_property_value", lambda *a: pytest.fail("SDK should be cached")
+    )
+    assert installer.spoofing_manager.get_sdk_version("emulator-5554") == 34
+    assert info == "Pixel 8 (Android 14)"
+    assert installer.spoofing_manager._sdk_cache == {"emulator-5554": 34}
+
+
+if __name__ == "__main__":
+    print("Testing InteractiveAPKInstaller helpers...")
+    test_run_on_devices_runs_concurrently()
+    print("Test succeeded")